@@ -0,0 +1,114 @@
+"""Benchmark maturing-soon queries on the maturity-date index against scanning MaturityDate.
+
+Times the 7/30/90-day windows as a boolean scan of the whole column and as
+MaturityIndex range queries, building the index once, keeping it in step
+with single-row adds and deletes, and writing the text digest. Each window's
+labels are checked against the scan, before and after the edits; exits 1 if
+they differ. Run from the repository root:
+
+    python benchmarks/bench_alerts.py [deposits] [edits]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_alerts import ALERT_WINDOWS, write_digest
+from fd_calc import COMPOUNDING_FREQUENCY
+from fd_index import MaturityIndex
+from fd_storage import append_rows, to_portfolio_frame
+
+TODAY = pd.Timestamp("2026-01-01")
+# Repeats per timing of the (sub-millisecond) queries
+REPEATS = 20
+
+
+def make_portfolio(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = TODAY - pd.to_timedelta(rng.integers(0, 2000, rows), unit="D")
+    maturity = pd.Series(start + pd.to_timedelta(rng.integers(30, 3650, rows), unit="D"))
+    # A few deposits without a maturity date are left out of the index
+    maturity[rng.random(rows) < 0.001] = pd.NaT
+    return to_portfolio_frame(pd.DataFrame({
+        "Bank": rng.choice(["SBI", "HDFC", "ICICI", "Axis", "Kotak"], rows),
+        "FD_Number": [f"FD{i:08d}" for i in range(rows)],
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": start,
+        "Duration": "1 years 0 months 0 days",
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+        "MaturityAmount": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "MaturityDate": maturity.to_numpy(),
+    }))
+
+
+def scan(data, days):
+    # The full-column version: compare every MaturityDate
+    dates = data["MaturityDate"]
+    return data.index[(dates >= TODAY) & (dates <= TODAY + pd.Timedelta(days=days))]
+
+
+def per_call(fn, *args):
+    t0 = time.perf_counter()
+    for _ in range(REPEATS):
+        result = fn(*args)
+    return (time.perf_counter() - t0) / REPEATS, result
+
+
+def mismatched(data, index):
+    # Windows whose labels differ from a scan (index order is by date, so compare as sets)
+    return [days for days in ALERT_WINDOWS
+            if not np.array_equal(np.sort(index.maturing_within(days, TODAY)), np.sort(scan(data, days)))]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    data = make_portfolio(rows)
+    rng = np.random.default_rng(1)
+    print(f"{rows:,} deposits")
+
+    t0 = time.perf_counter()
+    index = MaturityIndex(data)
+    print(f"build index (once)      : {(time.perf_counter() - t0) * 1000:9.1f} ms")
+    for days in ALERT_WINDOWS:
+        t_scan, _ = per_call(scan, data, days)
+        t_index, labels = per_call(index.maturing_within, days, TODAY)
+        print(f"next {days:>2} days ({len(labels):>6,}) : scan {t_scan * 1000:8.2f} ms, "
+              f"index {t_index * 1000:8.3f} ms ({t_scan / t_index:,.0f}x)")
+    mismatches = mismatched(data, index)
+
+    new_rows = make_portfolio(edits, seed=2)
+    add_time = delete_time = 0.0
+    for i in range(edits):
+        data = append_rows(data, new_rows.iloc[[i]])
+        t0 = time.perf_counter()
+        index.add(data, data.index[-1:])
+        add_time += time.perf_counter() - t0
+        label = data.index[rng.integers(0, len(data))]
+        data = data.drop(index=label)
+        t0 = time.perf_counter()
+        index.remove(data, label)
+        delete_time += time.perf_counter() - t0
+    print(f"update on add           : {add_time / edits * 1000:9.2f} ms")
+    print(f"update on delete        : {delete_time / edits * 1000:9.2f} ms")
+    mismatches += [days for days in mismatched(data, index) if days not in mismatches]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        write_digest(data, os.path.join(tmp, "digest.txt"), ALERT_WINDOWS, TODAY, index)
+        print(f"write digest            : {(time.perf_counter() - t0) * 1000:9.1f} ms")
+
+    print(f"index == scan           : {not mismatches}" +
+          (f" (differs: {', '.join(f'{days} days' for days in mismatches)})" if mismatches else ""))
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark the dashboard's running totals against recomputing them per rerun.
+
+Times a pandas groupby of the whole portfolio (what a rerun would cost
+without the aggregate cache), building PortfolioAggregates once, reading
+the dashboard from it, and keeping it in step with single-row adds,
+deletes and a reprice. Afterwards the incrementally maintained totals are
+checked against a fresh build; exits 1 if they disagree. Run from the
+repository root:
+
+    python benchmarks/bench_analytics.py [deposits] [edits]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_analytics import DIMENSIONS, PortfolioAggregates
+from fd_calc import COMPOUNDING_FREQUENCY
+from fd_storage import append_rows, to_portfolio_frame
+
+# Relative tolerance for float sums maintained by adding and subtracting
+TOLERANCE = 1e-9
+
+
+def make_portfolio(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D")
+    return to_portfolio_frame(pd.DataFrame({
+        "Bank": rng.choice(["SBI", "HDFC", "ICICI", "Axis", "Kotak"], rows),
+        "FD_Number": [f"FD{i:08d}" for i in range(rows)],
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": start,
+        "Duration": "1 years 0 months 0 days",
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+        "MaturityAmount": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "MaturityDate": start + pd.to_timedelta(rng.integers(30, 3650, rows), unit="D"),
+    }))
+
+
+def groupby_dashboard(data):
+    # The straightforward per-rerun version of the same tables
+    frame = data.assign(RateWeighted=data["Rate"] * data["Principal"],
+                        MaturityMonth=data["MaturityDate"].dt.to_period("M"))
+    return {dimension: frame.groupby(column if dimension != "MaturityMonth" else "MaturityMonth", observed=True)
+            [["Principal", "MaturityAmount", "RateWeighted"]].sum()
+            for dimension, column in DIMENSIONS.items()}
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    data = make_portfolio(rows)
+    rng = np.random.default_rng(1)
+    print(f"{rows:,} deposits")
+
+    t_groupby, _ = timed(groupby_dashboard, data)
+    print(f"groupby per rerun       : {t_groupby * 1000:9.1f} ms")
+    t_build, aggregates = timed(PortfolioAggregates, data)
+    print(f"build aggregates (once) : {t_build * 1000:9.1f} ms")
+    t_read, _ = timed(lambda: (aggregates.summary(), [aggregates.by(d) for d in DIMENSIONS]))
+    print(f"read dashboard          : {t_read * 1000:9.1f} ms")
+
+    new_rows = make_portfolio(edits, seed=2)
+    add_time = delete_time = 0.0
+    for i in range(edits):
+        data = append_rows(data, new_rows.iloc[[i]])
+        t0 = time.perf_counter()
+        aggregates.add(data, data.index[-1:])
+        add_time += time.perf_counter() - t0
+        label = data.index[rng.integers(0, len(data))]
+        data = data.drop(index=label)
+        t0 = time.perf_counter()
+        aggregates.remove(data, label)
+        delete_time += time.perf_counter() - t0
+    print(f"update on add           : {add_time / edits * 1000:9.2f} ms")
+    print(f"update on delete        : {delete_time / edits * 1000:9.2f} ms")
+
+    labels = data.index[data["Bank"] == "SBI"][:1000]
+    repriced = data.copy()
+    repriced.loc[labels, "Rate"] = repriced.loc[labels, "Rate"] + 0.25
+    t_reprice, _ = timed(aggregates.replace, repriced, labels)
+    print(f"{'update on reprice of ' + format(len(labels), ','):<24}: {t_reprice * 1000:9.2f} ms")
+
+    fresh = PortfolioAggregates(repriced)
+    mismatches = []
+    for dimension in DIMENSIONS:
+        mine, theirs = aggregates.by(dimension), fresh.by(dimension)
+        mine = mine.set_index(dimension).sort_index()
+        theirs = theirs.set_index(dimension).sort_index()
+        if not mine.index.equals(theirs.index) or (mine["Deposits"] != theirs["Deposits"]).any():
+            mismatches.append(dimension)
+            continue
+        numbers = ["Principal", "MaturityAmount", "WeightedRate"]
+        if not np.allclose(mine[numbers], theirs[numbers], rtol=TOLERANCE, atol=0):
+            mismatches.append(dimension)
+    summary, expected = aggregates.summary(), fresh.summary()
+    if summary["Deposits"] != expected["Deposits"] or \
+            not np.isclose(summary["WeightedRate"], expected["WeightedRate"], rtol=TOLERANCE):
+        mismatches.append("summary")
+    print(f"incremental == rebuilt  : {not mismatches}" + (f" (differs: {', '.join(mismatches)})" if mismatches else ""))
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Parallel writers saving to one sheet, with and without optimistic locking.
+
+Each writer thread loads the portfolio once, then repeatedly adds a deposit,
+re-rates one of "its own" deposits and sometimes re-rates a deposit every
+writer touches, saving after each edit. With save_portfolio (the app's save
+path) every writer's additions and own edits must survive, and clashes on
+the shared deposits are reported as conflicts. Writers either share one
+SheetsClientPool (sessions of one app process) or each get their own
+(separate processes, racing on the version marker). The old clear-and-rewrite
+save is run the same way for comparison. Uses the in-memory FakeSpreadsheet
+with a simulated round trip. Run from the repository root:
+
+    python benchmarks/bench_concurrent_saves.py [writers] [saves_per_writer]
+"""
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_core import load_portfolio, save_portfolio
+from fd_sheets import FakeClient, FakeSpreadsheet, SheetSnapshot, SheetsClientPool, read_snapshot, rewrite_worksheet
+
+SHEET_ID = "bench"
+ROWS = 2_000
+SHARED_ROWS = 5
+LATENCY = 0.005
+# Average pause between a writer's saves
+THINK_TIME = 0.02
+
+
+def make_portfolio(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D")
+    return pd.DataFrame({
+        "Bank": rng.choice(["SBI", "HDFC", "ICICI", "Axis", "Kotak"], rows),
+        "FD_Number": [f"FD{i:08d}" for i in range(rows)],
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": start,
+        "Duration": "1 years 0 months 0 days",
+        "Compounding": "Yearly",
+        "MaturityAmount": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "MaturityDate": start + pd.Timedelta(days=365),
+    })
+
+
+def edit(data, writer, step, writers, rng):
+    """Add one deposit, re-rate an own deposit and maybe a shared one; return the expectations."""
+    data = data.copy()
+    own = f"FD{SHARED_ROWS + writer + writers * (step % 50):08d}"
+    rate = round(3 + writer + step / 100, 2)
+    data.loc[data["FD_Number"] == own, "Rate"] = rate
+    if rng.random() < 0.3:
+        shared = f"FD{rng.integers(0, SHARED_ROWS):08d}"
+        data.loc[data["FD_Number"] == shared, "Rate"] = round(10 + writer + step / 100, 2)
+    added = data.tail(1).copy()
+    added["FD_Number"] = f"W{writer:02d}-{step:04d}"
+    return pd.concat([data, added], ignore_index=True), added["FD_Number"].iloc[0], (own, rate)
+
+
+def run(writers, saves, mode):
+    client = FakeClient()
+    book = client.spreadsheets[SHEET_ID] = FakeSpreadsheet(latency=LATENCY)
+
+    def make_pool():
+        return SheetsClientPool(lambda notify=None: object(), authorize=lambda credentials: client)
+
+    pool = make_pool()
+    sheet = book.worksheet("Sheet1")
+    messages = []
+
+    def notify(level, message):
+        messages.append((level, message))
+
+    save_portfolio(make_portfolio(ROWS), pool, SHEET_ID, None, notify)
+    added, own_edits, failures = [], {}, []
+    barrier = threading.Barrier(writers)
+
+    def writer(w):
+        rng = np.random.default_rng(w)
+        own_pool = make_pool() if mode == "processes" else pool
+        data, snapshot = load_portfolio(own_pool, SHEET_ID, notify)
+        barrier.wait()
+        for step in range(saves):
+            time.sleep(rng.uniform(0, 2 * THINK_TIME))
+            data, key, (own, rate) = edit(data, w, step, writers, rng)
+            if mode == "rewrite":
+                rewrite_worksheet(sheet, SheetSnapshot.from_frame(data))
+            else:
+                saved, snapshot, data = save_portfolio(data, own_pool, SHEET_ID, snapshot, notify)
+                if not saved:
+                    failures.append(key)
+            added.append(key)
+            own_edits[own] = rate
+
+    book.api_calls = 0
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+
+    final, snapshot = read_snapshot(sheet)
+    final = final.set_index(final["FD_Number"].astype(str))
+    missing = [key for key in added if key not in final.index]
+    wrong = [key for key, rate in own_edits.items() if key not in final.index or final.loc[key, "Rate"] != rate]
+    conflicts = sum(1 for level, message in messages if "also changed by another user" in message)
+    total = writers * saves
+    return {
+        "saves/s": total / elapsed,
+        "calls/save": book.api_calls / total,
+        "lost adds": len(missing),
+        "lost edits": len(wrong),
+        "duplicates": len(snapshot.keys) - len(snapshot.rows),
+        "conflict saves": conflicts,
+        "failed saves": len(failures),
+    }
+
+
+def main():
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    saves = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    print(f"{writers} writers x {saves} saves on a {ROWS:,}-row sheet, {LATENCY * 1000:.0f} ms per API call, "
+          f"{THINK_TIME * 1000:.0f} ms between saves")
+    for name, mode in (("rewrite", "rewrite"), ("1 process", "process"), ("N processes", "processes")):
+        stats = run(writers, saves, mode)
+        print(f"{name:>11}: " + ", ".join(
+            f"{key} {value:,.1f}" if isinstance(value, float) else f"{key} {value}" for key, value in stats.items()
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark and cross-check the calendar-accurate maturity mode.
+
+Runs the Decimal calc_maturity_exact row by row and the vectorized
+calc_maturity_exact_batch fast path over the same random deposits (month-end
+and leap-day starts included), then checks that every date matches and every
+amount is within a paisa. Also reports how far the legacy days/365 mode
+drifts. Run from the repository root:
+
+    python benchmarks/bench_exact.py [deposits]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_calc import COMPOUNDING_FREQUENCY, calc_maturity_batch, calc_maturity_exact, calc_maturity_exact_batch
+
+TOLERANCE = 0.01
+
+
+def make_deposits(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2000-01-01") + pd.to_timedelta(rng.integers(0, 9500, rows), unit="D")
+    # Bias a share of starts onto month ends and 29 February to exercise clamping
+    month_end = rng.random(rows) < 0.2
+    start = start.where(~month_end, start + pd.offsets.MonthEnd(0))
+    leap_day = rng.random(rows) < 0.02
+    start = start.where(~leap_day, pd.Timestamp("2024-02-29"))
+    return pd.DataFrame({
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": start,
+        "Years": rng.integers(0, 10, rows),
+        "Months": rng.integers(0, 12, rows),
+        "Days": rng.integers(0, 31, rows),
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+    })
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    d = make_deposits(rows)
+    columns = (d["Principal"], d["Rate"], d["StartDate"], d["Years"], d["Months"], d["Days"], d["Compounding"])
+    print(f"{rows:,} deposits")
+
+    t0 = time.perf_counter()
+    fast = calc_maturity_exact_batch(*columns)
+    fast_time = time.perf_counter() - t0
+    print(f"fast path (float64) : {fast_time:8.2f}s")
+
+    t0 = time.perf_counter()
+    exact = [calc_maturity_exact(r.Principal, r.Rate, r.StartDate,
+                                 {"years": r.Years, "months": r.Months, "days": r.Days}, r.Compounding)
+             for r in d.itertuples()]
+    exact_time = time.perf_counter() - t0
+    print(f"exact (Decimal)     : {exact_time:8.2f}s  ({exact_time / fast_time:,.0f}x slower)")
+
+    exact_amount = np.array([e["maturity_amount"] for e in exact])
+    exact_date = np.array([e["maturity_date"] for e in exact], dtype="datetime64[ns]")
+    diff = np.abs(fast["MaturityAmount"].to_numpy() - exact_amount)
+    dates_match = (fast["MaturityDate"].to_numpy() == exact_date).all()
+    print(f"dates identical     : {dates_match}")
+    print(f"amounts identical   : {(diff < 0.005).mean():.6%}, max diff ₹{diff.max():.2f}, "
+          f"within ₹{TOLERANCE}: {(diff <= TOLERANCE + 1e-9).all()}")
+
+    legacy = calc_maturity_batch(*columns)
+    drift_days = (legacy["MaturityDate"].to_numpy() - exact_date).astype("timedelta64[D]").astype(np.int64)
+    drift = legacy["MaturityAmount"].to_numpy() - exact_amount
+    print(f"legacy days/365 mode: dates differ on {(drift_days != 0).mean():.2%} "
+          f"(max {np.abs(drift_days).max()} days), amounts differ on {(np.abs(drift) >= 0.005).mean():.2%} "
+          f"(max ₹{np.abs(drift).max():,.2f})")
+
+    if not dates_match or diff.max() > TOLERANCE + 1e-9:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
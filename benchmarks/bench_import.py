@@ -0,0 +1,135 @@
+"""Benchmark bulk import against adding the same deposits one form submit at a time.
+
+Builds a portfolio and a CSV of new deposits (a few malformed rows and
+duplicate FD numbers mixed in), then times the bulk path the app runs on
+"Import Deposits": read, vectorized validation, one maturity batch, one
+journal write, one merge and one index update. The per-row path (what the
+Add FD form does per submit: calc_maturity, journal append, concat, index
+insert) is timed on a sample and extrapolated. Run from the repository root:
+
+    python benchmarks/bench_import.py [portfolio_rows] [import_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_calc import COMPOUNDING_FREQUENCY, calc_maturity
+from fd_import import prepare_import, read_deposit_file
+from fd_index import PortfolioIndex
+from fd_journal import FDJournal
+from fd_storage import append_rows, to_portfolio_frame
+
+# Form submits timed for the per-row estimate
+SAMPLE_ROWS = 200
+BANKS = ["SBI", "HDFC", "ICICI", "Axis", "Kotak"]
+
+
+def make_portfolio(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D")
+    return to_portfolio_frame(pd.DataFrame({
+        "Bank": rng.choice(BANKS, rows),
+        "FD_Number": [f"FD{i:08d}" for i in range(rows)],
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": start,
+        "Duration": "1 years 0 months 0 days",
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+        "MaturityAmount": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "MaturityDate": start + pd.Timedelta(days=365),
+    }))
+
+
+def write_import_file(path, rows, existing_rows, seed=1):
+    rng = np.random.default_rng(seed)
+    numbers = np.array([f"BR{i:07d}" for i in range(rows)], dtype=object)
+    # ~1% each: numbers already in the portfolio, repeats within the file, bad principals
+    clash = rng.random(rows) < 0.01
+    numbers[clash] = [f"FD{i:08d}" for i in rng.integers(0, existing_rows, clash.sum())]
+    repeat = rng.random(rows) < 0.01
+    numbers[repeat] = numbers[rng.integers(0, rows, repeat.sum())]
+    principal = (rng.integers(100_000, 1_000_000_000, rows) / 100).astype(object)
+    principal[rng.random(rows) < 0.01] = "n/a"
+    start = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 300, rows), unit="D")
+    pd.DataFrame({
+        "Bank": rng.choice(BANKS, rows),
+        "FD Number": numbers,
+        "Principal": principal,
+        "Rate (%)": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "Start Date": start.strftime("%Y-%m-%d"),
+        "Years": rng.integers(0, 6, rows),
+        "Months": rng.integers(1, 12, rows),
+        "Days": rng.integers(0, 30, rows),
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+    }).to_csv(path, index=False)
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    portfolio_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    import_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    data = make_portfolio(portfolio_rows)
+    index = PortfolioIndex(data)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "branch.csv")
+        write_import_file(path, import_rows, portfolio_rows)
+        journal = FDJournal(os.path.join(tmp, "journal.jsonl"))
+
+        steps = []
+        t, raw = timed(read_deposit_file, path)
+        steps.append(("read CSV", t))
+        t, (deposits, rejected) = timed(prepare_import, raw, data["FD_Number"])
+        steps.append(("validate + price", t))
+        t, _ = timed(journal.append_adds, deposits)
+        steps.append(("journal (1 fsync)", t))
+        t, merged = timed(append_rows, data, deposits)
+        steps.append(("merge (1 concat)", t))
+        t, _ = timed(index.add, merged, merged.index[len(data):])
+        steps.append(("index update", t))
+        bulk = sum(t for _, t in steps)
+
+        print(f"{import_rows:,} rows into a {portfolio_rows:,}-deposit portfolio: "
+              f"{len(deposits):,} imported, {len(rejected):,} rejected")
+        for reason, count in rejected["Reason"].value_counts().items():
+            print(f"    {count:>6,} x {reason}")
+        for name, t in steps:
+            print(f"  {name:<20}: {t * 1000:9.1f} ms")
+        print(f"  {'bulk total':<20}: {bulk * 1000:9.1f} ms")
+
+        # Per-row path, as the Add FD form does it
+        sample = deposits.head(SAMPLE_ROWS)
+        data_rows, index_rows = data, PortfolioIndex(data)
+        row_journal = FDJournal(os.path.join(tmp, "rows.jsonl"))
+        t0 = time.perf_counter()
+        for row in sample.itertuples(index=False):
+            result = calc_maturity(row.Principal, row.Rate, row.StartDate,
+                                   {"years": row.Years, "months": row.Months, "days": row.Days}, row.Compounding)
+            new_row = pd.DataFrame({
+                "Bank": [row.Bank], "FD_Number": [row.FD_Number], "Principal": [row.Principal],
+                "Rate": [row.Rate], "StartDate": [row.StartDate], "Years": [row.Years],
+                "Months": [row.Months], "Days": [row.Days], "Compounding": [row.Compounding],
+                "MaturityAmount": [result["maturity_amount"]], "MaturityDate": [result["maturity_date"]],
+            })
+            row_journal.append_add(new_row.iloc[0])
+            data_rows = append_rows(data_rows, new_row)
+            index_rows.add(data_rows, data_rows.index[-1:])
+        per_row = (time.perf_counter() - t0) / len(sample)
+        print(f"  per-row path        : {per_row * 1000:9.1f} ms/row -> "
+              f"{per_row * len(deposits):,.1f} s for {len(deposits):,} rows "
+              f"({per_row * len(deposits) / bulk:,.0f}x the bulk import, before any clicking)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark the maturity ladder and accrued-interest engine.
+
+Run from the repository root:
+
+    python benchmarks/bench_ladder.py [rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_calc import COMPOUNDING_FREQUENCY, calc_maturity_batch
+from fd_ladder import accrued_interest, maturity_ladder
+
+
+def make_portfolio(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 1500, rows), unit="D"),
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+    })
+    years, months, days = rng.integers(0, 10, rows), rng.integers(0, 12, rows), rng.integers(1, 31, rows)
+    result = calc_maturity_batch(data["Principal"], data["Rate"], data["StartDate"],
+                                 years, months, days, data["Compounding"])
+    data["MaturityAmount"] = result["MaturityAmount"].to_numpy()
+    data["MaturityDate"] = result["MaturityDate"].to_numpy()
+    return data
+
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    data = make_portfolio(rows)
+    start = pd.Timestamp("2025-01-01")
+    print(f"{rows:,} deposits")
+    for label, freq in (("monthly", "M"), ("weekly", "W"), ("daily", "D")):
+        elapsed, ladder = best_of(lambda: maturity_ladder(data, start, years=10, freq=freq))
+        print(f"10-year {label:<8} ladder: {elapsed * 1000:8.1f} ms  ({len(ladder)} buckets, "
+              f"inflow ₹{ladder['MaturityAmount'].sum():,.0f})")
+    elapsed, accrued = best_of(lambda: accrued_interest(data, start))
+    print(f"accrued interest        : {elapsed * 1000:8.1f} ms  (total ₹{accrued.sum():,.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark calc_maturity_batch against a Python loop over calc_maturity.
+
+Run from the repository root:
+
+    python benchmarks/bench_maturity.py
+"""
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_calc import COMPOUNDING_FREQUENCY, calc_maturity, calc_maturity_batch
+
+
+def make_portfolio(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": pd.Timestamp(date(2020, 1, 1)) + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D"),
+        "Years": rng.integers(0, 11, rows),
+        "Months": rng.integers(0, 12, rows),
+        "Days": rng.integers(1, 31, rows),
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+    })
+
+
+def run_loop(df):
+    amounts = []
+    dates = []
+    for row in df.itertuples(index=False):
+        result = calc_maturity(
+            row.Principal, row.Rate, row.StartDate,
+            {"years": row.Years, "months": row.Months, "days": row.Days},
+            row.Compounding
+        )
+        amounts.append(result["maturity_amount"])
+        dates.append(result["maturity_date"])
+    return np.array(amounts), pd.to_datetime(dates).to_numpy()
+
+
+def run_batch(df):
+    result = calc_maturity_batch(
+        df["Principal"], df["Rate"], df["StartDate"],
+        df["Years"], df["Months"], df["Days"], df["Compounding"]
+    )
+    return result["MaturityAmount"].to_numpy(), result["MaturityDate"].to_numpy()
+
+
+def main():
+    print(f"{'rows':>10} {'loop (s)':>10} {'batch (s)':>10} {'speedup':>9} {'match':>6}")
+    for rows in (1_000, 100_000, 1_000_000):
+        df = make_portfolio(rows)
+
+        t0 = time.perf_counter()
+        loop_amounts, loop_dates = run_loop(df)
+        loop_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        batch_amounts, batch_dates = run_batch(df)
+        batch_time = time.perf_counter() - t0
+
+        match = np.array_equal(loop_amounts, batch_amounts) and np.array_equal(loop_dates, batch_dates)
+        print(f"{rows:>10,} {loop_time:>10.3f} {batch_time:>10.4f} {loop_time / batch_time:>8.0f}x {str(match):>6}")
+
+
+if __name__ == "__main__":
+    main()
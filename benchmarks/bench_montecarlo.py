@@ -0,0 +1,119 @@
+"""Benchmark the Monte Carlo reinvestment-risk engine.
+
+Times run_monte_carlo for `paths` rate paths over a portfolio, in-process
+and on a process pool, and prints the percentiles. Checks that:
+- with zero volatility every path equals the flat-rate baseline, and that
+  baseline matches chaining calc_maturity per deposit up to the horizon
+  (within rounding to the paisa per term);
+- a seeded run gives the same values in-process and on the pool.
+Exits 1 if a check fails. Run from the repository root:
+
+    python benchmarks/bench_montecarlo.py [paths] [deposits] [years] [workers]
+"""
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_calc import COMPOUNDING_FREQUENCY, calc_maturity
+from fd_montecarlo import run_monte_carlo
+from fd_storage import to_portfolio_frame
+
+AS_OF = pd.Timestamp("2026-01-01")
+SEED = 7
+# Deposits chained through calc_maturity for the baseline check
+SAMPLE_ROWS = 500
+# Per-term paisa rounding in calc_maturity vs the unrounded engine
+TOLERANCE = 1e-6
+
+
+def make_portfolio(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = AS_OF - pd.to_timedelta(rng.integers(0, 1500, rows), unit="D")
+    return to_portfolio_frame(pd.DataFrame({
+        "Bank": rng.choice(["SBI", "HDFC", "ICICI", "Axis", "Kotak"], rows),
+        "FD_Number": [f"FD{i:08d}" for i in range(rows)],
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": start,
+        "Years": rng.integers(1, 6, rows),
+        "Months": rng.integers(0, 12, rows),
+        "Days": rng.integers(0, 30, rows),
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+        "MaturityAmount": np.nan,
+        "MaturityDate": pd.NaT,
+    }))
+
+
+def chained_value(data, years):
+    # Per deposit: calc_maturity term after term at the booked rate, then accrue the last part
+    horizon = (AS_OF + pd.Timedelta(days=int(years * 365))).to_pydatetime()
+    total = 0.0
+    for row in data.itertuples(index=False):
+        amount, start = row.Principal, row.StartDate.to_pydatetime()
+        duration = {"years": row.Years, "months": row.Months, "days": row.Days}
+        n = COMPOUNDING_FREQUENCY[row.Compounding]
+        while True:
+            result = calc_maturity(amount, row.Rate, start, duration, row.Compounding)
+            if result["maturity_date"] > horizon:
+                held = (horizon - start).days / 365
+                amount *= (1 + row.Rate / 100 / n) ** (n * held)
+                break
+            amount, start = result["maturity_amount"], result["maturity_date"]
+        total += amount
+    return total
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    paths = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    years = float(sys.argv[3]) if len(sys.argv) > 3 else 10
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else os.cpu_count()
+    data = make_portfolio(rows)
+    failures = []
+    print(f"{paths:,} paths x {rows:,} deposits, {years:g}-year horizon")
+
+    t, result = timed(run_monte_carlo, data, paths, years, seed=SEED, as_of=AS_OF)
+    print(f"in-process              : {t:9.2f} s")
+    if workers > 1:
+        t_pool, pooled = timed(run_monte_carlo, data, paths, years, seed=SEED, as_of=AS_OF, workers=workers)
+        print(f"{workers} workers               : {t_pool:9.2f} s")
+        if not np.allclose(pooled.values, result.values, rtol=1e-12, atol=0):
+            failures.append("pool != in-process")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"peak RSS                : {peak:9.0f} MB")
+
+    summary = result.summary()
+    print(f"  flat-rate baseline ₹{summary['Baseline']:,.2f}; mean ₹{summary['Mean']:,.2f}; "
+          f"P(shortfall) {summary['ShortfallProbability']:.1%}")
+    for row in result.percentiles().itertuples(index=False):
+        print(f"  P{row.Percentile:<3}: ₹{row.TerminalValue:>22,.2f}  ({row.Change:+,.2f} vs flat)")
+
+    flat = run_monte_carlo(data, 4, years, sigma_bp=0, seed=SEED, as_of=AS_OF)
+    if not np.allclose(flat.values, flat.baseline, rtol=1e-12, atol=0):
+        failures.append("zero volatility != baseline")
+    sample = data.head(SAMPLE_ROWS)
+    expected = chained_value(sample, years)
+    got = run_monte_carlo(sample, 1, years, sigma_bp=0, as_of=AS_OF).baseline
+    print(f"baseline vs calc_maturity: {got:,.2f} vs {expected:,.2f} (rel diff {abs(got / expected - 1):.1e})")
+    if not np.isclose(got, expected, rtol=TOLERANCE, atol=0):
+        failures.append("baseline != chained calc_maturity")
+
+    print(f"checks                  : {'ok' if not failures else ', '.join(failures)}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
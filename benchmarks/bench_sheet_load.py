@@ -0,0 +1,128 @@
+"""Benchmark loading a very large Sheet1: get_all_records vs the app's load_portfolio.
+
+The worksheet is a FakeWorksheet whose rows are generated on request (as the
+API would send them), so the fake's own storage does not count. load_portfolio
+is run end to end through a SheetsClientPool (version marker, paged typed
+reads, SheetSnapshot); a third run also formats the snapshot's cells, the
+work deferred to the first save. Each strategy runs in a fresh subprocess
+and reports time to the first rows, total time and peak memory (RSS) above
+the interpreter baseline. Run from the repository root:
+
+    python benchmarks/bench_sheet_load.py [rows]
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_core import load_portfolio
+from fd_sheets import PAGE_ROWS, SHEET_COLUMNS, FakeClient, FakeSpreadsheet, FakeWorksheet, SheetsClientPool, \
+    frame_from_records
+
+SHEET_ID = "bench-sheet"
+
+# Simulated network round trip per API call
+LATENCY = 0.05
+BANKS = ["SBI", "HDFC", "ICICI", "Axis", "Kotak"]
+COMPOUNDING = ["Yearly", "Half Yearly", "Quarterly", "Monthly"]
+
+
+class SyntheticWorksheet(FakeWorksheet):
+    """FakeWorksheet with `rows` generated deposits that are never stored."""
+
+    def __init__(self, rows):
+        super().__init__(FakeSpreadsheet(latency=LATENCY), "Sheet1", 0)
+        self.rows = rows
+        self.spreadsheet.sheets[self.title] = self
+        self.spreadsheet._next_id = 1
+
+    @property
+    def row_count(self):
+        return self.rows + 1
+
+    def _row(self, i):
+        return [BANKS[i % 5], f"FD{i:08d}", f"{1000 + (i * 37) % 1_000_000 / 100:.2f}", f"{5 + i % 40 / 10:.1f}",
+                f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}", "1 years 0 months 0 days", COMPOUNDING[i % 4],
+                f"{1100 + (i * 37) % 1_000_000 / 100:.2f}", f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}"]
+
+    def _rows(self, start, end):
+        rows = [list(SHEET_COLUMNS)] if start == 0 else []
+        return rows + [self._row(i) for i in range(max(start - 1, 0), min(end, self.rows + 1) - 1)]
+
+    def get(self, range_name):
+        self._call()
+        first, last = range_name.split(":")
+        start = int(first.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")) - 1
+        end = int(last.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+        return self._rows(start, end)
+
+    def get_all_records(self):
+        # The whole response is held at once and numericised, as gspread does
+        self._call()
+        values = self._rows(0, self.rows + 1)
+        headers = values[0]
+        return [{h: numericise(v) for h, v in zip(headers, row)} for row in values[1:]]
+
+
+def numericise(value):
+    # Mirrors gspread's numericise: ints, then floats, else the string
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(strategy, rows):
+    sheet = SyntheticWorksheet(rows)
+    client = FakeClient()
+    client.spreadsheets[SHEET_ID] = sheet.spreadsheet
+    pool = SheetsClientPool(lambda notify=None: object(), authorize=lambda credentials: client)
+    baseline = peak_rss_mb()
+    first = []
+    t0 = time.perf_counter()
+    if strategy == "records":
+        data = frame_from_records(sheet.get_all_records())
+    else:
+        data, snapshot = load_portfolio(pool, SHEET_ID,
+                                        on_page=lambda page, loaded: first or first.append(time.perf_counter()))
+        if strategy == "cells":
+            snapshot.rows
+    total = time.perf_counter() - t0
+    return {
+        "rows": len(data),
+        "first_rows_s": (first[0] - t0) if first else total,
+        "total_s": total,
+        "peak_mb": peak_rss_mb() - baseline,
+        "frame_mb": data.memory_usage(deep=True).sum() / 1e6,
+    }
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--strategy":
+        print(json.dumps(run(sys.argv[2], int(sys.argv[3]))))
+        return
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{rows:,} rows, {PAGE_ROWS:,} rows per page, {LATENCY * 1000:.0f} ms per API call")
+    print(f"{'strategy':>16} {'first rows':>11} {'total':>8} {'peak RSS':>10} {'frame':>9}")
+    for label, strategy in (("get_all_records", "records"), ("load_portfolio", "load"),
+                            ("+ snapshot cells", "cells")):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--strategy", strategy, str(rows)],
+                             capture_output=True, text=True, check=True)
+        r = json.loads(out.stdout)
+        print(f"{label:>16} {r['first_rows_s']:>10.2f}s {r['total_s']:>7.2f}s "
+              f"{r['peak_mb']:>7.0f} MB {r['frame_mb']:>6.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
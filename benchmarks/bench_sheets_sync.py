@@ -0,0 +1,80 @@
+"""Benchmark the app's incremental save against rewriting Sheet1 in full.
+
+"commit" is commit_worksheet, the path save_portfolio takes, diffing against
+the snapshot of the previous save; "rewrite" sends every row in one
+batchUpdate. Uses the in-memory FakeSpreadsheet, so it runs offline and
+reports the API calls and cells each strategy would spend. Run from the
+repository root:
+
+    python benchmarks/bench_sheets_sync.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_calc import COMPOUNDING_FREQUENCY
+from fd_sheets import FakeSpreadsheet, SheetSnapshot, commit_worksheet, rewrite_worksheet
+
+
+def make_portfolio(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D")
+    return pd.DataFrame({
+        "Bank": rng.choice(["SBI", "HDFC", "ICICI", "Axis", "Kotak"], rows),
+        "FD_Number": [f"FD{i:08d}" for i in range(rows)],
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": start,
+        "Duration": "1 years 0 months 0 days",
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+        "MaturityAmount": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "MaturityDate": start + pd.Timedelta(days=365),
+    })
+
+
+def edit(data, changes):
+    # Add, delete and modify `changes` rows each, as a user session would
+    data = data.drop(index=data.index[1:1 + changes]).reset_index(drop=True)
+    data.loc[data.index[-changes:], "Rate"] += 0.25
+    added = data.tail(changes).copy()
+    added["FD_Number"] = [f"NEW{i:08d}" for i in range(changes)]
+    return pd.concat([data, added], ignore_index=True)
+
+
+def measure(save, sheet, data):
+    book = sheet.spreadsheet
+    calls, cells = book.api_calls, book.cells_written
+    t0 = time.perf_counter()
+    save(sheet, data)
+    return time.perf_counter() - t0, book.api_calls - calls, book.cells_written - cells
+
+
+def main():
+    print(f"{'rows':>9} {'strategy':>10} {'time (s)':>9} {'API calls':>10} {'cells':>10}")
+    for rows in (1_000, 10_000, 100_000):
+        base = make_portfolio(rows)
+        edited = edit(base, 10)
+
+        def rewrite(sheet, data):
+            rewrite_worksheet(sheet, SheetSnapshot.from_frame(data))
+
+        rewrite_sheet = FakeSpreadsheet().worksheet("Sheet1")
+        rewrite(rewrite_sheet, base)
+        full = measure(rewrite, rewrite_sheet, edited)
+
+        commit_sheet = FakeSpreadsheet().worksheet("Sheet1")
+        snapshot = commit_worksheet(commit_sheet, None, base).snapshot
+        commit = measure(lambda sheet, data: commit_worksheet(sheet, snapshot, data), commit_sheet, edited)
+
+        assert commit_sheet.values == rewrite_sheet.values, "commit diverged from full rewrite"
+        for name, (elapsed, calls, cells) in (("rewrite", full), ("commit", commit)):
+            print(f"{rows:>9,} {name:>10} {elapsed:>9.3f} {calls:>10} {cells:>10,}")
+
+
+if __name__ == "__main__":
+    main()
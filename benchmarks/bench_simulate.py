@@ -0,0 +1,123 @@
+"""Benchmark the rollover and early-withdrawal simulation against a per-deposit loop.
+
+Renews every deposit `rollovers` times with simulate_rollovers (one vector
+pass per term) and breaks the renewed portfolio on a date with
+simulate_breakage. The per-deposit way, chaining calc_maturity term by
+term, is timed on a sample and extrapolated; the sample's amounts and dates
+are also checked against the vectorized schedule, once unbooked and once
+with every other deposit booked in exact mode (its stored maturity seeds
+the first term), exiting 1 if any differ.
+Run from the repository root:
+
+    python benchmarks/bench_simulate.py [deposits] [rollovers]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_calc import COMPOUNDING_FREQUENCY, calc_maturity, calc_maturity_exact_batch
+from fd_simulate import simulate_breakage, simulate_rollovers
+from fd_storage import to_portfolio_frame
+
+# Deposits run through the calc_maturity loop
+SAMPLE_ROWS = 2_000
+# Renewal rate shift per rollover, in basis points (a falling then recovering path)
+SHIFT_STEP_BP = -15
+BREAK_DATE = "2030-06-30"
+
+
+def make_portfolio(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D")
+    return to_portfolio_frame(pd.DataFrame({
+        "Bank": rng.choice(["SBI", "HDFC", "ICICI", "Axis", "Kotak"], rows),
+        "FD_Number": [f"FD{i:08d}" for i in range(rows)],
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": start,
+        "Years": rng.integers(0, 5, rows),
+        "Months": rng.integers(1, 12, rows),
+        "Days": rng.integers(0, 30, rows),
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+        "MaturityAmount": np.nan,
+        "MaturityDate": pd.NaT,
+    }))
+
+
+def book_exact(data):
+    # Store calc_maturity_exact maturities on every other deposit
+    booked = data.copy()
+    rows = booked.index[::2]
+    part = booked.loc[rows]
+    exact = calc_maturity_exact_batch(part["Principal"], part["Rate"], part["StartDate"], part["Years"],
+                                      part["Months"], part["Days"], part["Compounding"])
+    booked.loc[rows, "MaturityAmount"] = exact["MaturityAmount"].to_numpy()
+    booked.loc[rows, "MaturityDate"] = exact["MaturityDate"].to_numpy()
+    return booked
+
+
+def loop_rollovers(data, shifts):
+    # Per deposit: the stored (or calc_maturity) booked term, then calc_maturity for each renewal
+    amounts = np.empty((len(data), len(shifts) + 1))
+    dates = np.empty(amounts.shape, dtype="datetime64[D]")
+    for i, row in enumerate(data.itertuples(index=False)):
+        principal, start = row.Principal, row.StartDate.to_pydatetime()
+        duration = {"years": row.Years, "months": row.Months, "days": row.Days}
+        for term in range(len(shifts) + 1):
+            rate = row.Rate if term == 0 else max(row.Rate + shifts[term - 1] / 100, 0)
+            if term == 0 and not (pd.isna(row.MaturityAmount) or pd.isna(row.MaturityDate)):
+                result = {"maturity_amount": row.MaturityAmount, "maturity_date": row.MaturityDate.to_pydatetime()}
+            else:
+                result = calc_maturity(principal, rate, start, duration, row.Compounding)
+            principal, start = result["maturity_amount"], result["maturity_date"]
+            amounts[i, term], dates[i, term] = principal, np.datetime64(start.date())
+    return amounts, dates
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rollovers = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    data = make_portfolio(rows)
+    shifts = [SHIFT_STEP_BP * (k + 1) if k < rollovers // 2 else SHIFT_STEP_BP * (rollovers - k)
+              for k in range(rollovers)]
+    print(f"{rows:,} deposits x {rollovers} rollovers")
+
+    t0 = time.perf_counter()
+    schedule = simulate_rollovers(data, rollovers, shift_bp=shifts)
+    t_roll = time.perf_counter() - t0
+    print(f"simulate_rollovers      : {t_roll * 1000:9.1f} ms")
+    t0 = time.perf_counter()
+    broken = simulate_breakage(data, BREAK_DATE, schedule=schedule)
+    t_break = time.perf_counter() - t0
+    print(f"simulate_breakage       : {t_break * 1000:9.1f} ms")
+    summary = schedule.summary()
+    print(f"  value after {rollovers} renewals: ₹{summary['MaturityValue'].iloc[-1]:,.2f} "
+          f"(from ₹{data['Principal'].sum():,.2f}); breaking on {BREAK_DATE} "
+          f"forgoes ₹{broken['Forgone'].sum():,.2f}, ₹{broken['Penalty'].sum():,.2f} of it penalty")
+
+    sample = data.head(SAMPLE_ROWS)
+    t0 = time.perf_counter()
+    amounts, dates = loop_rollovers(sample, shifts)
+    per_row = (time.perf_counter() - t0) / len(sample)
+    print(f"calc_maturity loop      : {per_row * 1e6:9.1f} us/deposit -> {per_row * rows:,.1f} s "
+          f"for {rows:,} ({per_row * rows / t_roll:,.0f}x the vectorized run)")
+
+    same = np.array_equal(amounts, schedule.amounts[:len(sample)]) and \
+        np.array_equal(dates, schedule.dates[:len(sample)])
+    print(f"vectorized == loop      : {same}")
+    booked = book_exact(sample)
+    booked_schedule = simulate_rollovers(booked, rollovers, shift_bp=shifts)
+    amounts, dates = loop_rollovers(booked, shifts)
+    same_booked = np.array_equal(amounts, booked_schedule.amounts) and np.array_equal(dates, booked_schedule.dates)
+    print(f"  ... with exact booking: {same_booked}")
+    if not (same and same_booked):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark the reverse solvers (principal, break-even rate, shortest tenor).
+
+Solves a batch of random goals, reports solves per second and checks every
+answer against calc_maturity_batch. Run from the repository root:
+
+    python benchmarks/bench_solvers.py [goals]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_calc import COMPOUNDING_FREQUENCY, calc_maturity_batch
+from fd_solve import break_even_rate, required_principal, shortest_tenor
+
+START = pd.Timestamp("2025-01-01")
+
+
+def make_goals(goals, seed=0):
+    rng = np.random.default_rng(seed)
+    principal = rng.integers(100_000, 1_000_000_000, goals) / 100
+    return pd.DataFrame({
+        "Principal": principal,
+        "Target": np.round(principal * rng.uniform(1.01, 3.0, goals), 2),
+        "Rate": np.round(rng.uniform(2.5, 9.5, goals), 2),
+        "Years": rng.integers(0, 10, goals),
+        "Months": rng.integers(0, 12, goals),
+        "Days": rng.integers(1, 31, goals),
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), goals),
+    })
+
+
+def maturity(principal, rate, years, months, days, compounding):
+    return calc_maturity_batch(principal, rate, [START] * len(principal), years, months, days,
+                               compounding)["MaturityAmount"].to_numpy()
+
+
+def timed(label, goals, fn):
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    print(f"{label:<20}: {elapsed * 1000:8.1f} ms  ({goals / elapsed:,.0f} solves/s)")
+    return result
+
+
+def main():
+    goals = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    g = make_goals(goals)
+    duration = (g["Years"], g["Months"], g["Days"])
+    print(f"{goals:,} goals")
+
+    principal = timed("required principal", goals, lambda: required_principal(
+        g["Target"], g["Rate"], *duration, g["Compounding"]))
+    rate = timed("break-even rate", goals, lambda: break_even_rate(
+        g["Principal"], g["Target"], *duration, g["Compounding"]))
+    days = timed("shortest tenor", goals, lambda: shortest_tenor(
+        g["Principal"], g["Target"], g["Rate"], g["Compounding"]))
+
+    zero = np.zeros(goals, dtype=np.int64)
+    reached = maturity(principal, g["Rate"], *duration, g["Compounding"]) >= g["Target"]
+    minimal = maturity(principal - 0.01, g["Rate"], *duration, g["Compounding"]) < g["Target"]
+    print(f"principal reaches target: {reached.mean():.4%}, minimal to the paisa: {minimal.mean():.4%}")
+
+    amount = g["Principal"] * (1 + rate / 100 / g["Compounding"].map(COMPOUNDING_FREQUENCY)) ** \
+        (g["Compounding"].map(COMPOUNDING_FREQUENCY) * (g["Years"] + g["Months"] / 12 + g["Days"] / 365))
+    print(f"break-even rate max relative error: {np.max(np.abs(amount / g['Target'] - 1)):.2e}")
+
+    solved = ~np.isnan(days)
+    d = days[solved].astype(np.int64)
+    s = g[solved]
+    none = zero[solved]
+    reached = maturity(s["Principal"], s["Rate"], none, none, d, s["Compounding"]) >= s["Target"]
+    minimal = (d == 0) | (maturity(s["Principal"], s["Rate"], none, none, d - 1, s["Compounding"]) < s["Target"])
+    print(f"tenor solved: {solved.mean():.4%}, reaches target: {reached.mean():.4%}, "
+          f"shortest: {minimal.mean():.4%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Time app startup and reruns with Streamlit's headless AppTest runner.
+
+Runs fd_app.py from a scratch directory (with a copy of the logo) and reports
+the login page, the first logged-in run and warm reruns. Run from the
+repository root:
+
+    python benchmarks/bench_startup.py [reruns]
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+IMPORT_PROBE = (
+    "import time; t0 = time.perf_counter(); "
+    "import fd_assets, fd_cache, fd_calc, fd_core, fd_export, fd_index, fd_journal, "
+    "fd_ladder, fd_sheets, fd_table; "
+    "import sys; print(time.perf_counter() - t0, 'gspread' in sys.modules, 'PIL' in sys.modules)"
+)
+
+
+def timed_run(app):
+    t0 = time.perf_counter()
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return time.perf_counter() - t0
+
+
+def main():
+    reruns = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    out = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout.split()
+    print(f"core module imports : {float(out[0]) * 1000:8.1f} ms "
+          f"(gspread loaded: {out[1]}, PIL loaded: {out[2]})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(ROOT, "emblem2.png"), tmp)
+        os.chdir(tmp)
+
+        login = AppTest.from_file(os.path.join(ROOT, "fd_app.py"), default_timeout=60)
+        print(f"login page          : {timed_run(login) * 1000:8.1f} ms")
+        print(f"login page rerun    : {timed_run(login) * 1000:8.1f} ms")
+
+        app = AppTest.from_file(os.path.join(ROOT, "fd_app.py"), default_timeout=60)
+        app.session_state["password_correct"] = True
+        print(f"first logged-in run : {timed_run(app) * 1000:8.1f} ms")
+        times = [timed_run(app) for _ in range(reruns)]
+        print(f"warm rerun (median) : {statistics.median(times) * 1000:8.1f} ms over {reruns} reruns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark the columnar local store against the old fd_data.csv path.
+
+Also reports the in-memory size of each loaded frame: the CSV path gives
+the old object/str layout, the store the compact one (categoricals, int16
+Years/Months/Days, Arrow FD numbers). Run from the repository root (writes temporary files to a temp directory):
+
+    python benchmarks/bench_storage.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fd_calc import COMPOUNDING_FREQUENCY
+from fd_storage import read_legacy_csv, read_local_store, to_storage_frame, write_local_store
+
+
+def make_portfolio(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 2000, rows), unit="D")
+    return pd.DataFrame({
+        "Bank": rng.choice(["SBI", "HDFC", "ICICI", "Axis", "Kotak"], rows),
+        "FD_Number": [f"FD{i:08d}" for i in range(rows)],
+        "Principal": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(2.5, 9.5, rows), 2),
+        "StartDate": start,
+        "Duration": "1 years 0 months 0 days",
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+        "MaturityAmount": rng.integers(100_000, 1_000_000_000, rows) / 100,
+        "MaturityDate": start + pd.Timedelta(days=365),
+    })
+
+
+def csv_save(data, path):
+    # The pre-columnar fallback in save_fd_data: stringify, then to_csv
+    data_copy = data.copy()
+    for col in ["Rate", "MaturityAmount", "Principal", "StartDate", "MaturityDate"]:
+        data_copy[col] = data_copy[col].astype(str)
+    data_copy.to_csv(path, index=False)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    data = make_portfolio(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "fd_data.csv")
+        store_path = os.path.join(tmp, "fd_data.feather")
+
+        csv_write, _ = timed(csv_save, data, csv_path)
+        csv_read, csv_df = timed(read_legacy_csv, csv_path)
+        store_write, _ = timed(write_local_store, data, store_path)
+        store_read, store_df = timed(read_local_store, store_path, None)
+
+        print(f"{rows:,} rows")
+        expected = to_storage_frame(data.head()).dtypes
+        print(f"{'backend':>8} {'save (s)':>9} {'load (s)':>9} {'size (MB)':>10} {'memory (MB)':>12} "
+              f"{'dtypes kept':>12}")
+        for name, write, read, path, df in (
+            ("csv", csv_write, csv_read, csv_path, csv_df),
+            ("feather", store_write, store_read, store_path, store_df),
+        ):
+            kept = df.dtypes.astype(str).tolist() == expected.astype(str).tolist()
+            size = os.path.getsize(path) / 1e6
+            memory = df.memory_usage(deep=True).sum() / 1e6
+            print(f"{name:>8} {write:>9.3f} {read:>9.3f} {size:>10.1f} {memory:>12.1f} {str(kept):>12}")
+
+
+if __name__ == "__main__":
+    main()
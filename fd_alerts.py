@@ -0,0 +1,108 @@
+"""Upcoming-maturity alerts: which deposits mature in the next 7/30/90 days.
+
+Reads go through MaturityIndex, so each window costs two binary searches
+plus the deposits in it, however large the portfolio. The app shows a
+"Maturing Soon" panel; the same windows can be written headless as a
+digest file, e.g. from a nightly cron job against Google Sheets (or the
+local store):
+
+    python fd_alerts.py maturity_digest.txt --days 7 30 90
+
+A .csv output gets one row per deposit in the widest window instead of
+the text digest.
+"""
+import argparse
+import logging
+import sys
+
+import numpy as np
+import pandas as pd
+
+from fd_index import MaturityIndex, label_positions
+from fd_table import format_currency
+
+# Look-ahead windows shown in the panel and the digest, in days
+ALERT_WINDOWS = (7, 30, 90)
+
+
+# Function to list the deposits maturing in the next `days` days
+def maturing_soon(data, index, days, today=None):
+    """Rows of `data` maturing from `today` to `today + days`, earliest first, with DaysLeft."""
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+    rows = data.iloc[label_positions(data, index.maturing_within(days, today))]
+    return rows.assign(DaysLeft=(rows["MaturityDate"] - today).dt.days.astype(np.int64))
+
+
+# Function to total each look-ahead window
+def alert_summary(data, index, windows=ALERT_WINDOWS, today=None):
+    """One row per window: Days, Deposits, Principal and MaturityAmount falling due."""
+    summary = []
+    for days in windows:
+        rows = data.iloc[label_positions(data, index.maturing_within(days, today))]
+        summary.append({
+            "Days": days,
+            "Deposits": len(rows),
+            "Principal": rows["Principal"].sum(),
+            "MaturityAmount": rows["MaturityAmount"].sum(),
+        })
+    return pd.DataFrame(summary, columns=["Days", "Deposits", "Principal", "MaturityAmount"])
+
+
+# Function to write the maturity digest as text (or CSV for a .csv path)
+def write_digest(data, path, windows=ALERT_WINDOWS, today=None, index=None):
+    """Write the digest for `data` to `path`; returns the alert_summary frame."""
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+    if index is None:
+        index = MaturityIndex(data)
+    summary = alert_summary(data, index, windows, today)
+    rows = maturing_soon(data, index, max(windows), today)
+    if str(path).lower().endswith(".csv"):
+        out = rows[["Bank", "FD_Number", "Principal", "Rate", "MaturityAmount",
+                    "MaturityDate", "DaysLeft"]].copy()
+        out["MaturityDate"] = out["MaturityDate"].dt.strftime('%Y-%m-%d')
+        out.to_csv(path, index=False)
+        return summary
+
+    lines = [f"FD maturity digest for {today:%Y-%m-%d} ({len(data):,} deposits)", ""]
+    for window, principal, maturity in zip(summary.itertuples(index=False),
+                                           format_currency(summary["Principal"]),
+                                           format_currency(summary["MaturityAmount"])):
+        lines.append(f"Next {window.Days} days: {window.Deposits:,} deposit(s), "
+                     f"{principal} principal, {maturity} at maturity")
+    if len(rows):
+        lines += ["", f"Maturing in the next {max(windows)} days:"]
+        dates = rows["MaturityDate"].dt.strftime('%Y-%m-%d')
+        for date, left, bank, number, amount in zip(dates, rows["DaysLeft"], rows["Bank"].astype(str),
+                                                    rows["FD_Number"].astype(str),
+                                                    format_currency(rows["MaturityAmount"])):
+            lines.append(f"  {date}  ({left:>3} days)  {bank:<12} {number:<20} {amount}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    return summary
+
+
+def main(argv=None):
+    from fd_core import get_sheet_id, load_google_credentials, load_portfolio
+    from fd_sheets import SheetsClientPool
+
+    parser = argparse.ArgumentParser(description="Write a digest of deposits maturing soon.")
+    parser.add_argument("output", help="digest file (.txt, or .csv for one row per deposit)")
+    parser.add_argument("--days", type=int, nargs="+", default=list(ALERT_WINDOWS),
+                        help="look-ahead windows in days (default: 7 30 90)")
+    parser.add_argument("--today", help="date to count from, YYYY-MM-DD (default: today)")
+    args = parser.parse_args(argv)
+    if min(args.days) < 0:
+        parser.error("--days must not be negative")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    pool = SheetsClientPool(load_google_credentials)
+    data, _ = load_portfolio(pool, get_sheet_id())
+    summary = write_digest(data, args.output, sorted(args.days), args.today)
+    for window in summary.itertuples(index=False):
+        logging.info(f"Next {window.Days} days: {window.Deposits:,} deposit(s)")
+    logging.info(f"Digest -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+from fd_index import label_positions
+
+# Groupings kept up to date, by the column each one is keyed on
+DIMENSIONS = {"Bank": "Bank", "Compounding": "Compounding", "MaturityMonth": "MaturityDate"}
+# Columns the totals are computed from
+_COLUMNS = ["Bank", "Principal", "Rate", "Compounding", "MaturityAmount", "MaturityDate"]
+# Running sums kept per group: deposits, principal, maturity amount, rate x principal
+# and the principal of deposits with a rate (the weight of the average)
+_COUNT, _PRINCIPAL, _MATURITY, _RATE_WEIGHTED, _RATE_WEIGHT = range(5)
+
+
+def _sums(rows):
+    principal = np.nan_to_num(np.asarray(rows["Principal"], dtype=np.float64))
+    rate = np.asarray(rows["Rate"], dtype=np.float64)
+    has_rate = ~np.isnan(rate)
+    return np.column_stack([
+        np.ones(len(rows)),
+        principal,
+        np.nan_to_num(np.asarray(rows["MaturityAmount"], dtype=np.float64)),
+        np.where(has_rate, rate, 0.0) * principal,
+        np.where(has_rate, principal, 0.0),
+    ])
+
+
+def _rows(data, labels):
+    positions = label_positions(data, labels)
+    # Take per column: iloc with a column list would copy whole blocks first
+    return pd.DataFrame({col: data[col].iloc[positions] for col in _COLUMNS})
+
+
+def _keys(rows, dimension):
+    values = rows[DIMENSIONS[dimension]]
+    if dimension == "MaturityMonth":
+        # "2026-10"; sorts chronologically, undated deposits as "NaT" last. Portfolios
+        # share a few thousand maturity days, so only those are converted to months
+        days = pd.to_datetime(values).to_numpy().astype("datetime64[D]")
+        day_codes, unique_days = pd.factorize(days.view(np.int64), use_na_sentinel=False)
+        months = np.datetime_as_string(unique_days.view("datetime64[D]").astype("datetime64[M]"), unit="M")
+        month_codes, unique_months = pd.factorize(months)
+        return month_codes[day_codes], list(unique_months)
+    if isinstance(values.dtype, pd.CategoricalDtype) and not values.isna().any():
+        # The compact layout already has the codes
+        return values.cat.codes.to_numpy(), [str(key) for key in values.cat.categories]
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=False)
+    return codes, [str(key) for key in uniques]
+
+
+class PortfolioAggregates:
+    """Running totals of the portfolio by Bank, Compounding and maturity month.
+
+    Built with one factorize + bincount pass per grouping, then kept in step
+    with the frame like PortfolioIndex: after adding, deleting or repricing
+    rows, call `add`/`remove`/`replace` with the new frame, which only touches
+    the groups of those rows. Reading the dashboard (`summary`, `by`) costs
+    O(groups), not O(deposits).
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.groups = {dimension: {} for dimension in DIMENSIONS}
+        self.totals = np.zeros(5)
+        if len(data):
+            self._apply(data, 1)
+
+    def _apply(self, rows, sign):
+        sums = _sums(rows)
+        self.totals += sign * sums.sum(axis=0)
+        for dimension, groups in self.groups.items():
+            codes, keys = _keys(rows, dimension)
+            per_key = np.column_stack([np.bincount(codes, weights=sums[:, j], minlength=len(keys))
+                                       for j in range(sums.shape[1])])
+            for key, values in zip(keys, per_key):
+                if not values[_COUNT]:
+                    continue
+                total = groups.get(key)
+                if total is None:
+                    total = groups[key] = np.zeros(5)
+                total += sign * values
+                if total[_COUNT] <= 0:
+                    # Drop emptied groups rather than keep float residue
+                    del groups[key]
+
+    def is_for(self, data):
+        """True if these totals were built from (or kept in step with) `data`."""
+        return self.data is data
+
+    def bind(self, data):
+        """Copy of these totals for `data`, a view of the same rows (e.g. a session copy)."""
+        copy = PortfolioAggregates.__new__(PortfolioAggregates)
+        copy.data = data
+        copy.groups = {dimension: {key: total.copy() for key, total in groups.items()}
+                       for dimension, groups in self.groups.items()}
+        copy.totals = self.totals.copy()
+        return copy
+
+    def add(self, data, labels):
+        """Count the rows with the given labels, newly added to `data`."""
+        self._apply(_rows(data, labels), 1)
+        self.data = data
+
+    def remove(self, data, label):
+        """Uncount the row with this label, just dropped to produce `data`."""
+        self._apply(_rows(self.data, [label]), -1)
+        self.data = data
+
+    def replace(self, data, labels):
+        """Recount the rows with the given labels, just changed in place to produce `data`."""
+        labels = list(labels)
+        if labels:
+            self._apply(_rows(self.data, labels), -1)
+            self._apply(_rows(data, labels), 1)
+        self.data = data
+
+    def update(self, data, dropped=(), added=()):
+        """Follow `data`, made from this frame by dropping the `dropped` labels and appending `added`."""
+        if len(dropped):
+            self._apply(_rows(self.data, dropped), -1)
+        if len(added):
+            self._apply(_rows(data, added), 1)
+        self.data = data
+
+    def summary(self):
+        """Portfolio-wide totals and the principal-weighted average rate."""
+        count, principal, maturity, rate_weighted, rate_weight = self.totals
+        shares = [total[_PRINCIPAL] / principal for total in self.groups["Bank"].values()] if principal else []
+        return {
+            "Deposits": int(round(count)),
+            "Principal": principal,
+            "MaturityAmount": maturity,
+            "Interest": maturity - principal,
+            "WeightedRate": rate_weighted / rate_weight if rate_weight else np.nan,
+            # Herfindahl-Hirschman index of bank shares: 1 = all in one bank
+            "BankHHI": float(np.square(shares).sum()) if shares else np.nan,
+        }
+
+    def by(self, dimension):
+        """One row per group of `dimension`, largest principal first (maturity months in date order)."""
+        groups = self.groups[dimension]
+        sums = np.array(list(groups.values())).reshape(-1, 5)
+        weight = np.where(sums[:, _RATE_WEIGHT] > 0, sums[:, _RATE_WEIGHT], np.nan)
+        frame = pd.DataFrame({
+            dimension: list(groups),
+            "Deposits": np.rint(sums[:, _COUNT]).astype(np.int64),
+            "Principal": sums[:, _PRINCIPAL],
+            "MaturityAmount": sums[:, _MATURITY],
+            "Interest": sums[:, _MATURITY] - sums[:, _PRINCIPAL],
+            "WeightedRate": sums[:, _RATE_WEIGHTED] / weight,
+            "Share": sums[:, _PRINCIPAL] / self.totals[_PRINCIPAL] * 100 if self.totals[_PRINCIPAL] else np.nan,
+        })
+        if dimension == "MaturityMonth":
+            return frame.sort_values(dimension, ignore_index=True)
+        return frame.sort_values("Principal", ascending=False, ignore_index=True)
@@ -1,15 +1,32 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import gspread
-from google.oauth2.service_account import Credentials
+from datetime import datetime
 import os
-import json
-from io import StringIO
-from PIL import Image
-import hmac
 import time
+import uuid
+from fd_assets import APP_CSS, LOGIN_CSS, LOGO_FILE, logo_thumbnail
+from fd_alerts import ALERT_WINDOWS, maturing_soon
+from fd_analytics import PortfolioAggregates
+from fd_cache import PortfolioCache, ResultCache
+from fd_calc import COMPOUNDING_FREQUENCY, calc_maturity_exact
+from fd_core import get_sheet_id, load_google_credentials, load_portfolio, save_portfolio
+from fd_export import EXPORT_FORMATS, ExportCache
+from fd_import import prepare_import, read_deposit_file
+from fd_index import MaturityIndex, PortfolioIndex, label_positions
+from fd_journal import COMPACT_EVERY, FDJournal
+from fd_montecarlo import DEFAULT_PATHS, DEFAULT_SIGMA_BP, run_monte_carlo
+from fd_ladder import LADDER_FREQUENCIES, accrued_interest, maturity_ladder
+from fd_rates import BANKS, MAX_RATE, TENOR_BUCKETS, RateCardStore, quote_maturity, reprice_deposits, tenor_days
+from fd_saver import SAVED, BackgroundSaver
+from fd_scenario import AS_BOOKED, run_scenarios
+from fd_sheets import SheetsClientPool
+from fd_simulate import DEFAULT_PENALTY_BP, DEFAULT_ROLLOVERS, simulate_breakage, simulate_rollovers
+from fd_solve import break_even_rate, required_principal, shortest_tenor
+from fd_storage import append_rows
+from fd_table import DISPLAY_COLUMNS, TABLE_ORDER, format_aggregates, format_currency, format_rows, query_page
+
+# Lets sessions share the cached portfolio and only copy columns they change
+pd.set_option("mode.copy_on_write", True)
 
 # Page config for better display on all devices
 st.set_page_config(
@@ -18,6 +35,11 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Decode and downscale the 2 MB logo once per process (re-done if the file changes)
+@st.cache_data
+def get_logo(modified_time):
+    return logo_thumbnail(LOGO_FILE)
+
 # Add password protection mechanism
 def check_password():
     """Returns `True` if the user had the correct password."""
@@ -57,56 +79,7 @@ def check_password():
             st.session_state["login_attempts"] = 0
     
     # Display a clean login form with matching styling
-    st.markdown("""
-    <style>
-    .login-container {
-        max-width: 500px;
-        margin: 0 auto;
-        padding: 30px;
-        background-color: #f8f9fa;
-        border-radius: 10px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }
-    .login-header {
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        margin-bottom: 25px;
-    }
-    .login-logo {
-        margin-right: 15px;
-    }
-    .login-title {
-        color: #692B30;
-        font-size: 1.8rem;
-        font-weight: 700;
-        display: inline-block;
-        vertical-align: middle;
-        border-bottom: 2px solid #692B30;
-        padding-bottom: 5px;
-    }
-    .login-input-label {
-        font-weight: 500 !important;
-        color: #692B30 !important;
-        font-size: 1.1rem !important;
-        margin-bottom: 0.5rem !important;
-    }
-    .login-button {
-        background-color: #f0f0f0;
-        color: #692B30 !important;
-        font-weight: bold;
-        border-radius: 5px;
-        border: 1px solid #ddd;
-        padding: 10px 20px;
-        margin-top: 20px;
-        width: 100%;
-        cursor: pointer;
-    }
-    .login-button:hover {
-        background-color: #e0e0e0;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(LOGIN_CSS, unsafe_allow_html=True)
     
     st.markdown("<div class='login-container'>", unsafe_allow_html=True)
     
@@ -114,13 +87,11 @@ def check_password():
     st.markdown("<div class='login-header'>", unsafe_allow_html=True)
     
     # Check if logo exists and display it
-    if os.path.exists('emblem2.png'):
-        from PIL import Image  # Add this import too
-        image = Image.open('emblem2.png')
+    if os.path.exists(LOGO_FILE):
         col1, col2 = st.columns([1, 5])
         
         with col1:
-            st.image(image, width=60)
+            st.image(get_logo(os.path.getmtime(LOGO_FILE)), width=60)
         
         with col2:
             st.markdown("<div class='login-title'>Fixed Deposit Repository</div>", unsafe_allow_html=True)
@@ -157,194 +128,8 @@ def check_password():
 if not check_password():
     st.stop()  # This will halt the app from continuing if password is incorrect
 
-# Custom CSS for better styling with increased font sizes and improved readability
-# Extra CSS specificity to ensure the main title is burgundy
-st.markdown("""
-<style>
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* More specific selectors for the main title with burgundy color */
-    .main h1, h1, .st-emotion-cache-1egp7eo h1, div.st-emotion-cache-zt5igj h1, header h1 {
-        color: #692B30 !important;
-        text-align: center;
-        margin-bottom: 1.5rem;
-        padding-bottom: 0.5rem;
-        border-bottom: 2px solid #692B30;
-        font-size: 2.5rem !important;
-        font-weight: 700 !important;
-    }
-    
-    /* Additional styles for main title - more specificity */
-    [data-testid="stAppViewContainer"] h1, 
-    .stApp h1, 
-    .element-container h1,
-    .st-emotion-cache-10trblm {
-        color: #692B30 !important;
-    }
-    
-    /* Style for inline title */
-    .inline-title {
-        color: #692B30;
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin-top: 0.5rem;
-        margin-bottom: 1.5rem;
-        padding-bottom: 0.5rem;
-        border-bottom: 2px solid #692B30;
-        display: inline-block;
-        vertical-align: middle;
-    }
-    
-    /* Align logo vertically */
-    .logo-img {
-        vertical-align: middle;
-        margin-right: 15px;
-    }
-    
-    /* Increase subheader font size and change to burgundy */
-    h2, .subheader, h3, h4, h5, h6 {
-        color: #692B30 !important;
-        font-size: 1.8rem !important;
-        font-weight: 600 !important;
-        margin-top: 1rem;
-        margin-bottom: 1.5rem;
-    }
-    
-    /* Tab styling with larger font and burgundy color */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 24px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        font-size: 1.2rem !important;
-        font-weight: 600 !important;
-        color: #692B30 !important;
-    }
-    
-    /* Make buttons more appealing with burgundy text */
-    .stButton > button {
-        width: 100%;
-        font-weight: bold;
-        border-radius: 5px;
-        height: 3rem;
-        font-size: 1.1rem !important;
-        color: #692B30 !important;
-    }
-    
-    /* Button inner text color */
-    .stButton > button span {
-        color: #692B30 !important;
-    }
-    
-    /* More visible result section with burgundy header */
-    .result-box {
-        padding: 1.2rem;
-        background-color: #f0f9ff;
-        border-radius: 5px;
-        margin: 1.2rem 0;
-        border-left: 4px solid #692B30;
-        font-size: 1.1rem !important;
-    }
-    
-    .result-box strong {
-        color: #692B30;
-    }
-    
-    /* Dataframe styling with burgundy headers */
-    .dataframe {
-        border-collapse: collapse;
-        width: 100%;
-        font-size: 1.1rem !important;
-    }
-    .dataframe th {
-        border: 1px solid #ddd;
-        padding: 10px;
-        text-align: left !important;
-        background-color: #f2f2f2;
-        color: #692B30 !important;
-        font-weight: 600 !important;
-        font-size: 1.1rem !important;
-    }
-    .dataframe td {
-        border: 1px solid #ddd;
-        padding: 10px;
-        text-align: center !important;
-        font-size: 1.1rem !important;
-    }
-    .dataframe tr:nth-child(even) {
-        background-color: #f9f9f9;
-    }
-    .dataframe tr:hover {
-        background-color: #f1f1f1;
-    }
-    
-    /* Input field labels in burgundy */
-    label, .stSelectbox label, .stNumberInput label, .stDateInput label, p, .stTextInput label {
-        font-weight: 500 !important;
-        color: #692B30 !important;
-        font-size: 1.1rem !important;
-        margin-bottom: 0.5rem !important;
-    }
-    
-    /* Selectbox and input text */
-    .stSelectbox, .stNumberInput, .stDateInput, .stTextInput {
-        font-size: 1.1rem !important;
-    }
-    
-    /* About section text */
-    .st-expander p, .st-expander li {
-        font-size: 1.1rem !important;
-    }
-    
-    /* Success/info/error messages headers */
-    .stSuccess div:first-child, .stInfo div:first-child, .stError div:first-child, .stWarning div:first-child {
-        color: #692B30 !important;
-        font-weight: 600 !important;
-    }
-    
-    /* Expander header in burgundy */
-    .st-expander details summary {
-        color: #692B30 !important;
-        font-weight: 600 !important;
-    }
-    
-    /* Download button text color */
-    .stDownloadButton button span {
-        color: #692B30 !important;
-        font-weight: 600 !important;
-    }
-    
-    /* Strong and bold text in burgundy */
-    strong, b {
-        color: #692B30 !important;
-    }
-    
-    /* Remove horizontal padding to allow better alignment */
-    .css-1n76uvr, .css-18e3th9, .stMarkdown {
-        padding-left: 0 !important;
-        padding-right: 0 !important;
-    }
-    
-    /* Responsive design adjustments */
-    @media (max-width: 768px) {
-        .main .block-container {
-            padding: 1rem;
-        }
-        h1 {
-            font-size: 2rem !important;
-        }
-        h2, .subheader, h3 {
-            font-size: 1.5rem !important;
-        }
-        .inline-title {
-            font-size: 1.8rem;
-        }
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for better styling (minified once per process in fd_assets)
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # Create a container for the logo and title side by side
 col1, col2 = st.columns([1, 6])  # First column for logo, second for title
@@ -353,10 +138,9 @@ col1, col2 = st.columns([1, 6])  # First column for logo, second for title
 with col1:
     try:
         # Check if the image file exists
-        if os.path.exists('emblem2.png'):
-            image = Image.open('emblem2.png')
-            # Display the image with a specific width
-            st.image(image, width=70)  # Adjust width as needed
+        if os.path.exists(LOGO_FILE):
+            # Display the cached thumbnail with a specific width
+            st.image(get_logo(os.path.getmtime(LOGO_FILE)), width=70)  # Adjust width as needed
         else:
             st.warning("Logo image 'emblem2.png' not found in the current directory")
     except Exception as e:
@@ -366,267 +150,202 @@ with col1:
 with col2:
     st.markdown("<div class='inline-title'>Fixed Deposit Repository</div>", unsafe_allow_html=True)
 
-# Function to authenticate with Google Sheets
-def authenticate_google_sheets():
-    # Check if credentials.json exists in the current directory
-    if os.path.exists('credentials.json'):
-        try:
-            # Local development - load from file
-            credentials = Credentials.from_service_account_file(
-                'credentials.json',
-                scopes=['https://www.googleapis.com/auth/spreadsheets']
-            )
-            return gspread.authorize(credentials)
-        except Exception as e:
-            st.error(f"Error loading credentials.json: {e}")
-    
-    # Try using Streamlit secrets as fallback
-    try:
-        credentials_dict = st.secrets["gcp_service_account"]
-        credentials = Credentials.from_service_account_info(
-            credentials_dict,
-            scopes=['https://www.googleapis.com/auth/spreadsheets']
-        )
-        return gspread.authorize(credentials)
-    except Exception as e:
-        # If both methods fail, use mock data for testing
-        st.warning("No valid Google credentials found. Using local storage for testing.")
-        return None
+# Function to show messages from the core load/save logic in the app
+def notify(level, message):
+    getattr(st, level)(message)
+
+# One client and worksheet cache per process, shared by all sessions; credential
+# problems go to the caller's notify (the save job's, on the background saver)
+@st.cache_resource
+def get_sheets_pool():
+    return SheetsClientPool(lambda notify=notify: load_google_credentials(st.secrets, notify))
 
 # Function to load data from Google Sheets
-def load_fd_data():
-    try:
-        # Get sheet ID from secrets or use a default for local testing
-        sheet_id = ""
-        
-        # Try to get from secrets if available
-        try:
-            sheet_id = st.secrets["spreadsheet_id"]
-        except Exception:
-            # For local development without secrets
-            if os.path.exists('.local_config'):
-                with open('.local_config', 'r') as f:
-                    sheet_id = f.read().strip()
-            else:
-                # No sheet ID available - will use local storage
-                pass
-        
-        client = authenticate_google_sheets()
-        
-        # If client is None, we're using local storage for testing
-        if client is None:
-            # Check if we have a local CSV file
-            if os.path.exists('fd_data.csv'):
-                df = pd.read_csv('fd_data.csv')
-                # Convert date strings to datetime objects
-                try:
-                    df["StartDate"] = pd.to_datetime(df["StartDate"])
-                    df["MaturityDate"] = pd.to_datetime(df["MaturityDate"])
-                except:
-                    pass
-                return df
-            else:
-                return create_empty_dataframe()
-        
-        # Otherwise, proceed with Google Sheets
-        sheet = client.open_by_key(sheet_id).worksheet("Sheet1")
-        data = sheet.get_all_records()
-        
-        # Convert to DataFrame
-        df = pd.DataFrame(data) if data else create_empty_dataframe()
-        
-        # Ensure all expected columns exist
-        expected_columns = ["Bank", "FD_Number", "Principal", "Rate", "StartDate", 
-                           "Duration", "Compounding", "MaturityAmount", "MaturityDate"]
-        
-        for col in expected_columns:
-            if col not in df.columns:
-                if col in ["Principal", "Rate", "MaturityAmount"]:
-                    df[col] = 0.0
-                elif col in ["StartDate", "MaturityDate"]:
-                    df[col] = pd.Timestamp.now().strftime("%Y-%m-%d")
-                else:
-                    df[col] = ""
-        
-        # Convert date strings to datetime objects
-        try:
-            df["StartDate"] = pd.to_datetime(df["StartDate"])
-            df["MaturityDate"] = pd.to_datetime(df["MaturityDate"])
-        except:
-            # If conversion fails, keep as strings
-            pass
-            
-        return df
-    
-    except Exception as e:
-        st.warning(f"Error loading data from Google Sheets: {e}. Using local storage instead.")
-        # Try to load from local CSV as fallback
-        if os.path.exists('fd_data.csv'):
-            df = pd.read_csv('fd_data.csv')
-            # Convert date strings to datetime objects
-            try:
-                df["StartDate"] = pd.to_datetime(df["StartDate"])
-                df["MaturityDate"] = pd.to_datetime(df["MaturityDate"])
-            except:
-                pass
-            return df
-        else:
-            return create_empty_dataframe()
-
-# Helper function to create empty dataframe with correct structure
-def create_empty_dataframe():
-    return pd.DataFrame({
-        "Bank": pd.Series(dtype='str'),
-        "FD_Number": pd.Series(dtype='str'),
-        "Principal": pd.Series(dtype='float'),
-        "Rate": pd.Series(dtype='float'),
-        "StartDate": pd.Series(dtype='datetime64[ns]'),
-        "Duration": pd.Series(dtype='str'),
-        "Compounding": pd.Series(dtype='str'),
-        "MaturityAmount": pd.Series(dtype='float'),
-        "MaturityDate": pd.Series(dtype='datetime64[ns]')
-    })
-
-# Function to save data to Google Sheets
-def save_fd_data(data):
-    try:
-        # Get sheet ID from secrets or use a default for local testing
-        sheet_id = ""
-        
-        # Try to get from secrets if available
-        try:
-            sheet_id = st.secrets["spreadsheet_id"]
-        except Exception:
-            # For local development without secrets
-            if os.path.exists('.local_config'):
-                with open('.local_config', 'r') as f:
-                    sheet_id = f.read().strip()
-            else:
-                # No sheet ID available - will use local storage
-                pass
-        
-        # Create a copy of the dataframe to avoid modifying the original
-        data_copy = data.copy()
-        
-        # Convert numeric columns to strings with quotes to prevent date interpretation
-        for col in ["Rate", "MaturityAmount", "Principal"]:
-            if col in data_copy.columns:
-                data_copy[col] = data_copy[col].astype(str)
-        
-        # Convert datetime columns to strings safely
-        for col in ["StartDate", "MaturityDate"]:
-            if col in data_copy.columns:
-                # Check if the column contains datetime objects
-                if pd.api.types.is_datetime64_any_dtype(data_copy[col]):
-                    data_copy[col] = data_copy[col].dt.strftime("%Y-%m-%d")
-                elif len(data_copy) > 0 and isinstance(data_copy[col].iloc[0], (datetime, pd.Timestamp)):
-                    data_copy[col] = data_copy[col].apply(lambda x: x.strftime("%Y-%m-%d") if isinstance(x, (datetime, pd.Timestamp)) else str(x))
-                else:
-                    # If it's already a string or another type, convert to string
-                    data_copy[col] = data_copy[col].astype(str)
-        
-        client = authenticate_google_sheets()
-        
-        # If client is None, we're using local storage for testing
-        if client is None:
-            # Save to CSV file
-            data_copy.to_csv('fd_data.csv', index=False)
-            st.success("Data saved to local CSV file for testing")
-            return True
-        
-        # Otherwise proceed with Google Sheets
-        sheet = client.open_by_key(sheet_id).worksheet("Sheet1")
-        
-        # Convert DataFrame to list of dictionaries
-        data_dict = data_copy.to_dict('records')
-        
-        # Clear existing data
-        sheet.clear()
-        
-        # Write headers and data
-        if data_dict:
-            headers = list(data_dict[0].keys())
-            sheet.append_row(headers)
-            
-            # Prepare values to append
-            values = []
-            for row in data_dict:
-                values.append([row.get(header, "") for header in headers])
-            
-            # Append all rows at once
-            if values:
-                sheet.append_rows(values)
-                
-            # Format numeric columns as numbers to prevent date interpretation
-            if len(values) > 0:
-                try:
-                    # Get column indices for numeric columns
-                    col_indices = {}
-                    for col in ["Rate", "MaturityAmount", "Principal"]:
-                        if col in headers:
-                            col_indices[col] = headers.index(col) + 1  # 1-based indexing in sheets API
-                    
-                    # Apply number formatting to each numeric column
-                    for col, idx in col_indices.items():
-                        sheet.format(f"{chr(64 + idx)}2:{chr(64 + idx)}{len(values) + 1}", {
-                            "numberFormat": {"type": "NUMBER", "pattern": "0.00"}
-                        })
-                except Exception as format_error:
-                    st.warning(f"Warning: Could not apply number formatting: {format_error}")
-        
-        return True
-    
-    except Exception as e:
-        st.warning(f"Error saving to Google Sheets: {e}. Saving to local file instead.")
-        
-        # Save to CSV file as fallback
-        try:
-            # Create a copy of the dataframe
-            data_copy = data.copy()
-            
-            # Convert all columns to strings safely
-            for col in data_copy.columns:
-                if col in ["Rate", "MaturityAmount", "Principal"]:
-                    data_copy[col] = data_copy[col].astype(str)
-                elif col in ["StartDate", "MaturityDate"]:
-                    data_copy[col] = data_copy[col].astype(str)
-                
-            data_copy.to_csv('fd_data.csv', index=False)
-            st.success("Data saved to local CSV file as fallback")
-            return True
-        except Exception as csv_e:
-            st.error(f"Also failed to save to CSV: {csv_e}")
-            return False
+def load_fd_data(on_page=None):
+    return load_portfolio(get_sheets_pool(), get_sheet_id(st.secrets), notify, on_page)
 
-# Function to calculate FD maturity
-def calc_maturity(principal, rate, start_date, duration, compounding):
-    rate = rate / 100
-    
-    # Determine compounding frequency
-    n = {"Yearly": 1, "Half Yearly": 2, "Quarterly": 4, "Monthly": 12}[compounding]
-    
-    # Calculate duration in years - MODIFIED to match Shiny logic
-    years = duration.get('years', 0)
-    months = duration.get('months', 0)
-    days = duration.get('days', 0)
-    
-    # Calculate fractional duration in years directly (matching Shiny logic)
-    duration_years = years + (months / 12) + (days / 365)
-    
-    # Calculate maturity amount
-    maturity_amount = principal * (1 + rate / n) ** (n * duration_years)
-    
-    # Calculate maturity date using duration_years * 365 (matching Shiny logic)
-    maturity_date = start_date + timedelta(days=int(duration_years * 365))
-    
-    return {
-        'maturity_amount': round(maturity_amount, 2),
-        'maturity_date': maturity_date
-    }
+# Parsed portfolio shared by all sessions; reloaded after PORTFOLIO_TTL seconds
+PORTFOLIO_TTL = 300
+
+# Most matches offered at once in the delete selector
+DELETE_OPTIONS_LIMIT = 50
+
+# Rejected rows listed after a bulk import
+IMPORT_REJECTS_SHOWN = 100
+
+# Deposits listed in the Maturing Soon panel
+MATURING_SHOWN = 200
+
+# Fixed seed for the reinvestment-risk panel, so reruns show the same paths
+MONTE_CARLO_SEED = 2024
+
+# Page sizes offered for the FD table
+PAGE_SIZES = [25, 50, 100, 250]
+
+@st.cache_resource
+def get_portfolio_cache():
+    return PortfolioCache(load_fd_data, ttl=PORTFOLIO_TTL)
+
+# Adds and deletes are journaled as they happen and folded into storage on save
+@st.cache_resource
+def get_journal():
+    return FDJournal()
+
+# Saves run on one background worker per process so the page never blocks on them
+@st.cache_resource
+def get_saver():
+    return BackgroundSaver()
+
+# Function to queue a save of this session's data (replacing one not yet started)
+def persist_fd_data():
+    data = st.session_state.fd_data
+    pool, sheet_id = get_sheets_pool(), get_sheet_id(st.secrets)
+    snapshot = st.session_state.get("sheet_snapshot")
+    key = st.session_state.setdefault("save_key", uuid.uuid4().hex)
+    st.session_state.save_job = get_saver().submit(
+        key,
+        lambda notify, final: save_portfolio(data, pool, sheet_id, snapshot, notify, raise_quota_errors=not final),
+        context={"data": data, "journal_own": list(st.session_state.journal_own)}
+    )
+    return st.session_state.save_job
+
+# Function to apply a finished background save to this session
+def apply_finished_save():
+    job = st.session_state.get("save_job")
+    if job is None or not job.done():
+        return
+    st.session_state.save_job = None
+    st.session_state.last_save = job
+    if job.state != SAVED or not job.result[0]:
+        # A failed or stale save means the sheet may hold changes this process
+        # has not seen; make new sessions read it afresh
+        get_portfolio_cache().invalidate()
+        return
+    _, snapshot, saved_data = job.result
+    submitted = job.context["data"]
+    # Adopt merged rows only if nothing was edited while saving; otherwise the
+    # next save merges again from the old snapshot
+    if saved_data is submitted or st.session_state.fd_data is submitted:
+        st.session_state.sheet_snapshot = snapshot
+        st.session_state.fd_data = saved_data if saved_data is not submitted else st.session_state.fd_data
+    # New sessions start from what was just saved
+    get_portfolio_cache().put(saved_data, snapshot)
+    # Drop the journal entries the save covered
+    covered = set(job.context["journal_own"])
+    get_journal().discard(upto=st.session_state.journal_seen, seqs=covered)
+    st.session_state.journal_own = [seq for seq in st.session_state.journal_own if seq not in covered]
+
+# Live status of this session's background save, polled while it runs
+@st.experimental_fragment(run_every=1)
+def save_progress():
+    job = st.session_state.get("save_job")
+    if job is not None and job.done():
+        st.rerun()
+    if job is not None:
+        st.status(job.describe(), state="running")
+        # Messages the save has reported so far, collected on its job off the script thread
+        for level, message in list(job.messages):
+            notify(level, message)
+
+# Versioned per-bank rate cards, shared by all sessions
+@st.cache_resource
+def get_rate_cards():
+    return RateCardStore()
+
+# Function to return this session's cache of simulation results
+def get_result_cache():
+    return st.session_state.setdefault("result_cache", ResultCache())
+
+# Function to return the FD_Number/Bank index for this session's data
+def get_fd_index():
+    index = st.session_state.get("fd_index")
+    if index is None or not index.is_for(st.session_state.fd_data):
+        index = PortfolioIndex(st.session_state.fd_data)
+        st.session_state.fd_index = index
+    return index
+
+# Function to return the dashboard totals for this session's data
+def get_fd_aggregates():
+    aggregates = st.session_state.get("fd_aggregates")
+    if aggregates is None or not aggregates.is_for(st.session_state.fd_data):
+        aggregates = PortfolioAggregates(st.session_state.fd_data)
+        st.session_state.fd_aggregates = aggregates
+    return aggregates
+
+# Function to return the maturity-date index for this session's data
+def get_maturity_index():
+    maturities = st.session_state.get("fd_maturities")
+    if maturities is None or not maturities.is_for(st.session_state.fd_data):
+        maturities = MaturityIndex(st.session_state.fd_data)
+        st.session_state.fd_maturities = maturities
+    return maturities
+
+# Function to append rows under fresh labels, keeping the indexes and totals in step
+def add_fd_rows(new_rows):
+    index, aggregates, maturities = get_fd_index(), get_fd_aggregates(), get_maturity_index()
+    data = append_rows(st.session_state.fd_data, new_rows)
+    st.session_state.fd_data = data
+    labels = data.index[len(data) - len(new_rows):]
+    index.add(data, labels)
+    aggregates.add(data, labels)
+    maturities.add(data, labels)
+
+# Function to drop one row by label without renumbering the rest
+def delete_fd_row(label):
+    index, aggregates, maturities = get_fd_index(), get_fd_aggregates(), get_maturity_index()
+    # The indexes only tombstone the row; the frame itself is still copied without it,
+    # O(N) but a single block copy (about 80 ms for 1,000,000 deposits)
+    st.session_state.fd_data = st.session_state.fd_data.drop(index=label)
+    index.remove(st.session_state.fd_data, label)
+    aggregates.remove(st.session_state.fd_data, label)
+    maturities.remove(st.session_state.fd_data, label)
+
+# Function to compact the journal into storage once it has grown long enough
+def compact_journal_if_needed():
+    if len(get_journal()) >= COMPACT_EVERY:
+        persist_fd_data()
 
 # Initialize session state for storing data
 if 'fd_data' not in st.session_state:
-    st.session_state.fd_data = load_fd_data()
+    # Show the first rows of a large sheet while the rest streams in
+    load_preview = st.empty()
+    def show_load_progress(first_page, rows_loaded):
+        with load_preview.container():
+            st.caption(f"Loading portfolio... {rows_loaded:,} rows so far")
+            st.dataframe(first_page.head(PAGE_SIZES[0]), hide_index=True, use_container_width=True)
+    portfolio = get_portfolio_cache().get(on_page=show_load_progress)
+    load_preview.empty()
+    journal = get_journal()
+    st.session_state.journal_seen = journal.last_seq
+    st.session_state.journal_own = []
+    # Re-apply adds/deletes not yet saved, including any from before a crash
+    view = portfolio.view()
+    data, dropped, added, unmatched = journal.replay_changes(view)
+    if unmatched:
+        st.warning(f"{len(unmatched)} journaled delete(s) no longer match a deposit and were skipped: "
+                   + ", ".join(str(entry["row"].get("FD_Number")) for entry in unmatched))
+    st.session_state.fd_data = data
+    st.session_state.sheet_snapshot = portfolio.snapshot
+    # Start from the indexes and dashboard totals shared by every session on
+    # this version, brought up to date with the replayed rows only
+    for key, name, build in (("fd_index", "index", PortfolioIndex),
+                             ("fd_aggregates", "aggregates", PortfolioAggregates),
+                             ("fd_maturities", "maturities", MaturityIndex)):
+        st.session_state[key] = portfolio.derived(name, build).bind(view)
+        st.session_state[key].update(data, dropped, added)
+
+# Show where the last save got to
+apply_finished_save()
+if st.session_state.get("save_job") is not None:
+    save_progress()
+elif "last_save" in st.session_state:
+    last_save = st.session_state.pop("last_save")
+    for level, message in last_save.messages:
+        notify(level, message)
+    if last_save.state == SAVED and last_save.result[0]:
+        st.success(f"Data saved to Google Sheets successfully! ({last_save.describe()})")
+    else:
+        st.error(f"Failed to save data to Google Sheets. {last_save.error or ''}")
 
 if 'calculation_result' not in st.session_state:
     st.session_state.calculation_result = None
@@ -635,7 +354,7 @@ if 'show_calculator' not in st.session_state:
     st.session_state.show_calculator = True
 
 # Add tabs for different sections
-tab1, tab2 = st.tabs(["Add/Calculate FD", "View/Manage FDs"])
+tab1, tab2, tab3 = st.tabs(["Add/Calculate FD", "View/Manage FDs", "Portfolio Analytics"])
 
 with tab1:
     # FD Calculator and Add FD Form
@@ -648,10 +367,7 @@ with tab1:
         with col1:
             bank = st.selectbox(
                 "Bank Name",
-                options=["SBI", "HDFC", "ICICI", "Axis", "Kotak", 
-                        "Punjab National Bank", "Bank of Baroda", "Canara Bank", 
-                        "IDBI Bank", "Indian Bank", "Central Bank of India", 
-                        "Union Bank", "Others"]
+                options=BANKS
             )
         
         with col2:
@@ -670,7 +386,19 @@ with tab1:
             principal = st.number_input("Principal Amount (₹)", min_value=0.0, value=10000.0, step=1000.0, format="%.2f")
         
         with col2:
-            rate = st.number_input("Interest Rate (%)", min_value=0.0, max_value=20.0, value=5.5, step=0.1, format="%.2f")
+            # Prefill the bank's card rate for the tenor/compounding chosen below
+            card_rate = get_rate_cards().get_rate(
+                bank,
+                tenor_days(st.session_state.get("fd_years", 1), st.session_state.get("fd_months", 0),
+                           st.session_state.get("fd_days", 0)),
+                st.session_state.get("fd_compounding", "Yearly")
+            )
+            # Clamped, as cards saved before rates were validated may be out of range
+            rate = st.number_input("Interest Rate (%)", min_value=0.0, max_value=MAX_RATE,
+                                   value=5.5 if card_rate is None else min(max(float(card_rate), 0.0), MAX_RATE),
+                                   step=0.1, format="%.2f")
+            if card_rate is not None:
+                st.caption(f"{bank} rate card v{get_rate_cards().card(bank)['version']}")
         
         # Start date and duration
         col1, col2 = st.columns(2)
@@ -681,20 +409,25 @@ with tab1:
         with col2:
             compounding = st.selectbox(
                 "Compounding",
-                options=["Yearly", "Half Yearly", "Quarterly", "Monthly"]
+                options=list(COMPOUNDING_FREQUENCY),
+                key="fd_compounding"
             )
         
         # Duration
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            duration_years = st.number_input("Duration (Years)", min_value=0, value=1)
+            duration_years = st.number_input("Duration (Years)", min_value=0, value=1, key="fd_years")
         
         with col2:
-            duration_months = st.number_input("Duration (Months)", min_value=0, value=0)
+            duration_months = st.number_input("Duration (Months)", min_value=0, value=0, key="fd_months")
         
         with col3:
-            duration_days = st.number_input("Duration (Days)", min_value=0, value=0)
+            duration_days = st.number_input("Duration (Days)", min_value=0, value=0, key="fd_days")
+        
+        # Bank-style maturity on the real calendar instead of days/365
+        exact_mode = st.checkbox("Calendar-accurate maturity (real month lengths, paisa rounding)")
+        maturity_fn = calc_maturity_exact if exact_mode else quote_maturity
         
         # Calculate button
         col1, col2 = st.columns(2)
@@ -715,7 +448,7 @@ with tab1:
                 st.error("Duration must be greater than 0")
             else:
                 duration = {"years": duration_years, "months": duration_months, "days": duration_days}
-                result = calc_maturity(principal, rate, start_date, duration, compounding)
+                result = maturity_fn(principal, rate, start_date, duration, compounding)
                 st.session_state.calculation_result = result
         
         # Display calculation result if available
@@ -738,7 +471,7 @@ with tab1:
                 # Calculate maturity if not already calculated
                 if not st.session_state.calculation_result:
                     duration = {"years": duration_years, "months": duration_months, "days": duration_days}
-                    result = calc_maturity(principal, rate, start_date, duration, compounding)
+                    result = maturity_fn(principal, rate, start_date, duration, compounding)
                 else:
                     result = st.session_state.calculation_result
                 
@@ -749,14 +482,20 @@ with tab1:
                     "Principal": [principal],
                     "Rate": [rate],
                     "StartDate": [start_date],
-                    "Duration": [f"{duration_years} years {duration_months} months {duration_days} days"],
+                    "Years": [duration_years],
+                    "Months": [duration_months],
+                    "Days": [duration_days],
                     "Compounding": [compounding],
                     "MaturityAmount": [result['maturity_amount']],
                     "MaturityDate": [result['maturity_date']]
                 })
                 
+                # Journal the new row so it survives until the next save
+                st.session_state.journal_own.append(get_journal().append_add(new_row.iloc[0]))
+                
                 # Add the new row to existing data
-                st.session_state.fd_data = pd.concat([st.session_state.fd_data, new_row], ignore_index=True)
+                add_fd_rows(new_row)
+                compact_journal_if_needed()
                 
                 # Reset calculation result
                 st.session_state.calculation_result = None
@@ -767,6 +506,86 @@ with tab1:
                 # Switch to the second tab
                 st.query_params.tab='View/Manage FDs'
 
+    # Bulk import: validate, price and merge a whole file of deposits at once
+    with st.expander("Bulk Import"):
+        st.caption("CSV or Excel with Bank, FD_Number, Principal, Rate, StartDate, Compounding and "
+                   "either Duration or Years/Months/Days columns. Maturities use the mode chosen above.")
+        import_file = st.file_uploader("Deposits File", type=["csv", "xlsx"], key="import_file")
+        
+        if import_file is not None and st.button("Import Deposits"):
+            try:
+                imported, rejected = prepare_import(
+                    read_deposit_file(import_file), st.session_state.fd_data["FD_Number"], exact=exact_mode
+                )
+            except (ValueError, ImportError) as e:
+                st.error(f"Could not import {import_file.name}: {e}")
+            else:
+                if len(imported):
+                    # Journal every row in one write, then merge them in one step
+                    st.session_state.journal_own.extend(get_journal().append_adds(imported))
+                    add_fd_rows(imported)
+                    compact_journal_if_needed()
+                    st.success(f"Imported {len(imported):,} deposit(s) from {import_file.name}")
+                if len(rejected):
+                    st.warning(f"Skipped {len(rejected):,} row(s):")
+                    st.dataframe(rejected.head(IMPORT_REJECTS_SHOWN), hide_index=True, use_container_width=True)
+
+    # Goal planner: solve the calculator inputs backwards from a target amount
+    with st.expander("Goal Planner"):
+        target_amount = st.number_input("Target Maturity Amount (₹)", min_value=0.0,
+                                        value=round(principal * 1.5, 2), step=1000.0, format="%.2f")
+        if duration_years == 0 and duration_months == 0 and duration_days == 0:
+            st.info("Enter a duration above to plan against it")
+        else:
+            needed = required_principal([target_amount], [rate], [duration_years], [duration_months],
+                                        [duration_days], [compounding])[0]
+            needed_rate = break_even_rate([principal], [target_amount], [duration_years], [duration_months],
+                                          [duration_days], [compounding])[0]
+            needed_days = shortest_tenor([principal], [target_amount], [rate], [compounding])[0]
+            st.markdown(f"""
+            Principal needed at {rate:.2f}%: ₹{needed:,.2f}  
+            Rate needed on ₹{principal:,.2f}: {needed_rate:.2f}%  
+            Shortest tenor at {rate:.2f}%: {"not reachable" if pd.isna(needed_days) else f"{int(needed_days):,} days"}
+            """)
+
+    # Rate cards: one versioned card per bank, tenor bucket x compounding
+    with st.expander("Bank Rate Cards"):
+        rate_cards = get_rate_cards()
+        card_bank = st.selectbox("Bank", options=BANKS[:-1], key="rate_card_bank")
+        card = rate_cards.card(card_bank)
+        card_frame = pd.DataFrame(
+            [[card["rates"].get(tenor, {}).get(c) for c in COMPOUNDING_FREQUENCY] for tenor in TENOR_BUCKETS],
+            index=list(TENOR_BUCKETS), columns=list(COMPOUNDING_FREQUENCY), dtype="float64"
+        )
+        st.caption(f"Version {card['version']}" + (f", updated {card['updated']}" if card["updated"] else ""))
+        edited_card = st.data_editor(card_frame, key=f"rate_card_{card_bank}_{card['version']}",
+                                     use_container_width=True)
+
+        if st.button("Save Rate Card"):
+            rates = {tenor: {c: float(v) for c, v in row.items() if pd.notna(v)}
+                     for tenor, row in edited_card.iterrows()}
+            rates = {tenor: row for tenor, row in rates.items() if row}
+            try:
+                changed = rate_cards.set_card(card_bank, rates)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                if not changed:
+                    st.info("Rate card unchanged")
+                else:
+                    # Reprice only this bank's deposits in the changed tenor/compounding cells
+                    index, aggregates, maturities = get_fd_index(), get_fd_aggregates(), get_maturity_index()
+                    st.session_state.fd_data, repriced = reprice_deposits(
+                        st.session_state.fd_data, rate_cards, card_bank, changed,
+                        labels=index.lookup_bank(card_bank)
+                    )
+                    # Same rows and labels, only rates and maturities changed
+                    index.update(st.session_state.fd_data)
+                    aggregates.replace(st.session_state.fd_data, repriced)
+                    maturities.replace(st.session_state.fd_data, repriced)
+                    st.success(f"Saved {card_bank} rate card v{rate_cards.card(card_bank)['version']}; "
+                               f"repriced {len(repriced)} deposit(s). Save Data to Google Sheets to store them.")
+
 with tab2:
     # View and manage FDs
     with st.container():
@@ -774,58 +593,58 @@ with tab2:
         
         # Display FD table
         if not st.session_state.fd_data.empty:
-            # Add a Row ID column starting from 1 (instead of 0)
-            display_df = st.session_state.fd_data.copy()
+            # Table controls: filtering, sorting and paging happen on the raw data
+            col1, col2, col3 = st.columns([2, 2, 1])
             
-            # Add the Row ID column with values starting from 1
-            display_df.reset_index(inplace=True)
-            display_df['index'] = display_df['index'] + 1
-            display_df.rename(columns={'index': 'Row ID'}, inplace=True)
+            with col1:
+                table_search = st.text_input("Filter by FD Number or Bank", key="table_search")
             
-            # Rename columns as requested
-            display_df.rename(columns={
-                'FD_Number': 'FD Number',
-                'Rate': 'Rate (%)',
-                'StartDate': 'Start Date',
-                'MaturityAmount': 'Maturity Amount',
-                'MaturityDate': 'Maturity Date'
-            }, inplace=True)
-
-            # Ensure FD Number is treated as string to avoid Arrow serialization warnings
-            display_df['FD Number'] = display_df['FD Number'].astype(str)
+            with col2:
+                sort_by = st.selectbox(
+                    "Sort By",
+                    options=[None] + TABLE_ORDER,
+                    format_func=lambda col: "Row ID" if col is None else DISPLAY_COLUMNS.get(col, col),
+                    key="table_sort"
+                )
             
-            # Reorder columns - keep Row ID first, then Bank, FD Number
-            cols = display_df.columns.tolist()
-            cols.remove('Bank')
-            cols.remove('FD Number')
-            cols.remove('Row ID')
-            cols = ['Row ID', 'Bank', 'FD Number'] + cols
-            display_df = display_df[cols]
+            with col3:
+                descending = st.checkbox("Descending", key="table_desc")
+            
+            col1, col2 = st.columns(2)
             
-            # Format the DataFrame for display
-            display_df['Principal'] = display_df['Principal'].apply(lambda x: f"₹{x:,.2f}")
-            display_df['Maturity Amount'] = display_df['Maturity Amount'].apply(lambda x: f"₹{x:,.2f}")
+            with col1:
+                page_size = st.selectbox("Rows per Page", options=PAGE_SIZES, key="table_page_size")
             
-            if 'Start Date' in display_df.columns:
-                display_df['Start Date'] = pd.to_datetime(display_df['Start Date']).dt.strftime('%Y-%m-%d')
+            with col2:
+                page_number = st.number_input("Page", min_value=1, value=1, step=1, key="table_page")
             
-            if 'Maturity Date' in display_df.columns:
-                display_df['Maturity Date'] = pd.to_datetime(display_df['Maturity Date']).dt.strftime('%Y-%m-%d')
+            table_page = query_page(
+                st.session_state.fd_data, index=get_fd_index(), search=table_search,
+                sort_by=sort_by, ascending=not descending,
+                page=page_number, page_size=page_size
+            )
             
-            # Display the formatted DataFrame without the index column
-            st.dataframe(display_df, use_container_width=True, hide_index=True)
+            # Display only the formatted rows on this page, without the index column
+            st.dataframe(table_page.frame, use_container_width=True, hide_index=True)
+            if table_page.total_rows:
+                st.caption(
+                    f"Showing {table_page.first_row + 1}-{table_page.first_row + len(table_page.frame)} "
+                    f"of {table_page.total_rows} (page {table_page.page} of {table_page.page_count})"
+                )
+            else:
+                st.caption("No Fixed Deposits match the filter.")
             
             # Delete row functionality
             col1, col2 = st.columns([3, 1])
             
             with col1:
-                # Create options with 1-based indexing for display
-                options = list(range(len(st.session_state.fd_data)))
-                
+                # Narrow the choices through the index instead of listing every row
+                fd_index = get_fd_index()
+                search = st.text_input("Search FD Number or Bank", key="delete_search")
                 row_to_delete = st.selectbox(
-                    "Select Row to Delete",
-                    options=options,
-                    format_func=lambda x: f"Row {x+1}: {st.session_state.fd_data.iloc[x]['Bank']} - {st.session_state.fd_data.iloc[x]['FD_Number']}"
+                    "Select FD to Delete",
+                    options=fd_index.search(search, limit=DELETE_OPTIONS_LIMIT),
+                    format_func=fd_index.describe
                 )
             
             with col2:
@@ -835,10 +654,13 @@ with tab2:
             
             if delete_button:
                 # Note: We need to delete from the original dataframe, not the display one
-                st.session_state.fd_data = st.session_state.fd_data.drop(index=row_to_delete)
-                st.session_state.fd_data.reset_index(drop=True, inplace=True)
-                st.success(f"Row {row_to_delete+1} deleted successfully!")
-                st.rerun()
+                if row_to_delete is not None:
+                    deleted_row = st.session_state.fd_data.loc[row_to_delete]
+                    st.session_state.journal_own.append(get_journal().append_delete(deleted_row))
+                    delete_fd_row(row_to_delete)
+                    compact_journal_if_needed()
+                    st.success(f"FD {deleted_row['FD_Number']} deleted successfully!")
+                    st.rerun()
             
             # Save and Download buttons in separate columns
             col1, col2 = st.columns(2)
@@ -849,40 +671,202 @@ with tab2:
                 st.markdown('</div>', unsafe_allow_html=True)
             
             with col2:
-                # Create a CSV download button
+                # Build the export only on request, once per version of the data
                 st.markdown('<div class="save-btn">', unsafe_allow_html=True)
                 
-                # Prepare the data for download (convert to CSV)
-                csv_data = st.session_state.fd_data.copy()
+                export_format = st.selectbox("Export Format", options=list(EXPORT_FORMATS))
+                file_name, mime = EXPORT_FORMATS[export_format]
+                export_cache = st.session_state.setdefault("export_cache", ExportCache())
+                export = export_cache.get(st.session_state.fd_data, export_format)
                 
-                # Convert dates to strings safely
-                for col in ["StartDate", "MaturityDate"]:
-                    if col in csv_data.columns:
-                        # Check if the column contains datetime objects
-                        if pd.api.types.is_datetime64_any_dtype(csv_data[col]):
-                            csv_data[col] = csv_data[col].dt.strftime('%Y-%m-%d')
-                        elif len(csv_data) > 0 and (isinstance(csv_data[col].iloc[0], datetime) or 
-                                                    isinstance(csv_data[col].iloc[0], pd.Timestamp)):
-                            csv_data[col] = csv_data[col].apply(lambda x: x.strftime("%Y-%m-%d") if isinstance(x, (datetime, pd.Timestamp)) else str(x))
-                        else:
-                            # If it's already a string or another type, convert to string
-                            csv_data[col] = csv_data[col].astype(str)
+                if export is None and st.button("Prepare Download", use_container_width=True):
+                    export = export_cache.build(st.session_state.fd_data, export_format)
                 
-                csv = csv_data.to_csv(index=False)
-                st.download_button(
-                    label="Download as CSV",
-                    data=csv,
-                    file_name="fixed_deposits.csv",
-                    mime="text/csv",
-                    use_container_width=True
-                )
+                if export is not None:
+                    st.download_button(
+                        label=f"Download as {export_format}",
+                        data=export,
+                        file_name=file_name,
+                        mime=mime,
+                        use_container_width=True
+                    )
                 st.markdown('</div>', unsafe_allow_html=True)
             
             if save_button:
-                if save_fd_data(st.session_state.fd_data):
-                    st.success("Data saved to Google Sheets successfully!")
-                else:
-                    st.error("Failed to save data to Google Sheets.")
+                # Save in the background; the status above tracks it
+                persist_fd_data()
+                st.rerun()
+            
+            # Projected inflows from maturing deposits, computed only when shown
+            if st.checkbox("Show Cash-flow Ladder"):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    ladder_freq = st.selectbox("Bucket", options=list(LADDER_FREQUENCIES), index=2)
+                
+                with col2:
+                    ladder_years = st.number_input("Years Ahead", min_value=1, max_value=30, value=10)
+                
+                ladder = maturity_ladder(
+                    st.session_state.fd_data, years=ladder_years, freq=LADDER_FREQUENCIES[ladder_freq]
+                )
+                st.bar_chart(ladder.set_index("Bucket")["MaturityAmount"])
+                total_accrued = accrued_interest(st.session_state.fd_data).sum()
+                st.markdown(f"**Interest accrued to date:** ₹{total_accrued:,.2f}")
+            
+            # Portfolio value under rate shocks and compounding switches
+            if st.checkbox("Show Rate Sensitivity"):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    max_shock = st.slider("Rate Shock Range (± bp)", min_value=25, max_value=500, value=100, step=25)
+                
+                with col2:
+                    scenario_compounding = st.multiselect(
+                        "Compounding", options=[AS_BOOKED] + list(COMPOUNDING_FREQUENCY), default=[AS_BOOKED]
+                    )
+                
+                if scenario_compounding:
+                    sensitivity = run_scenarios(
+                        st.session_state.fd_data, range(-max_shock, max_shock + 1, 25), scenario_compounding
+                    )
+                    st.line_chart(sensitivity.pivot(index="ShockBp", columns="Compounding", values="MaturityValue"))
+                    table = pd.DataFrame({
+                        "Scenario": sensitivity["Scenario"],
+                        "Maturity Value": format_currency(sensitivity["MaturityValue"]),
+                        "Interest": format_currency(sensitivity["Interest"]),
+                        "Change": format_currency(sensitivity["Change"]),
+                        "Change %": sensitivity["ChangePct"].map("{:+.2f}%".format),
+                    })
+                    st.dataframe(
+                        table,
+                        hide_index=True, use_container_width=True
+                    )
+            
+            # Auto-renewal at the prevailing card rates, and breaking deposits early
+            if st.checkbox("Show Early Withdrawal & Renewal"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    rollovers = st.number_input("Renewals", min_value=0, max_value=20, value=DEFAULT_ROLLOVERS)
+                
+                with col2:
+                    renewal_shift = st.slider("Renewal Rate Shift (bp)", min_value=-300, max_value=300, value=0, step=25)
+                
+                with col3:
+                    penalty_bp = st.number_input("Penalty (bp)", min_value=0, max_value=500,
+                                                 value=DEFAULT_PENALTY_BP, step=25)
+                
+                break_date = st.date_input("Withdraw On", value=datetime.now())
+                # Recompute only when the data, the inputs or the cards change
+                rate_cards, results = get_rate_cards(), get_result_cache()
+                schedule_params = (int(rollovers), renewal_shift, rate_cards.versions())
+                schedule = results.get(
+                    st.session_state.fd_data, "rollovers", schedule_params,
+                    lambda: simulate_rollovers(st.session_state.fd_data, int(rollovers), renewal_shift,
+                                               rate_cards=rate_cards)
+                )
+                renewals = schedule.summary()
+                st.line_chart(renewals.set_index("Term")["MaturityValue"])
+                st.dataframe(pd.DataFrame({
+                    "Term": renewals["Term"].map(lambda term: "Booked" if term == 0 else f"Renewal {term}"),
+                    "Maturity Value": format_currency(renewals["MaturityValue"]),
+                    "Interest": format_currency(renewals["Interest"]),
+                    "Last Maturity": renewals["LastMaturity"].dt.strftime('%Y-%m-%d'),
+                }), hide_index=True, use_container_width=True)
+                
+                broken = results.get(
+                    st.session_state.fd_data, "breakage", schedule_params + (break_date, penalty_bp),
+                    lambda: simulate_breakage(st.session_state.fd_data, break_date, penalty_bp,
+                                              schedule=schedule, rate_cards=rate_cards)
+                )
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Payout if Withdrawn", format_currency([broken["BreakValue"].sum()])[0])
+                col2.metric("Value if Held to Term", format_currency([broken["HoldValue"].sum()])[0])
+                col3.metric("Penalty", format_currency([broken["Penalty"].sum()])[0])
+            
+            # Spread of the portfolio's value when renewals meet uncertain future rates
+            if st.checkbox("Show Reinvestment Risk"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    mc_paths = st.selectbox("Rate Paths", options=[500, DEFAULT_PATHS, 5000], index=1)
+                
+                with col2:
+                    mc_years = st.slider("Horizon (years)", min_value=1, max_value=30, value=10)
+                
+                with col3:
+                    mc_sigma = st.slider("Rate Volatility (bp/yr)", min_value=0, max_value=300,
+                                         value=DEFAULT_SIGMA_BP, step=25)
+                
+                # Rerun the paths only when the data, the inputs, the cards or the day change
+                rate_cards = get_rate_cards()
+                simulation = get_result_cache().get(
+                    st.session_state.fd_data, "monte_carlo",
+                    (mc_paths, mc_years, mc_sigma, rate_cards.versions(), datetime.now().date()),
+                    lambda: run_monte_carlo(st.session_state.fd_data, mc_paths, mc_years, mc_sigma,
+                                            seed=MONTE_CARLO_SEED, rate_cards=rate_cards)
+                )
+                mc_summary = simulation.summary()
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Median Value", format_currency([mc_summary["Median"]])[0])
+                col2.metric("At Today's Rates", format_currency([mc_summary["Baseline"]])[0])
+                col3.metric("Chance of Shortfall", f"{mc_summary['ShortfallProbability']:.0%}")
+                percentiles = simulation.percentiles()
+                st.dataframe(pd.DataFrame({
+                    "Percentile": percentiles["Percentile"].map("P{}".format),
+                    "Value at Horizon": format_currency(percentiles["TerminalValue"]),
+                    "Interest": format_currency(percentiles["Interest"]),
+                    "vs Today's Rates": format_currency(percentiles["Change"]),
+                }), hide_index=True, use_container_width=True)
+                st.caption(f"{mc_paths:,} mean-reverting rate paths to {mc_summary['Horizon']:%Y-%m-%d}; "
+                           "renewals at the rate cards (or booked rates) plus each path's shift.")
+        
+        else:
+            st.info("No Fixed Deposits added yet. Use the Add/Calculate FD tab to add a new Fixed Deposit.")
+
+with tab3:
+    # Dashboard read from running totals, so it costs O(groups) per rerun
+    with st.container():
+        st.subheader("Portfolio Analytics")
+        
+        if not st.session_state.fd_data.empty:
+            aggregates = get_fd_aggregates()
+            summary = aggregates.summary()
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Deposits", f"{summary['Deposits']:,}")
+            col2.metric("Principal", format_currency([summary["Principal"]])[0])
+            col3.metric("Maturity Value", format_currency([summary["MaturityAmount"]])[0])
+            col4.metric("Weighted Avg Rate", f"{summary['WeightedRate']:.2f}%")
+            
+            # Deposits falling due soon, read from the maturity-date index
+            st.markdown("**Maturing Soon**")
+            alert_days = st.radio("Next", options=list(ALERT_WINDOWS), index=1, horizontal=True,
+                                  format_func=lambda days: f"{days} days")
+            soon = maturing_soon(st.session_state.fd_data, get_maturity_index(), alert_days)
+            if len(soon):
+                st.caption(f"{len(soon):,} deposit(s) maturing in the next {alert_days} days, "
+                           f"{format_currency([soon['MaturityAmount'].sum()])[0]} in total")
+                positions = label_positions(st.session_state.fd_data, soon.index[:MATURING_SHOWN])
+                table = format_rows(st.session_state.fd_data, positions)
+                table.insert(len(table.columns), "Days Left", soon["DaysLeft"].to_numpy()[:MATURING_SHOWN])
+                st.dataframe(table, hide_index=True, use_container_width=True)
+            else:
+                st.caption(f"Nothing matures in the next {alert_days} days.")
+            
+            st.markdown("**By Bank**")
+            by_bank = aggregates.by("Bank")
+            st.dataframe(format_aggregates(by_bank), hide_index=True, use_container_width=True)
+            st.caption(f"Largest bank holds {by_bank['Share'].iloc[0]:.1f}% of principal; "
+                       f"concentration index (HHI) {summary['BankHHI']:.3f} (1 = a single bank)")
+            
+            st.markdown("**By Compounding**")
+            st.dataframe(format_aggregates(aggregates.by("Compounding")), hide_index=True, use_container_width=True)
+            
+            st.markdown("**By Maturity Month**")
+            by_month = aggregates.by("MaturityMonth")
+            st.bar_chart(by_month.set_index("MaturityMonth")["MaturityAmount"])
         
         else:
             st.info("No Fixed Deposits added yet. Use the Add/Calculate FD tab to add a new Fixed Deposit.")
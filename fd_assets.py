@@ -0,0 +1,269 @@
+import io
+import re
+
+# Logo shown on the login page and in the header
+LOGO_FILE = 'emblem2.png'
+# Thumbnail width in pixels: 2x the largest display width, for high-DPI screens
+LOGO_THUMBNAIL_WIDTH = 140
+
+
+# Function to shrink a CSS block before it is sent to the browser
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return css.strip()
+
+
+# Function to decode the logo and return a small PNG thumbnail of it
+def logo_thumbnail(path=LOGO_FILE, width=LOGO_THUMBNAIL_WIDTH):
+    from PIL import Image
+
+    with Image.open(path) as image:
+        height = max(1, round(image.height * width / image.width))
+        thumbnail = image.resize((width, height), Image.LANCZOS) if image.width > width else image.copy()
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+# Login page styling, minified once per process
+LOGIN_CSS = minify_css("""
+<style>
+.login-container {
+    max-width: 500px;
+    margin: 0 auto;
+    padding: 30px;
+    background-color: #f8f9fa;
+    border-radius: 10px;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+}
+.login-header {
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    margin-bottom: 25px;
+}
+.login-logo {
+    margin-right: 15px;
+}
+.login-title {
+    color: #692B30;
+    font-size: 1.8rem;
+    font-weight: 700;
+    display: inline-block;
+    vertical-align: middle;
+    border-bottom: 2px solid #692B30;
+    padding-bottom: 5px;
+}
+.login-input-label {
+    font-weight: 500 !important;
+    color: #692B30 !important;
+    font-size: 1.1rem !important;
+    margin-bottom: 0.5rem !important;
+}
+.login-button {
+    background-color: #f0f0f0;
+    color: #692B30 !important;
+    font-weight: bold;
+    border-radius: 5px;
+    border: 1px solid #ddd;
+    padding: 10px 20px;
+    margin-top: 20px;
+    width: 100%;
+    cursor: pointer;
+}
+.login-button:hover {
+    background-color: #e0e0e0;
+}
+</style>
+""")
+
+# Custom CSS for better styling with increased font sizes and improved readability
+# Extra CSS specificity to ensure the main title is burgundy
+APP_CSS = minify_css("""
+<style>
+    .main .block-container {
+        padding-top: 2rem;
+        padding-bottom: 2rem;
+    }
+    
+    /* More specific selectors for the main title with burgundy color */
+    .main h1, h1, .st-emotion-cache-1egp7eo h1, div.st-emotion-cache-zt5igj h1, header h1 {
+        color: #692B30 !important;
+        text-align: center;
+        margin-bottom: 1.5rem;
+        padding-bottom: 0.5rem;
+        border-bottom: 2px solid #692B30;
+        font-size: 2.5rem !important;
+        font-weight: 700 !important;
+    }
+    
+    /* Additional styles for main title - more specificity */
+    [data-testid="stAppViewContainer"] h1, 
+    .stApp h1, 
+    .element-container h1,
+    .st-emotion-cache-10trblm {
+        color: #692B30 !important;
+    }
+    
+    /* Style for inline title */
+    .inline-title {
+        color: #692B30;
+        font-size: 2.5rem;
+        font-weight: 700;
+        margin-top: 0.5rem;
+        margin-bottom: 1.5rem;
+        padding-bottom: 0.5rem;
+        border-bottom: 2px solid #692B30;
+        display: inline-block;
+        vertical-align: middle;
+    }
+    
+    /* Align logo vertically */
+    .logo-img {
+        vertical-align: middle;
+        margin-right: 15px;
+    }
+    
+    /* Increase subheader font size and change to burgundy */
+    h2, .subheader, h3, h4, h5, h6 {
+        color: #692B30 !important;
+        font-size: 1.8rem !important;
+        font-weight: 600 !important;
+        margin-top: 1rem;
+        margin-bottom: 1.5rem;
+    }
+    
+    /* Tab styling with larger font and burgundy color */
+    .stTabs [data-baseweb="tab-list"] {
+        gap: 24px;
+    }
+    
+    .stTabs [data-baseweb="tab"] {
+        font-size: 1.2rem !important;
+        font-weight: 600 !important;
+        color: #692B30 !important;
+    }
+    
+    /* Make buttons more appealing with burgundy text */
+    .stButton > button {
+        width: 100%;
+        font-weight: bold;
+        border-radius: 5px;
+        height: 3rem;
+        font-size: 1.1rem !important;
+        color: #692B30 !important;
+    }
+    
+    /* Button inner text color */
+    .stButton > button span {
+        color: #692B30 !important;
+    }
+    
+    /* More visible result section with burgundy header */
+    .result-box {
+        padding: 1.2rem;
+        background-color: #f0f9ff;
+        border-radius: 5px;
+        margin: 1.2rem 0;
+        border-left: 4px solid #692B30;
+        font-size: 1.1rem !important;
+    }
+    
+    .result-box strong {
+        color: #692B30;
+    }
+    
+    /* Dataframe styling with burgundy headers */
+    .dataframe {
+        border-collapse: collapse;
+        width: 100%;
+        font-size: 1.1rem !important;
+    }
+    .dataframe th {
+        border: 1px solid #ddd;
+        padding: 10px;
+        text-align: left !important;
+        background-color: #f2f2f2;
+        color: #692B30 !important;
+        font-weight: 600 !important;
+        font-size: 1.1rem !important;
+    }
+    .dataframe td {
+        border: 1px solid #ddd;
+        padding: 10px;
+        text-align: center !important;
+        font-size: 1.1rem !important;
+    }
+    .dataframe tr:nth-child(even) {
+        background-color: #f9f9f9;
+    }
+    .dataframe tr:hover {
+        background-color: #f1f1f1;
+    }
+    
+    /* Input field labels in burgundy */
+    label, .stSelectbox label, .stNumberInput label, .stDateInput label, p, .stTextInput label {
+        font-weight: 500 !important;
+        color: #692B30 !important;
+        font-size: 1.1rem !important;
+        margin-bottom: 0.5rem !important;
+    }
+    
+    /* Selectbox and input text */
+    .stSelectbox, .stNumberInput, .stDateInput, .stTextInput {
+        font-size: 1.1rem !important;
+    }
+    
+    /* About section text */
+    .st-expander p, .st-expander li {
+        font-size: 1.1rem !important;
+    }
+    
+    /* Success/info/error messages headers */
+    .stSuccess div:first-child, .stInfo div:first-child, .stError div:first-child, .stWarning div:first-child {
+        color: #692B30 !important;
+        font-weight: 600 !important;
+    }
+    
+    /* Expander header in burgundy */
+    .st-expander details summary {
+        color: #692B30 !important;
+        font-weight: 600 !important;
+    }
+    
+    /* Download button text color */
+    .stDownloadButton button span {
+        color: #692B30 !important;
+        font-weight: 600 !important;
+    }
+    
+    /* Strong and bold text in burgundy */
+    strong, b {
+        color: #692B30 !important;
+    }
+    
+    /* Remove horizontal padding to allow better alignment */
+    .css-1n76uvr, .css-18e3th9, .stMarkdown {
+        padding-left: 0 !important;
+        padding-right: 0 !important;
+    }
+    
+    /* Responsive design adjustments */
+    @media (max-width: 768px) {
+        .main .block-container {
+            padding: 1rem;
+        }
+        h1 {
+            font-size: 2rem !important;
+        }
+        h2, .subheader, h3 {
+            font-size: 1.5rem !important;
+        }
+        .inline-title {
+            font-size: 1.8rem;
+        }
+    }
+</style>
+""")
@@ -0,0 +1,141 @@
+"""Headless batch revaluation of fixed deposits.
+
+Streams an input CSV or Parquet file of deposits in chunks, computes
+maturity amounts and dates with calc_maturity_batch on a process pool and
+writes the result (input columns plus MaturityAmount and MaturityDate) to
+CSV or Parquet:
+
+    python fd_batch.py deposits.parquet maturities.parquet --workers 8 --chunk-size 200000
+
+Input needs Principal, Rate, StartDate and Compounding columns, plus either a
+Duration column ("1 years 0 months 0 days") or Years/Months/Days columns.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from fd_calc import calc_maturity_batch, duration_parts
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+# Function to compute maturities for one chunk of deposits
+def revalue_chunk(chunk):
+    years, months, days = duration_parts(chunk)
+    result = calc_maturity_batch(
+        chunk["Principal"], chunk["Rate"], chunk["StartDate"],
+        years, months, days, chunk["Compounding"]
+    )
+    out = chunk.copy()
+    out["MaturityAmount"] = result["MaturityAmount"].to_numpy()
+    out["MaturityDate"] = result["MaturityDate"].to_numpy()
+    return out
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+# Function to stream an input file as DataFrame chunks
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        for chunk in pd.read_csv(path, chunksize=chunk_size, dtype={"FD_Number": str},
+                                 parse_dates=["StartDate"]):
+            yield chunk
+
+
+class ChunkWriter:
+    """Appends result chunks to a CSV or Parquet file as they arrive."""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = _is_parquet(path)
+        self._writer = None
+        self._first = True
+
+    def write(self, chunk):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            out = chunk.copy()
+            for col in ["StartDate", "MaturityDate"]:
+                if col in out.columns:
+                    out[col] = pd.to_datetime(out[col]).dt.strftime('%Y-%m-%d')
+            out.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+# Function to revalue a whole file, keeping at most a few chunks in flight
+def run_batch(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """Revalue `input_path` into `output_path` and return the number of rows.
+
+    Chunks are processed in parallel but written in input order; at most
+    2 x workers chunks are held in memory at once. `workers=1` runs in
+    process without a pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    writer = ChunkWriter(output_path)
+    rows = 0
+    try:
+        if workers == 1:
+            for chunk in iter_chunks(input_path, chunk_size):
+                result = revalue_chunk(chunk)
+                writer.write(result)
+                rows += len(result)
+            return rows
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in iter_chunks(input_path, chunk_size):
+                pending.append(pool.submit(revalue_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    result = pending.popleft().result()
+                    writer.write(result)
+                    rows += len(result)
+            while pending:
+                result = pending.popleft().result()
+                writer.write(result)
+                rows += len(result)
+        return rows
+    finally:
+        writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute FD maturities for a file of deposits.")
+    parser.add_argument("input", help="input .csv or .parquet file of deposits")
+    parser.add_argument("output", help="output .csv or .parquet file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows per chunk (default {DEFAULT_CHUNK_SIZE:,})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU core)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    t0 = time.perf_counter()
+    rows = run_batch(args.input, args.output, args.chunk_size, args.workers)
+    logging.info(f"Revalued {rows:,} deposits in {time.perf_counter() - t0:.2f}s -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
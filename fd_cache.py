@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pandas as pd
+
+
+class CachedPortfolio:
+    """One loaded version of the portfolio, shared read-only between sessions."""
+
+    def __init__(self, version, data, snapshot, loaded_at):
+        self.version = version
+        self.data = data
+        self.snapshot = snapshot
+        self.loaded_at = loaded_at
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    def view(self):
+        """Return a session-private copy of the data.
+
+        With pandas copy-on-write enabled this is a shallow copy that only
+        duplicates columns when the session modifies them; without it we
+        fall back to a deep copy so the shared frame can never be mutated.
+        """
+        return self.data.copy(deep=not pd.get_option("mode.copy_on_write"))
+
+    def derived(self, name, build):
+        """Return `build(data)`, computed once for this version and shared by all sessions."""
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = build(self.data)
+            return self._derived[name]
+
+
+class ResultCache:
+    """Per-session cache of results computed from the current portfolio frame.
+
+    Keeps the latest result of each named computation with the parameters
+    it was run with, and drops everything once the session's data is
+    replaced (every add, delete or load produces a new frame).
+    """
+
+    def __init__(self):
+        self.source = None
+        self.results = {}
+
+    def get(self, data, name, params, compute):
+        """Return `compute()`, reused while `data` and `params` are unchanged."""
+        if self.source is not data:
+            self.source = data
+            self.results = {}
+        cached = self.results.get(name)
+        if cached is None or cached[0] != params:
+            cached = (params, compute())
+            self.results[name] = cached
+        return cached[1]
+
+
+class PortfolioCache:
+    """Process-wide, versioned cache of the parsed portfolio DataFrame.
+
+    `loader` returns `(data, snapshot)` where `snapshot` is the SheetSnapshot
+    of what was read (or None for local storage). Entries expire after `ttl`
+    seconds; concurrent callers wait for a single reload instead of each
+    downloading the sheet. Every load, put or invalidation bumps `version`.
+    """
+
+    def __init__(self, loader, ttl=300):
+        self.loader = loader
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.version = 0
+        self._entry = None
+
+    def _is_fresh(self):
+        return self._entry is not None and time.time() - self._entry.loaded_at < self.ttl
+
+    def get(self, **loader_args):
+        """Return the cached entry, reloading it (with `loader_args`) if stale."""
+        with self.lock:
+            if not self._is_fresh():
+                data, snapshot = self.loader(**loader_args)
+                self._store(data, snapshot)
+            return self._entry
+
+    def put(self, data, snapshot=None):
+        """Replace the cached data after a successful save, without reloading."""
+        with self.lock:
+            self._store(data.copy(), snapshot)
+            return self._entry
+
+    def invalidate(self):
+        """Force the next get() to reload from storage."""
+        with self.lock:
+            self.version += 1
+            self._entry = None
+
+    def _store(self, data, snapshot):
+        self.version += 1
+        self._entry = CachedPortfolio(self.version, data, snapshot, time.time())
@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from dateutil.relativedelta import relativedelta
+
+# Compounding periods per year for each option offered in the app
+COMPOUNDING_FREQUENCY = {"Yearly": 1, "Half Yearly": 2, "Quarterly": 4, "Monthly": 12}
+
+# Function to calculate FD maturity
+def calc_maturity(principal, rate, start_date, duration, compounding):
+    rate = rate / 100
+
+    # Determine compounding frequency
+    n = COMPOUNDING_FREQUENCY[compounding]
+
+    # Calculate duration in years - MODIFIED to match Shiny logic
+    years = duration.get('years', 0)
+    months = duration.get('months', 0)
+    days = duration.get('days', 0)
+
+    # Calculate fractional duration in years directly (matching Shiny logic)
+    duration_years = years + (months / 12) + (days / 365)
+
+    # Calculate maturity amount
+    maturity_amount = principal * (1 + rate / n) ** (n * duration_years)
+
+    # Calculate maturity date using duration_years * 365 (matching Shiny logic)
+    maturity_date = start_date + timedelta(days=int(duration_years * 365))
+
+    return {
+        'maturity_amount': round(maturity_amount, 2),
+        'maturity_date': maturity_date
+    }
+
+# Function to split the stored "1 years 0 months 0 days" text into integer columns
+def parse_duration(duration):
+    """Parse a column of Duration strings into years, months and days arrays."""
+    # Portfolios repeat a handful of tenors, so only parse each distinct string once
+    codes, uniques = pd.factorize(pd.Series(duration, dtype="object").astype(str))
+    parts = pd.Series(uniques, dtype="object").str.extract(
+        r"(?P<years>\d+)\s*years?\s+(?P<months>\d+)\s*months?\s+(?P<days>\d+)\s*days?"
+    )
+    parts = parts.fillna(0).astype(np.int64).to_numpy()[codes]
+    return parts[:, 0], parts[:, 1], parts[:, 2]
+
+# Function to get a portfolio's durations as integer arrays, whichever layout it is in
+def duration_parts(df):
+    """Years, months and days arrays from Years/Months/Days columns, else parsed from Duration text."""
+    if {"Years", "Months", "Days"}.issubset(df.columns):
+        return tuple(np.asarray(df[col], dtype=np.int64) for col in ("Years", "Months", "Days"))
+    return parse_duration(df["Duration"])
+
+# Function to round to paisa exactly like Python's round(x, 2)
+def round_paisa(amount):
+    """Vectorized equivalent of round(x, 2) for float64 arrays.
+
+    np.round scales by 100 before rounding, which can disagree with the
+    built-in round on values sitting right at a half-paisa boundary, so
+    those few rows are re-rounded with the built-in.
+    """
+    amount = np.asarray(amount, dtype=np.float64)
+    rounded = np.round(amount, 2)
+    scaled = amount * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(x, 2) for x in amount[near_tie].tolist()]
+    return rounded
+
+# Function to calculate maturity for whole columns of deposits at once
+def calc_maturity_batch(principal, rate, start_date, years, months, days, compounding):
+    """Vectorized calc_maturity over arrays/Series of deposits.
+
+    `compounding` holds the same labels as the app ("Yearly", "Monthly", ...).
+    Returns a DataFrame with MaturityAmount and MaturityDate columns whose
+    values match calc_maturity row for row.
+    """
+    principal = np.asarray(principal, dtype=np.float64)
+    rate = np.asarray(rate, dtype=np.float64) / 100
+    years = np.asarray(years, dtype=np.float64)
+    months = np.asarray(months, dtype=np.float64)
+    days = np.asarray(days, dtype=np.float64)
+
+    n = pd.Series(compounding, dtype="object").map(COMPOUNDING_FREQUENCY)
+    if n.isna().any():
+        bad = pd.Series(compounding, dtype="object")[n.isna()].unique().tolist()
+        raise KeyError(f"Unknown compounding option(s): {bad}")
+    n = n.to_numpy(dtype=np.float64)
+
+    duration_years = years + (months / 12) + (days / 365)
+    maturity_amount = principal * (1 + rate / n) ** (n * duration_years)
+
+    offset_days = np.trunc(duration_years * 365).astype("timedelta64[D]")
+    start = pd.to_datetime(pd.Series(start_date)).to_numpy(dtype="datetime64[ns]")
+    maturity_date = start + offset_days
+
+    return pd.DataFrame({
+        "MaturityAmount": round_paisa(maturity_amount),
+        "MaturityDate": maturity_date,
+    })
+
+# Function to (re)calculate maturity for every row of a stored portfolio
+def calc_portfolio_maturity(df):
+    """Run calc_maturity_batch over a portfolio DataFrame in the app's schema."""
+    years, months, days = duration_parts(df)
+    result = calc_maturity_batch(
+        df["Principal"], df["Rate"], df["StartDate"],
+        years, months, days, df["Compounding"]
+    )
+    result.index = df.index
+    return result
+
+# Function to add whole calendar months to datetime64[D] dates, clamping to month end
+def add_months(start, months):
+    """Vectorized start + months, clamping the day like dateutil's relativedelta."""
+    start = np.asarray(start, dtype="datetime64[D]")
+    month = start.astype("datetime64[M]")
+    day = (start - month.astype("datetime64[D]")).astype(np.int64)
+    target = month + np.asarray(months, dtype=np.int64).astype("timedelta64[M]")
+    month_days = ((target + 1).astype("datetime64[D]") - target.astype("datetime64[D]")).astype(np.int64)
+    return target.astype("datetime64[D]") + np.minimum(day, month_days - 1).astype("timedelta64[D]")
+
+# Function to calculate FD maturity the way banks do, on the real calendar
+def calc_maturity_exact(principal, rate, start_date, duration, compounding):
+    """Calendar-accurate calc_maturity using Decimal arithmetic.
+
+    The maturity date adds real years/months (clamped to month end) and then
+    days. Interest compounds over each whole compounding period in the tenor;
+    the broken period after the last one earns simple interest on actual
+    days / 365. The amount is rounded half-up to the paisa.
+    """
+    n = COMPOUNDING_FREQUENCY[compounding]
+    period_months = 12 // n
+    total_months = duration.get('years', 0) * 12 + duration.get('months', 0)
+    periods = total_months // period_months
+
+    maturity_date = start_date + relativedelta(months=total_months) + timedelta(days=duration.get('days', 0))
+    period_end = start_date + relativedelta(months=periods * period_months)
+    broken_days = (maturity_date - period_end).days
+
+    rate = Decimal(str(rate)) / 100
+    amount = Decimal(str(principal)) * (1 + rate / n) ** periods
+    amount *= 1 + rate * broken_days / 365
+
+    return {
+        'maturity_amount': float(amount.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)),
+        'maturity_date': maturity_date
+    }
+
+# Function to calculate calendar-accurate maturity for whole columns of deposits
+def calc_maturity_exact_batch(principal, rate, start_date, years, months, days, compounding):
+    """Vectorized calc_maturity_exact in float64.
+
+    Dates match calc_maturity_exact exactly; amounts agree to within a paisa
+    (float rather than Decimal arithmetic can land on the other side of a
+    half-paisa). Returns MaturityAmount and MaturityDate like
+    calc_maturity_batch.
+    """
+    principal = np.asarray(principal, dtype=np.float64)
+    rate = np.asarray(rate, dtype=np.float64) / 100
+    n = pd.Series(compounding, dtype="object").map(COMPOUNDING_FREQUENCY)
+    if n.isna().any():
+        bad = pd.Series(compounding, dtype="object")[n.isna()].unique().tolist()
+        raise KeyError(f"Unknown compounding option(s): {bad}")
+    n = n.to_numpy(dtype=np.int64)
+
+    total_months = np.asarray(years, dtype=np.int64) * 12 + np.asarray(months, dtype=np.int64)
+    periods = total_months // (12 // n)
+    start = pd.to_datetime(pd.Series(start_date)).to_numpy().astype("datetime64[D]")
+    maturity_date = add_months(start, total_months) + np.asarray(days, dtype=np.int64).astype("timedelta64[D]")
+    broken_days = (maturity_date - add_months(start, periods * (12 // n))).astype(np.int64)
+
+    amount = principal * (1 + rate / n) ** periods * (1 + rate * broken_days / 365)
+    return pd.DataFrame({
+        "MaturityAmount": np.floor(amount * 100 + 0.5) / 100,
+        "MaturityDate": maturity_date.astype("datetime64[ns]"),
+    })
+
+# Function to tell which stored deposits were priced in calendar-accurate mode
+def exact_mode_rows(df):
+    """Boolean mask of the rows of a portfolio booked with calc_maturity_exact.
+
+    The mode is not stored per deposit, so it is read back from the booked
+    MaturityDate/MaturityAmount: a row is exact-mode if they match
+    calc_maturity_exact_batch at its Rate but not calc_maturity_batch.
+    """
+    if len(df) == 0:
+        return np.zeros(0, dtype=bool)
+    years, months, days = duration_parts(df)
+    args = (df["Principal"], df["Rate"], df["StartDate"], years, months, days, df["Compounding"])
+    booked_amount = np.asarray(df["MaturityAmount"], dtype=np.float64)
+    booked_date = pd.to_datetime(pd.Series(df["MaturityDate"])).to_numpy(dtype="datetime64[ns]")
+
+    def matches(result):
+        # Within a paisa, as calc_maturity_exact_batch can round the other way to Decimal
+        return ((result["MaturityDate"].to_numpy() == booked_date)
+                & (np.abs(result["MaturityAmount"].to_numpy() - booked_amount) < 0.0101))
+
+    return matches(calc_maturity_exact_batch(*args)) & ~matches(calc_maturity_batch(*args))
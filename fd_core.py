@@ -0,0 +1,145 @@
+"""Load/save logic shared by the Streamlit app and the headless batch tools.
+
+Nothing here imports Streamlit: messages go through a `notify(level,
+message)` callback (levels "success", "info", "warning", "error"), which
+the app maps onto st.success/st.warning/... and scripts leave on logging.
+"""
+import logging
+import os
+
+from fd_saver import is_quota_error
+from fd_sheets import StaleSnapshotError, commit_worksheet, read_snapshot, read_version
+from fd_storage import read_local_store, write_local_store
+
+logger = logging.getLogger("fd_core")
+
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+CREDENTIALS_FILE = 'credentials.json'
+LOCAL_CONFIG = '.local_config'
+
+_LOG_LEVELS = {"success": logging.INFO, "info": logging.INFO,
+               "warning": logging.WARNING, "error": logging.ERROR}
+
+
+# Function to report messages through logging when there is no UI
+def log_notify(level, message):
+    logger.log(_LOG_LEVELS.get(level, logging.INFO), message)
+
+
+# Function to load Google service account credentials
+def load_google_credentials(secrets=None, notify=log_notify):
+    from google.oauth2.service_account import Credentials
+
+    # Check if credentials.json exists in the current directory
+    if os.path.exists(CREDENTIALS_FILE):
+        try:
+            # Local development - load from file
+            return Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=SCOPES)
+        except Exception as e:
+            notify("error", f"Error loading {CREDENTIALS_FILE}: {e}")
+
+    # Try using secrets (st.secrets in the app) as fallback
+    try:
+        return Credentials.from_service_account_info(secrets["gcp_service_account"], scopes=SCOPES)
+    except Exception:
+        return None
+
+
+# Function to get the spreadsheet ID from secrets or the local config file
+def get_sheet_id(secrets=None):
+    try:
+        return secrets["spreadsheet_id"]
+    except Exception:
+        # For local development without secrets
+        if os.path.exists(LOCAL_CONFIG):
+            with open(LOCAL_CONFIG, 'r') as f:
+                return f.read().strip()
+        # No sheet ID available - will use local storage
+        return ""
+
+
+# Function to load the portfolio from Google Sheets or local storage
+def load_portfolio(pool, sheet_id, notify=log_notify, on_page=None):
+    """Return `(data, snapshot)`; `snapshot` is None unless read from the sheet.
+
+    The sheet is streamed in pages; `on_page(first_page, rows_loaded)` is
+    called after each one (see read_sheet_frame).
+    """
+    try:
+        sheet = pool.worksheet(sheet_id, notify=notify)
+
+        # If there is no client, we're using local storage for testing
+        if sheet is None:
+            notify("warning", "No valid Google credentials found. Using local storage for testing.")
+            # Load the typed local store (migrates an old fd_data.csv)
+            return read_local_store(), None
+
+        # Read the version stamp before the rows, so a save in between shows up as stale
+        version = read_version(sheet.spreadsheet)
+        df, snapshot = read_snapshot(sheet, on_page)
+
+        # Remember what the sheet holds so the next save only sends changes
+        snapshot.version, snapshot.version_id = version
+        return df, snapshot
+
+    except Exception as e:
+        # Re-authenticate and re-resolve the worksheet on the next attempt
+        pool.invalidate()
+        notify("warning", f"Error loading data from Google Sheets: {e}. Using local storage instead.")
+        # Try to load from local storage as fallback
+        return read_local_store(), None
+
+
+# Function to save the portfolio to Google Sheets or local storage
+def save_portfolio(data, pool, sheet_id, snapshot=None, notify=log_notify, raise_quota_errors=False):
+    """Return `(saved, snapshot, data)`.
+
+    `snapshot` is what to diff the next save against and `data` the
+    portfolio as saved, which includes other users' rows when their
+    concurrent changes were merged in. With `raise_quota_errors` a quota or
+    rate-limit error is raised for the caller to retry instead of falling
+    back to local storage.
+    """
+    try:
+        sheet = pool.worksheet(sheet_id, notify=notify)
+
+        # If there is no client, we're using local storage for testing
+        if sheet is None:
+            notify("warning", "No valid Google credentials found. Using local storage for testing.")
+            # Save to the local columnar store
+            write_local_store(data)
+            notify("success", "Data saved to local file for testing")
+            return True, snapshot, data
+
+        # Send only the rows added, deleted or changed since the last load/save,
+        # merging in anything other users saved in the meantime
+        with pool.commit_lock:
+            result = commit_worksheet(sheet, snapshot, data, pool.committed.get(sheet_id))
+            pool.committed[sheet_id] = result.snapshot
+        if result.conflicts:
+            notify("warning", f"{len(result.conflicts)} FD(s) were also changed by another user; "
+                              f"kept their saved version: {', '.join(result.conflicts[:10])}")
+        elif result.data is not None:
+            notify("info", "Merged changes saved by other users")
+        return True, result.snapshot, data if result.data is None else result.data
+
+    except StaleSnapshotError as e:
+        # Saving locally would hide the clash; let the user reload instead
+        notify("error", str(e))
+        return False, snapshot, data
+
+    except Exception as e:
+        if raise_quota_errors and is_quota_error(e):
+            raise
+        # Re-authenticate and re-resolve the worksheet on the next attempt
+        pool.invalidate()
+        notify("warning", f"Error saving to Google Sheets: {e}. Saving to local file instead.")
+
+        # Save to local storage as fallback
+        try:
+            write_local_store(data)
+            notify("success", "Data saved to local file as fallback")
+            return True, snapshot, data
+        except Exception as local_e:
+            notify("error", f"Also failed to save to local file: {local_e}")
+            return False, snapshot, data
@@ -0,0 +1,92 @@
+import gzip
+import io
+import zipfile
+
+import pandas as pd
+
+from fd_storage import DATE_COLUMNS, to_sheet_layout, to_storage_frame
+
+# Download formats: label -> (file name, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("fixed_deposits.csv", "text/csv"),
+    "CSV (gzip)": ("fixed_deposits.csv.gz", "application/gzip"),
+    "CSV (zip)": ("fixed_deposits.zip", "application/zip"),
+    "Parquet": ("fixed_deposits.parquet", "application/vnd.apache.parquet"),
+}
+# Rows converted and serialized at a time when writing CSV
+EXPORT_CHUNK_ROWS = 50_000
+
+
+# Function to stream the portfolio as CSV, one chunk of rows at a time
+def iter_csv_chunks(data, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield the CSV export as encoded byte chunks.
+
+    Dates and Duration text are formatted per chunk, so no full string copy
+    of the portfolio is ever held in memory. Write the chunks to a file to
+    stream the export; build_export collects them into one payload.
+    """
+    if len(data) == 0:
+        yield to_sheet_layout(data).to_csv(index=False).encode("utf-8")
+        return
+    for start in range(0, len(data), chunk_rows):
+        chunk = to_sheet_layout(data.iloc[start:start + chunk_rows]).copy()
+        for col in DATE_COLUMNS:
+            if col in chunk.columns:
+                # Keep values that aren't dates as they are
+                dates = pd.to_datetime(chunk[col], errors="coerce")
+                keep = dates.isna() & chunk[col].notna()
+                chunk[col] = dates.dt.strftime('%Y-%m-%d').where(~keep, chunk[col].astype(str))
+        yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+# Function to build the download payload for one export format
+def build_export(data, export_format, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Return the whole export as bytes, for st.download_button.
+
+    Chunking only bounds the memory spent formatting rows: the encoded file
+    itself is held in full, as st.download_button takes bytes (or a file it
+    reads completely).
+    """
+    buffer = io.BytesIO()
+    if export_format == "CSV":
+        for chunk in iter_csv_chunks(data, chunk_rows):
+            buffer.write(chunk)
+    elif export_format == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as f:
+            for chunk in iter_csv_chunks(data, chunk_rows):
+                f.write(chunk)
+    elif export_format == "CSV (zip)":
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            with zf.open("fixed_deposits.csv", "w") as f:
+                for chunk in iter_csv_chunks(data, chunk_rows):
+                    f.write(chunk)
+    elif export_format == "Parquet":
+        to_sheet_layout(to_storage_frame(data)).to_parquet(buffer, index=False)
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+    return buffer.getvalue()
+
+
+class ExportCache:
+    """Per-session cache of built exports for the current portfolio frame.
+
+    Exports are only built when asked for, and reused until the session's
+    data is replaced (every add, delete or load produces a new frame).
+    """
+
+    def __init__(self):
+        self.source = None
+        self.exports = {}
+
+    def get(self, data, export_format):
+        if self.source is not data:
+            self.source = data
+            self.exports = {}
+        return self.exports.get(export_format)
+
+    def build(self, data, export_format):
+        export = self.get(data, export_format)
+        if export is None:
+            export = build_export(data, export_format)
+            self.exports[export_format] = export
+        return export
@@ -0,0 +1,221 @@
+"""Bulk import of deposits from a CSV or Excel file.
+
+Every check runs on whole columns at once: rows with a missing or malformed
+field, an unknown compounding option, a zero or over-long duration, or an
+FD_Number that is already in the portfolio (or earlier in the file) are set
+aside with the reason, and maturities for the rest are computed in one
+batch. The app merges the result into the portfolio with a single concat;
+the same path runs headless against Google Sheets (or the local store):
+
+    python fd_import.py new_branch.xlsx --rejects rejected.csv
+
+Input needs Bank, FD_Number, Principal, Rate, StartDate and Compounding
+columns, plus either a Duration column ("1 years 0 months 0 days") or
+Years/Months/Days columns. Headers are matched loosely ("FD Number",
+"Rate (%)", "start_date" all work). Any maturity columns are recomputed.
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from fd_calc import COMPOUNDING_FREQUENCY, calc_maturity_batch, calc_maturity_exact_batch, parse_duration
+from fd_rates import MAX_RATE, tenor_days
+from fd_solve import MAX_TENOR_DAYS
+from fd_storage import DURATION_COLUMNS, append_rows, to_portfolio_frame
+
+# File extensions read with pandas.read_excel (needs openpyxl)
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm")
+REQUIRED_COLUMNS = ["Bank", "FD_Number", "Principal", "Rate", "StartDate", "Compounding"]
+# Header spellings accepted for each column, compared lower-case without punctuation
+COLUMN_ALIASES = {
+    "bank": "Bank", "bankname": "Bank",
+    "fdnumber": "FD_Number", "fdaccountnumber": "FD_Number", "fdno": "FD_Number",
+    "principal": "Principal", "principalamount": "Principal",
+    "rate": "Rate", "interestrate": "Rate",
+    "startdate": "StartDate",
+    "duration": "Duration",
+    "years": "Years", "durationyears": "Years",
+    "months": "Months", "durationmonths": "Months",
+    "days": "Days", "durationdays": "Days",
+    "compounding": "Compounding",
+}
+
+
+# Function to read an uploaded or local deposits file, every cell as text
+def read_deposit_file(source, name=None):
+    """Read a CSV or Excel file (path or file-like, e.g. a Streamlit upload).
+
+    Cells are read as strings so FD numbers keep leading zeros; conversion
+    happens in validate_deposits.
+    """
+    name = name or getattr(source, "name", None) or str(source)
+    extension = os.path.splitext(name)[1].lower()
+    if extension in EXCEL_EXTENSIONS:
+        return pd.read_excel(source, dtype=str)
+    if extension in (".csv", ".txt", ""):
+        return pd.read_csv(source, dtype=str, skipinitialspace=True)
+    raise ValueError(f"Unsupported file type {extension!r}; use CSV or Excel .xlsx")
+
+
+# Function to map the file's headers onto the portfolio's column names
+def normalise_columns(raw):
+    renamed = {}
+    for col in raw.columns:
+        target = COLUMN_ALIASES.get(re.sub(r"[^a-z]", "", str(col).lower()))
+        if target is not None and target not in renamed.values():
+            renamed[col] = target
+    return raw[list(renamed)].rename(columns=renamed)
+
+
+def _text(values):
+    # Stripped strings with blanks as "", whatever the cells were read as
+    return pd.Series(values, dtype="object").fillna("").astype(str).str.strip()
+
+
+def _parse_dates(values):
+    # ISO dates in one vectorized pass; only the leftovers go through the slow mixed-format parser
+    dates = pd.to_datetime(values, format="ISO8601", errors="coerce")
+    retry = dates.isna() & (_text(values) != "")
+    if retry.any():
+        # Slashed dates are read day first (31/01/2024), as written in India
+        dates[retry] = pd.to_datetime(values[retry], format="mixed", dayfirst=True, errors="coerce")
+    return dates
+
+
+# Function to check every row of an import at once
+def validate_deposits(raw, existing=()):
+    """Return `(deposits, rejected)` for the rows of `raw`.
+
+    `deposits` holds the valid rows in the compact portfolio layout (without
+    maturities); `rejected` holds the other rows as read, with their file
+    Row number and the first Reason that applies. `existing` is the
+    portfolio's FD_Number column; those numbers are rejected as duplicates,
+    as are repeats within the file after their first valid row. Raises
+    ValueError when required columns are missing.
+    """
+    frame = normalise_columns(raw)
+    has_parts = set(DURATION_COLUMNS).issubset(frame.columns)
+    missing = [col for col in REQUIRED_COLUMNS if col not in frame.columns]
+    if not has_parts and "Duration" not in frame.columns:
+        missing.append("Duration (or Years/Months/Days)")
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    fd_number = _text(frame["FD_Number"])
+    bank = _text(frame["Bank"])
+    # Amounts may carry thousands separators and rates a % sign
+    principal = pd.to_numeric(_text(frame["Principal"]).str.replace(",", ""), errors="coerce")
+    principal = principal.to_numpy(dtype=np.float64)
+    rate = pd.to_numeric(_text(frame["Rate"]).str.rstrip("%"), errors="coerce").to_numpy(dtype=np.float64)
+    start = _parse_dates(frame["StartDate"])
+    if has_parts:
+        # Blank parts count as 0, as on the form
+        parts = [pd.to_numeric(_text(frame[col]).replace("", "0"), errors="coerce").to_numpy(dtype=np.float64)
+                 for col in DURATION_COLUMNS]
+    else:
+        # Unparseable text comes back as all zeros and is rejected below
+        parts = [values.astype(np.float64) for values in parse_duration(frame["Duration"].fillna(""))]
+    years, months, days = parts
+    labels = {label.lower(): label for label in COMPOUNDING_FREQUENCY}
+    compounding = _text(frame["Compounding"]).str.lower().map(labels)
+
+    # First reason each row fails on; "" while it is still valid
+    reason = np.full(len(frame), "", dtype=object)
+
+    def reject(bad, message):
+        bad = np.asarray(bad, dtype=bool) & (reason == "")
+        reason[bad] = message
+
+    reject(fd_number == "", "Missing FD_Number")
+    reject(bank == "", "Missing Bank")
+    reject(~(principal > 0), "Principal must be a positive number")
+    reject(~((rate >= 0) & (rate <= MAX_RATE)), f"Rate must be between 0 and {MAX_RATE:g}")
+    reject(start.isna(), "Unreadable StartDate")
+    whole = np.logical_and.reduce([np.isfinite(p) & (p >= 0) & (p == np.floor(p)) for p in parts])
+    reject(~whole, "Duration must be whole, non-negative years, months and days")
+    safe = [np.where(whole, p, 0) for p in parts]
+    reject((safe[0] + safe[1] + safe[2]) == 0, "Duration must be greater than 0")
+    reject(tenor_days(*safe) > MAX_TENOR_DAYS, f"Duration longer than {MAX_TENOR_DAYS // 365} years")
+    reject(compounding.isna(), f"Unknown Compounding (use {', '.join(COMPOUNDING_FREQUENCY)})")
+    reject(fd_number.isin(pd.Series(existing, dtype="object").astype(str)), "FD_Number already in portfolio")
+    reject(fd_number.where(reason == "").duplicated(), "Duplicate FD_Number in file")
+
+    valid = reason == ""
+    deposits = to_portfolio_frame(pd.DataFrame({
+        "Bank": bank[valid].to_numpy(dtype=object),
+        "FD_Number": fd_number[valid].to_numpy(dtype=object),
+        "Principal": principal[valid],
+        "Rate": rate[valid],
+        "StartDate": start[valid].dt.normalize().to_numpy(),
+        "Years": years[valid],
+        "Months": months[valid],
+        "Days": days[valid],
+        "Compounding": compounding[valid].to_numpy(dtype=object),
+    }))
+    rejected = raw.loc[~valid].copy()
+    # Line numbers as seen in the file (header is line 1)
+    rejected.insert(0, "Row", np.flatnonzero(~valid) + 2)
+    rejected["Reason"] = reason[~valid]
+    return deposits.reset_index(drop=True), rejected.reset_index(drop=True)
+
+
+# Function to add MaturityAmount and MaturityDate to validated deposits in one batch
+def price_deposits(deposits, exact=False):
+    """Return `deposits` with maturities from calc_maturity_batch (or the calendar-accurate batch)."""
+    calc = calc_maturity_exact_batch if exact else calc_maturity_batch
+    result = calc(
+        deposits["Principal"], deposits["Rate"], deposits["StartDate"],
+        deposits["Years"], deposits["Months"], deposits["Days"], deposits["Compounding"]
+    )
+    return deposits.assign(MaturityAmount=result["MaturityAmount"].to_numpy(),
+                           MaturityDate=result["MaturityDate"].to_numpy())
+
+
+# Function to validate and price an import in one call
+def prepare_import(raw, existing=(), exact=False):
+    """Return `(deposits, rejected)` with maturities computed for the valid rows."""
+    deposits, rejected = validate_deposits(raw, existing)
+    return price_deposits(deposits, exact), rejected
+
+
+def main(argv=None):
+    from fd_core import get_sheet_id, load_google_credentials, load_portfolio, save_portfolio
+    from fd_sheets import SheetsClientPool
+
+    parser = argparse.ArgumentParser(description="Import deposits from a CSV or Excel file into the portfolio.")
+    parser.add_argument("input", help="input .csv or .xlsx file of deposits")
+    parser.add_argument("--exact", action="store_true", help="calendar-accurate maturities (real month lengths)")
+    parser.add_argument("--rejects", help="write rejected rows and reasons to this CSV file")
+    parser.add_argument("--dry-run", action="store_true", help="validate and report without saving")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    t0 = time.perf_counter()
+    pool = SheetsClientPool(load_google_credentials)
+    sheet_id = get_sheet_id()
+    data, snapshot = load_portfolio(pool, sheet_id)
+    deposits, rejected = prepare_import(read_deposit_file(args.input), data["FD_Number"], args.exact)
+    logging.info(f"{len(deposits):,} deposit(s) valid, {len(rejected):,} rejected")
+    if args.rejects and len(rejected):
+        rejected.to_csv(args.rejects, index=False)
+        logging.info(f"Rejected rows -> {args.rejects}")
+    elif len(rejected):
+        for reason, count in rejected["Reason"].value_counts().items():
+            logging.info(f"  {count:,} x {reason}")
+    if args.dry_run or not len(deposits):
+        return 0
+    saved, _, _ = save_portfolio(append_rows(data, deposits), pool, sheet_id, snapshot)
+    if not saved:
+        return 1
+    logging.info(f"Imported {len(deposits):,} deposits in {time.perf_counter() - t0:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+import numpy as np
+import pandas as pd
+
+# Deleted rows an index keeps as tombstones before rebuilding its arrays without them,
+# as a share of its entries (and at least TOMBSTONE_MIN)
+TOMBSTONE_SHARE = 0.05
+TOMBSTONE_MIN = 256
+
+
+# Function to find the positions of row labels in a frame
+def label_positions(data, labels):
+    """Positions of `labels` in `data.index`; raises KeyError if any is missing."""
+    labels = np.asarray(list(labels))
+    index = data.index
+    if index.is_monotonic_increasing:
+        # Labels only grow (new rows get max + 1), so a binary search avoids
+        # hashing the whole index of every new frame
+        positions = np.minimum(index.searchsorted(labels), len(index) - 1)
+        if len(labels) and not (index[positions] == labels).all():
+            raise KeyError("Row labels not in the portfolio")
+    else:
+        positions = index.get_indexer(labels)
+        if (positions < 0).any():
+            raise KeyError("Row labels not in the portfolio")
+    return positions
+
+
+def _maturity_days(values):
+    # Whole days since the epoch; NaT becomes the int64 minimum and is skipped
+    return pd.to_datetime(pd.Series(values)).to_numpy().astype("datetime64[D]").view(np.int64)
+
+
+def _number_keys(numbers):
+    # Lower-cased FD numbers as Arrow strings, missing ones as ""
+    return pd.Series(numbers, dtype="string[pyarrow]").str.lower().fillna("")
+
+
+def _run(values, key):
+    # Slice bounds of the entries equal to `key` in a sorted array
+    return np.searchsorted(values, key, side="left"), np.searchsorted(values, key, side="right")
+
+
+class _Tombstones:
+    """Labels deleted from an index whose sorted arrays still hold them.
+
+    Marking a row dead is O(1); lookups drop dead labels from the slices
+    they return, and the owner compacts its arrays in one pass once
+    `full(size)` says there are too many.
+    """
+
+    def __init__(self, labels=()):
+        self.labels = set(labels)
+        self._array = None
+
+    def __len__(self):
+        return len(self.labels)
+
+    def copy(self):
+        return _Tombstones(self.labels)
+
+    def add(self, labels):
+        self.labels.update(labels)
+        self._array = None
+
+    def take(self, labels):
+        """Untombstone those of `labels` that are dead (a label being reused) and return them."""
+        taken = self.labels.intersection(labels)
+        if taken:
+            self.labels -= taken
+            self._array = None
+        return _Tombstones(taken)
+
+    def full(self, size):
+        return len(self.labels) > max(TOMBSTONE_MIN, TOMBSTONE_SHARE * size)
+
+    def dead(self, labels):
+        """Mask of the entries of `labels` that are tombstoned."""
+        if not self.labels:
+            return np.zeros(len(labels), dtype=bool)
+        if self._array is None:
+            self._array = np.array(list(self.labels))
+        return np.isin(labels, self._array)
+
+    def alive(self, labels):
+        """`labels` without the tombstoned ones."""
+        return labels[~self.dead(labels)] if self.labels and len(labels) else labels
+
+
+class PortfolioIndex:
+    """Keyed index over the portfolio by FD_Number, with Bank as a secondary key.
+
+    Keeps row labels in two sorted orders: by lower-cased FD number, and by
+    bank. Lookups by FD number or bank and prefix searches are binary
+    searches plus the matching slice, O(log N + k), so the manage tab never
+    scans rows with iloc. It is built with one vectorized sort. The index
+    follows the frame it was built from: after adding or deleting rows,
+    call `add`/`remove` with the new frame instead of rebuilding. Row labels
+    must be stable, so rows are dropped by label and new rows get fresh
+    labels rather than the frame being renumbered. Deletes only tombstone
+    the label (O(1)); the arrays are rebuilt without the dead rows once they
+    pass TOMBSTONE_SHARE of the index, so a delete costs O(1) amortized.
+    Inserts are still one O(N) np.insert per batch. They and rebuilds make
+    new arrays rather than writing into the old ones, so copies made with
+    `bind` (one per session) can share them.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        labels = data.index.to_numpy()
+        keys = _number_keys(data["FD_Number"])
+        # Arrow's sort is stable and orders UTF-8 like Python compares str
+        order = keys.argsort().to_numpy()
+        self._keys, self._key_labels = keys.to_numpy(dtype=object)[order], labels[order]
+        # Banks as small codes in first-seen order; only the distinct names are lower-cased
+        codes, banks = pd.factorize(data["Bank"], use_na_sentinel=False)
+        self._bank_names, self._bank_codes = [], {}
+        codes = np.array([self._bank_code(str(bank).lower()) for bank in banks], dtype=np.int64)[codes]
+        order = np.argsort(codes, kind="stable")
+        self._banks, self._bank_labels = codes[order], labels[order]
+        self._dead = _Tombstones()
+
+    def is_for(self, data):
+        """True if this index was built from (or kept in step with) `data`."""
+        return self.data is data
+
+    def bind(self, data):
+        """Copy of this index for `data`, a view of the same rows (e.g. a session copy)."""
+        copy = PortfolioIndex.__new__(PortfolioIndex)
+        copy.__dict__.update(self.__dict__)
+        copy.data = data
+        copy._bank_names, copy._bank_codes = list(self._bank_names), dict(self._bank_codes)
+        copy._dead = self._dead.copy()
+        return copy
+
+    def _bank_code(self, bank):
+        code = self._bank_codes.get(bank)
+        if code is None:
+            code = self._bank_codes[bank] = len(self._bank_names)
+            self._bank_names.append(bank)
+        return code
+
+    def _insert(self, data, labels):
+        labels = np.asarray(list(labels))
+        # append_rows reuses the label of a deleted last row; drop its stale entries first
+        revived = self._dead.take(labels.tolist())
+        if len(revived):
+            self._purge(revived)
+        rows = data.iloc[label_positions(data, labels)]
+        keys = _number_keys(rows["FD_Number"]).to_numpy(dtype=object)
+        banks = np.array([self._bank_code(bank) for bank in rows["Bank"].astype(str).str.lower()], dtype=np.int64)
+        # One insert per array for the whole batch, after existing rows with the same key
+        order = np.argsort(keys, kind="stable")
+        at = np.searchsorted(self._keys, keys[order], side="right")
+        self._keys = np.insert(self._keys, at, keys[order])
+        self._key_labels = np.insert(self._key_labels, at, labels[order])
+        order = np.argsort(banks, kind="stable")
+        at = np.searchsorted(self._banks, banks[order], side="right")
+        self._banks = np.insert(self._banks, at, banks[order])
+        self._bank_labels = np.insert(self._bank_labels, at, labels[order])
+
+    def _delete(self, labels):
+        self._dead.add(np.asarray(list(labels)).tolist())
+        if self._dead.full(len(self._key_labels)):
+            self._purge(self._dead)
+            self._dead = _Tombstones()
+
+    def _purge(self, dead):
+        # Rebuild the arrays without the given rows, one pass over each
+        keep = ~dead.dead(self._key_labels)
+        self._keys, self._key_labels = self._keys[keep], self._key_labels[keep]
+        keep = ~dead.dead(self._bank_labels)
+        self._banks, self._bank_labels = self._banks[keep], self._bank_labels[keep]
+
+    def add(self, data, labels):
+        """Index the rows with the given labels, newly added to `data`."""
+        self._insert(data, labels)
+        self.data = data
+
+    def remove(self, data, label):
+        """Forget the row with this label, just dropped to produce `data`."""
+        self._delete([label])
+        self.data = data
+
+    def update(self, data, dropped=(), added=()):
+        """Follow `data`, made from this frame by dropping the `dropped` labels and appending `added`."""
+        if len(dropped):
+            self._delete(dropped)
+        if len(added):
+            self._insert(data, added)
+        self.data = data
+
+    def lookup(self, fd_number):
+        """Row labels holding this FD number (usually exactly one)."""
+        fd_number = str(fd_number)
+        first, last = _run(self._keys, fd_number.lower())
+        labels = self._dead.alive(self._key_labels[first:last])
+        if not len(labels):
+            return []
+        # Keys are lower-cased; keep only the rows with this exact number
+        numbers = self.data["FD_Number"].iloc[label_positions(self.data, labels)].astype(str).to_numpy()
+        return labels[numbers == fd_number].tolist()
+
+    def lookup_bank(self, bank):
+        """Row labels for every deposit with this bank."""
+        code = self._bank_codes.get(str(bank).lower())
+        if code is None:
+            return []
+        first, last = _run(self._banks, code)
+        return self._dead.alive(self._bank_labels[first:last]).tolist()
+
+    def describe(self, label):
+        row = self.data.iloc[label_positions(self.data, [label])[0]]
+        return f"{row['FD_Number']} - {row['Bank']}"
+
+    def search(self, text, limit=50):
+        """Row labels whose FD number or bank starts with `text` (case-insensitive).
+
+        FD number matches come first, then bank matches; an empty query
+        returns the first `limit` rows in portfolio order. `limit=None`
+        returns every match.
+        """
+        if limit is None:
+            limit = len(self.data)
+        text = str(text or "").strip().lower()
+        if not text:
+            return self.data.index[:limit].tolist()
+
+        # Every key starting with `text` sorts between it and `text` + the highest code point;
+        # at most len(self._dead) of the slice can be tombstoned
+        first = np.searchsorted(self._keys, text, side="left")
+        last = np.searchsorted(self._keys, text + "\U0010ffff", side="left")
+        window = limit + len(self._dead)
+        results = dict.fromkeys(self._dead.alive(self._key_labels[first:min(last, first + window)])[:limit].tolist())
+
+        for code, bank in enumerate(self._bank_names):
+            if len(results) >= limit:
+                break
+            if bank.startswith(text):
+                first, last = _run(self._banks, code)
+                for label in self._dead.alive(self._bank_labels[first:min(last, first + window)]).tolist():
+                    results[label] = None
+                    if len(results) >= limit:
+                        break
+        return list(results)
+
+
+class MaturityIndex:
+    """Row labels of the portfolio sorted by MaturityDate.
+
+    Two parallel arrays (maturity day, row label) kept in date order, so
+    "what matures between these dates" is two binary searches plus the
+    matching slice: O(log N + k) instead of a scan of MaturityDate. Kept in
+    step with the frame like PortfolioIndex: call `add`/`remove`/`replace`
+    with the new frame. Deletes tombstone the label and inserts copy the
+    arrays, as in PortfolioIndex, so copies made with `bind` can share
+    them. Deposits without a maturity date are left out.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        days = _maturity_days(data["MaturityDate"]) if len(data) else np.empty(0, dtype=np.int64)
+        labels = data.index.to_numpy()
+        dated = days != np.iinfo(np.int64).min
+        order = np.argsort(days[dated], kind="stable")
+        self._days = days[dated][order]
+        self._labels = labels[dated][order]
+        self._dead = _Tombstones()
+
+    def __len__(self):
+        return len(self._labels) - int(np.count_nonzero(self._dead.dead(self._labels)))
+
+    def is_for(self, data):
+        """True if this index was built from (or kept in step with) `data`."""
+        return self.data is data
+
+    def bind(self, data):
+        """Copy of this index for `data`, a view of the same rows (e.g. a session copy)."""
+        copy = MaturityIndex.__new__(MaturityIndex)
+        copy.data = data
+        copy._days, copy._labels = self._days, self._labels
+        copy._dead = self._dead.copy()
+        return copy
+
+    def _insert(self, data, labels):
+        labels = np.asarray(list(labels))
+        # append_rows reuses the label of a deleted last row; drop its stale entry first
+        revived = self._dead.take(labels.tolist())
+        if len(revived):
+            self._purge(revived)
+        positions = label_positions(data, labels)
+        days = _maturity_days(data["MaturityDate"].iloc[positions])
+        dated = days != np.iinfo(np.int64).min
+        days, labels = days[dated], labels[dated]
+        order = np.argsort(days, kind="stable")
+        days, labels = days[order], labels[order]
+        # One insert for the whole batch; after existing rows maturing the same day
+        at = np.searchsorted(self._days, days, side="right")
+        self._days = np.insert(self._days, at, days)
+        self._labels = np.insert(self._labels, at, labels)
+
+    def _delete(self, labels):
+        # Rows without a maturity date are not in the arrays; tombstoning them anyway is harmless
+        self._dead.add(np.asarray(list(labels)).tolist())
+        if self._dead.full(len(self._labels)):
+            self._purge(self._dead)
+            self._dead = _Tombstones()
+
+    def _purge(self, dead):
+        # Rebuild the arrays without the given rows, in one pass
+        keep = ~dead.dead(self._labels)
+        self._days, self._labels = self._days[keep], self._labels[keep]
+
+    def add(self, data, labels):
+        """Index the rows with the given labels, newly added to `data`."""
+        self._insert(data, labels)
+        self.data = data
+
+    def remove(self, data, label):
+        """Forget the row with this label, just dropped to produce `data`."""
+        self._delete([label])
+        self.data = data
+
+    def replace(self, data, labels):
+        """Re-index the rows with the given labels, just changed in place to produce `data`."""
+        labels = list(labels)
+        if labels:
+            # The same labels come straight back, so drop their old entries rather than tombstoning them
+            self._purge(_Tombstones(labels))
+            self._insert(data, labels)
+        self.data = data
+
+    def update(self, data, dropped=(), added=()):
+        """Follow `data`, made from this frame by dropping the `dropped` labels and appending `added`."""
+        if len(dropped):
+            self._delete(dropped)
+        if len(added):
+            self._insert(data, added)
+        self.data = data
+
+    def between(self, start, end):
+        """Row labels maturing from `start` to `end` (both inclusive), earliest first."""
+        start, end = _maturity_days([start, end])
+        first = np.searchsorted(self._days, start, side="left")
+        last = np.searchsorted(self._days, end, side="right")
+        return self._dead.alive(self._labels[first:last])
+
+    def maturing_within(self, days, today=None):
+        """Row labels maturing in the next `days` days, counting from `today` (inclusive)."""
+        today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+        return self.between(today, today + pd.Timedelta(days=days))
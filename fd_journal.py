@@ -0,0 +1,194 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+from fd_calc import parse_duration
+from fd_storage import DURATION_COLUMNS, append_rows
+
+# Append-only log of adds and deletes not yet folded into the main store
+JOURNAL_FILE = 'fd_journal.jsonl'
+# Fold the journal into the main store once it holds this many entries
+COMPACT_EVERY = 50
+
+
+def _json_value(value):
+    if hasattr(value, "isoformat"):
+        # Dates are stored at day precision, like the sheet and CSV export
+        return value.isoformat()[:10]
+    if hasattr(value, "item"):
+        # NumPy scalars
+        return value.item()
+    return value
+
+
+def _record(row):
+    return {key: _json_value(value) for key, value in dict(row).items()}
+
+
+def _compact_record(record):
+    # Entries journaled before the compact layout carry Duration text
+    if "Duration" in record and "Years" not in record:
+        record = dict(record)
+        parts = parse_duration([record.pop("Duration")])
+        record.update({col: int(values[0]) for col, values in zip(DURATION_COLUMNS, parts)})
+    return record
+
+
+def _same_row(a, b, columns):
+    return all(str(a.get(col)) == str(b.get(col)) for col in columns)
+
+
+class FDJournal:
+    """Append-only journal of FD adds and deletes (one JSON object per line).
+
+    Each entry is flushed and fsync'ed before `append_*` returns, so adding
+    or deleting a deposit costs one small write however large the portfolio
+    is, and a crash between saves loses nothing: `replay_changes` re-applies
+    the entries on top of whatever the main store holds. Replay is
+    idempotent (an add whose row is already present is skipped, a delete of
+    a missing row is a no-op), so a crash mid-compaction is harmless too.
+    """
+
+    def __init__(self, path=JOURNAL_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self._drop_torn_tail()
+        self.last_seq = max((entry["seq"] for entry in self.entries()), default=0)
+
+    def _drop_torn_tail(self):
+        # A crash mid-append can leave a partial last line; cut it off so
+        # later appends start on a clean line
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            content = f.read()
+            if content and not content.endswith(b"\n"):
+                f.truncate(content.rfind(b"\n") + 1)
+
+    def entries(self):
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # Torn write from a crash; everything before it is intact
+                    break
+        return entries
+
+    def __len__(self):
+        return len(self.entries())
+
+    def _append(self, entry):
+        return self._append_many([entry])[0]
+
+    def _append_many(self, entries):
+        # One write and one fsync however many entries there are
+        with self.lock:
+            first = self.last_seq + 1
+            self.last_seq += len(entries)
+            lines = [json.dumps({"seq": first + i, **entry}) + "\n" for i, entry in enumerate(entries)]
+            with open(self.path, "a") as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+            return list(range(first, self.last_seq + 1))
+
+    def append_add(self, row):
+        """Journal a new deposit; `row` maps column names to values."""
+        return self._append({"op": "add", "row": _record(row)})
+
+    def append_adds(self, rows):
+        """Journal every row of the DataFrame `rows` as an add; returns their seqs."""
+        return self._append_many([{"op": "add", "row": _record(row)} for row in rows.to_dict("records")])
+
+    def append_delete(self, row):
+        """Journal the deletion of a deposit, identified by its full row."""
+        return self._append({"op": "delete", "row": _record(row)})
+
+    def replay_changes(self, data, entries=None):
+        """Return `(result, dropped, added, unmatched)`: `data` with the journal applied.
+
+        Only rows whose FD_Number appears in the journal are looked at, so
+        replaying a few entries costs one vectorized isin over the portfolio.
+        Deleted rows are dropped by label and added rows appended under fresh
+        labels (append_rows); `dropped` and `added` list those labels so
+        indexes built on `data` can follow. A delete only removes a row equal
+        to the journaled one in every column; delete entries with no such row
+        are skipped and returned in `unmatched`. With nothing to apply,
+        `result` is `data` itself.
+        """
+        entries = self.entries() if entries is None else entries
+        if not entries:
+            return data, [], [], []
+
+        records = [_compact_record(entry["row"]) for entry in entries]
+        keys = {str(record.get("FD_Number")) for record in records}
+        numbers = data["FD_Number"]
+        if not isinstance(numbers.dtype, pd.StringDtype):
+            numbers = numbers.astype(str)
+        touched = data[numbers.isin(keys).to_numpy()]
+
+        columns = list(data.columns)
+        rows = [_record(row) for row in touched.to_dict("records")]
+        labels = list(touched.index)
+        live = [True] * len(rows)
+        by_key = {}
+        for i, record in enumerate(rows):
+            by_key.setdefault(str(record.get("FD_Number")), []).append(i)
+
+        def find(record):
+            # The live row equal to `record` in every column, if any
+            for i in by_key.get(str(record.get("FD_Number")), []):
+                if live[i] and _same_row(rows[i], record, columns):
+                    return i
+            return None
+
+        unmatched = []
+        for entry, record in zip(entries, records):
+            i = find(record)
+            if entry["op"] == "add" and i is None:
+                by_key.setdefault(str(record.get("FD_Number")), []).append(len(rows))
+                rows.append(record)
+                live.append(True)
+            elif entry["op"] == "delete":
+                if i is None:
+                    unmatched.append(entry)
+                else:
+                    live[i] = False
+
+        dropped = [label for label, alive in zip(labels, live) if not alive]
+        new_rows = [rows[i] for i in range(len(labels), len(rows)) if live[i]]
+        if not dropped and not new_rows:
+            return data, [], [], unmatched
+        result = data.drop(index=dropped) if dropped else data
+        if not new_rows:
+            return result, dropped, [], unmatched
+        result = append_rows(result, pd.DataFrame(new_rows, columns=columns))
+        return result, dropped, list(result.index[len(result) - len(new_rows):]), unmatched
+
+    def discard(self, upto=0, seqs=()):
+        """Drop entries folded into the main store.
+
+        Removes every entry with seq <= `upto` (what a session saw when it
+        loaded) plus the entries in `seqs` (what it journaled itself), and
+        keeps entries other sessions wrote in the meantime.
+        """
+        seqs = set(seqs)
+        with self.lock:
+            remaining = [e for e in self.entries() if e["seq"] > upto and e["seq"] not in seqs]
+            if not remaining:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                for entry in remaining:
+                    f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from fd_calc import COMPOUNDING_FREQUENCY
+
+# Bucket sizes for the ladder: label -> code used below
+LADDER_FREQUENCIES = {"Daily": "D", "Weekly": "W", "Monthly": "M"}
+
+
+def _to_days(values):
+    return pd.to_datetime(pd.Series(values)).to_numpy().astype("datetime64[D]")
+
+
+def _bucket_starts(days, freq):
+    """Start date of the day/week/month bucket each date falls in."""
+    if freq == "D":
+        return days
+    if freq == "W":
+        # Weeks start on Monday; 1970-01-01 (day 0) was a Thursday
+        n = days.astype(np.int64)
+        return (n - (n + 3) % 7).astype("datetime64[D]")
+    if freq == "M":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"Unknown ladder frequency: {freq}")
+
+
+def _bucket_positions(bucket, first, freq):
+    if freq == "M":
+        return (bucket.astype("datetime64[M]") - first.astype("datetime64[M]")).astype(np.int64)
+    step = 7 if freq == "W" else 1
+    return (bucket - first).astype(np.int64) // step
+
+
+# Function to project maturity inflows bucketed by day, week or month
+def maturity_ladder(data, start=None, years=10, freq="M"):
+    """Expected inflows from deposits maturing in [start, start + years).
+
+    Returns one row per bucket (including empty ones) with the number of
+    deposits maturing, their principal, the amount paid out and the interest
+    portion, computed with a single bincount per column.
+    """
+    start = pd.Timestamp(start if start is not None else pd.Timestamp.today()).normalize()
+    end = start + pd.DateOffset(years=years)
+    first = _bucket_starts(np.array([start.to_datetime64()], dtype="datetime64[D]"), freq)[0]
+    last = _bucket_starts(np.array([(end - pd.Timedelta(days=1)).to_datetime64()], dtype="datetime64[D]"), freq)[0]
+    if freq == "M":
+        buckets = np.arange(first.astype("datetime64[M]"), last.astype("datetime64[M]") + 1).astype("datetime64[D]")
+    else:
+        step = 7 if freq == "W" else 1
+        buckets = np.arange(first, last + 1, step)
+
+    maturity = _to_days(data["MaturityDate"])
+    in_range = (maturity >= start.to_datetime64().astype("datetime64[D]")) & \
+               (maturity < end.to_datetime64().astype("datetime64[D]"))
+    positions = _bucket_positions(_bucket_starts(maturity[in_range], freq), first, freq)
+
+    principal = np.asarray(data["Principal"], dtype=np.float64)[in_range]
+    amount = np.asarray(data["MaturityAmount"], dtype=np.float64)[in_range]
+    size = len(buckets)
+    ladder = pd.DataFrame({
+        "Bucket": buckets.astype("datetime64[ns]"),
+        "Deposits": np.bincount(positions, minlength=size).astype(np.int64),
+        "Principal": np.bincount(positions, weights=principal, minlength=size),
+        "MaturityAmount": np.bincount(positions, weights=amount, minlength=size),
+    })
+    ladder["Interest"] = ladder["MaturityAmount"] - ladder["Principal"]
+    ladder["CumulativeInflow"] = ladder["MaturityAmount"].cumsum()
+    return ladder
+
+
+# Function to calculate interest accrued on every deposit as of a date
+def accrued_interest(data, as_of=None):
+    """Interest earned by each deposit up to `as_of`, as a float64 array.
+
+    Uses the calc_maturity formula with the elapsed time (days / 365) in
+    place of the full duration. Deposits not yet started accrue nothing and
+    matured ones are capped at their stored maturity amount.
+    """
+    as_of = pd.Timestamp(as_of if as_of is not None else pd.Timestamp.today()).normalize()
+    as_of_day = as_of.to_datetime64().astype("datetime64[D]")
+    start = _to_days(data["StartDate"])
+    maturity = _to_days(data["MaturityDate"])
+
+    principal = np.asarray(data["Principal"], dtype=np.float64)
+    rate = np.asarray(data["Rate"], dtype=np.float64) / 100
+    n = pd.Series(data["Compounding"], dtype="object").map(COMPOUNDING_FREQUENCY).to_numpy(dtype=np.float64)
+
+    elapsed = (np.minimum(as_of_day, maturity) - start).astype(np.int64)
+    elapsed_years = np.clip(elapsed, 0, None) / 365
+    accrued = principal * (1 + rate / n) ** (n * elapsed_years) - principal
+
+    matured = as_of_day >= maturity
+    stored = np.asarray(data["MaturityAmount"], dtype=np.float64) - principal
+    return np.where(matured & ~np.isnan(stored), stored, accrued)
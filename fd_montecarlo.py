@@ -0,0 +1,262 @@
+"""Monte Carlo reinvestment risk: portfolio value at a horizon under random rate paths.
+
+Every deposit runs its booked term, then renews for the same tenor and
+compounding at its prevailing rate (see fd_simulate.prevailing_rates) plus
+the market shift on that date, until the horizon. Shifts follow a
+mean-reverting (Ornstein-Uhlenbeck) path sampled monthly from a seeded
+RNG, so runs are reproducible. Each term grows with the calc_maturity
+formula; the term running at the horizon is valued on the days held so far.
+
+Renewal dates do not depend on rates, so they are laid out once as a flat
+list of events; a path's value is then a sum over events in log space,
+computed in chunks of deposits (optionally on a process pool) so memory
+stays bounded whatever the number of paths. Headless, against Google Sheets
+(or the local store):
+
+    python fd_montecarlo.py --paths 10000 --years 10 --sigma-bp 100 --workers 4
+"""
+import argparse
+import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from fd_calc import COMPOUNDING_FREQUENCY, duration_parts
+from fd_simulate import prevailing_rates
+
+DEFAULT_PATHS = 1_000
+DEFAULT_HORIZON_YEARS = 10
+# Rate-path model: shift of renewal rates from today's, in basis points
+DEFAULT_SIGMA_BP = 100      # annual volatility
+DEFAULT_KAPPA = 0.5         # speed of mean reversion, per year
+DEFAULT_LONG_RUN_BP = 0     # level the shift reverts to
+STEPS_PER_YEAR = 12
+# Percentiles reported of the terminal value
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+# Upper bound on the event x path working set per chunk (small chunks stay in cache)
+MONTE_CARLO_CHUNK_BYTES = 4 * 1024 * 1024
+# Batches of chunks handed to each pool worker, so results come back summed
+BATCHES_PER_WORKER = 4
+
+
+# Function to sample mean-reverting rate-shift paths
+def sample_rate_paths(paths, years, sigma_bp=DEFAULT_SIGMA_BP, kappa=DEFAULT_KAPPA,
+                      long_run_bp=DEFAULT_LONG_RUN_BP, seed=None):
+    """(steps + 1) x paths array of rate shifts in percentage points, 0 today.
+
+    Uses the exact Ornstein-Uhlenbeck transition over each monthly step
+    (a random walk when `kappa` is 0).
+    """
+    steps = int(np.ceil(years * STEPS_PER_YEAR))
+    dt = 1 / STEPS_PER_YEAR
+    decay = np.exp(-kappa * dt)
+    scale = sigma_bp / 100 * (np.sqrt((1 - decay ** 2) / (2 * kappa)) if kappa > 0 else np.sqrt(dt))
+    noise = np.random.default_rng(seed).standard_normal((steps, paths))
+    shifts = np.zeros((steps + 1, paths))
+    long_run = long_run_bp / 100
+    for step in range(steps):
+        shifts[step + 1] = long_run + (shifts[step] - long_run) * decay + scale * noise[step]
+    return shifts
+
+
+class ReinvestmentEvents:
+    """Every renewal before the horizon, one event per (deposit, renewal), grouped by deposit.
+
+    `fixed` is each deposit's log growth over its booked term (known rate);
+    each event carries the step of the rate path it renews on, its base
+    rate, compounding and the exponent weight n x years of the term (or of
+    the part of it before the horizon).
+    """
+
+    def __init__(self, data, as_of, horizon_days, rate_cards=None):
+        principal = np.nan_to_num(np.asarray(data["Principal"], dtype=np.float64))
+        booked = np.asarray(data["Rate"], dtype=np.float64) / 100
+        n = pd.Series(data["Compounding"], dtype="object").astype(str).map(COMPOUNDING_FREQUENCY)
+        n = n.to_numpy(dtype=np.float64)
+        years, months, days = duration_parts(data)
+        term_years = years + (months / 12) + (days / 365)
+        term_days = np.trunc(term_years * 365).astype(np.int64)
+        start = (pd.to_datetime(pd.Series(data["StartDate"])).to_numpy().astype("datetime64[D]")
+                 - np.datetime64(as_of, "D")).astype(np.int64)
+        # Deposits that cannot be priced are carried at principal
+        valid = ~np.isnan(booked) & ~np.isnan(n) & (term_days > 0) & (start < horizon_days)
+        n = np.where(valid, n, 1.0)
+
+        # Booked term: in full, or the days held by the horizon
+        maturity = start + term_days
+        booked_weight = np.where(maturity <= horizon_days, n * term_years, n * (horizon_days - start) / 365)
+        self.fixed = np.where(valid, booked_weight * np.log1p(np.nan_to_num(booked) / n), 0.0)
+        self.principal = principal
+
+        renewals = np.where(valid & (maturity < horizon_days),
+                            -(-(horizon_days - maturity) // np.maximum(term_days, 1)), 0)
+        self.deposit = np.repeat(np.arange(len(principal)), renewals)
+        offsets = np.cumsum(renewals) - renewals
+        k = np.arange(len(self.deposit)) - np.repeat(offsets, renewals)
+        renews_on = maturity[self.deposit] + k * term_days[self.deposit]
+        held = horizon_days - renews_on
+        full = held >= term_days[self.deposit]
+        self.n = n[self.deposit]
+        self.weight = np.where(full, self.n * term_years[self.deposit], self.n * held / 365)
+        self.base = np.nan_to_num(prevailing_rates(data, rate_cards))[self.deposit]
+        self.scale = 1 / (100 * self.n)
+        # Renewals due before today take today's rate
+        self.step = np.maximum(np.floor(renews_on / 365 * STEPS_PER_YEAR).astype(np.int64), 0)
+        self.first = offsets
+
+    def __len__(self):
+        return len(self.deposit)
+
+    def chunks(self, paths, chunk_bytes=MONTE_CARLO_CHUNK_BYTES):
+        """Deposit ranges whose events x `paths` working set stays under `chunk_bytes`."""
+        # One row per event and one per deposit, each `paths` floats wide
+        per_chunk = max(1, chunk_bytes // (8 * max(paths, 1)))
+        rows = np.arange(len(self.principal))
+        ends = self.first + np.diff(np.append(self.first, len(self))) + rows + 1
+        bounds = [0]
+        while bounds[-1] < len(self.principal):
+            start = bounds[-1]
+            # Furthest deposit whose rows still fit, at least one deposit per chunk
+            stop = np.searchsorted(ends, self.first[start] + start + per_chunk, side="right")
+            bounds.append(max(stop, start + 1))
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def terminal_value(self, shifts, start, stop):
+        """Total horizon value of deposits `start:stop` on every path (a paths-long array)."""
+        log_growth = np.repeat(self.fixed[start:stop, None], shifts.shape[1], axis=1)
+        first, last = self.first[start], self.first[stop] if stop < len(self.first) else len(self)
+        if last > first:
+            events = slice(first, last)
+            # One events x paths array, updated in place: rate (%) -> log growth of the term
+            growth = shifts[self.step[events]]
+            growth += self.base[events, None]
+            np.maximum(growth, 0, out=growth)
+            growth *= self.scale[events, None]
+            np.log1p(growth, out=growth)
+            growth *= self.weight[events, None]
+            # Events are grouped by deposit: each deposit's renewals sum to the
+            # difference of running totals at its last event and the previous deposit's
+            np.cumsum(growth, axis=0, out=growth)
+            owners = self.deposit[events] - start
+            last_event = np.flatnonzero(np.append(owners[1:] != owners[:-1], True))
+            totals = growth[last_event]
+            totals[1:] -= growth[last_event[:-1]]
+            log_growth[owners[last_event]] += totals
+        return self.principal[start:stop] @ np.exp(log_growth)
+
+
+# Per-process state for pool workers: the events and paths, sent once per worker
+_worker_state = {}
+
+
+def _init_worker(events, shifts):
+    _worker_state["events"], _worker_state["shifts"] = events, shifts
+
+
+def _batch_value(batch):
+    events, shifts = _worker_state["events"], _worker_state["shifts"]
+    return sum(events.terminal_value(shifts, *bounds) for bounds in batch)
+
+
+class MonteCarloResult:
+    """Horizon value of the portfolio on every simulated path."""
+
+    def __init__(self, values, principal, baseline, horizon):
+        self.values = values
+        self.principal = principal
+        self.baseline = baseline
+        self.horizon = horizon
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """One row per percentile: Percentile, TerminalValue, Interest and Change vs the flat-rate baseline."""
+        values = np.percentile(self.values, percentiles)
+        return pd.DataFrame({
+            "Percentile": list(percentiles),
+            "TerminalValue": values,
+            "Interest": values - self.principal,
+            "Change": values - self.baseline,
+        })
+
+    def summary(self):
+        return {
+            "Paths": len(self.values),
+            "Horizon": self.horizon,
+            "Mean": float(self.values.mean()),
+            "Median": float(np.median(self.values)),
+            "StdDev": float(self.values.std()),
+            "Baseline": self.baseline,
+            # Share of paths that end below renewing at today's rates throughout
+            "ShortfallProbability": float((self.values < self.baseline).mean()),
+        }
+
+
+# Function to simulate the portfolio's horizon value under random renewal rates
+def run_monte_carlo(data, paths=DEFAULT_PATHS, years=DEFAULT_HORIZON_YEARS, sigma_bp=DEFAULT_SIGMA_BP,
+                    kappa=DEFAULT_KAPPA, long_run_bp=DEFAULT_LONG_RUN_BP, seed=None, rate_cards=None,
+                    as_of=None, workers=None, chunk_bytes=MONTE_CARLO_CHUNK_BYTES):
+    """Return a MonteCarloResult for `paths` rate paths over `years` from `as_of` (default today).
+
+    `workers` > 1 spreads deposit chunks over a process pool; the paths are
+    sampled up front, so results do not depend on the number of workers.
+    """
+    as_of = pd.Timestamp.today().normalize() if as_of is None else pd.Timestamp(as_of).normalize()
+    horizon_days = int(years * 365)
+    events = ReinvestmentEvents(data, as_of, horizon_days, rate_cards)
+    shifts = sample_rate_paths(paths, years, sigma_bp, kappa, long_run_bp, seed)
+    chunks = events.chunks(paths, chunk_bytes)
+
+    if workers and workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(events, shifts)) as pool:
+            batches = np.array_split(np.arange(len(chunks)), min(len(chunks), workers * BATCHES_PER_WORKER))
+            values = sum(pool.map(_batch_value, [[chunks[i] for i in batch] for batch in batches]))
+    else:
+        values = sum(events.terminal_value(shifts, *bounds) for bounds in chunks)
+    values = np.broadcast_to(np.asarray(values, dtype=np.float64), (paths,)).copy()
+
+    # The same portfolio with every renewal at today's rates
+    flat = np.zeros((shifts.shape[0], 1))
+    baseline = float(sum(events.terminal_value(flat, *bounds) for bounds in events.chunks(1, chunk_bytes)))
+    return MonteCarloResult(values, float(events.principal.sum()), baseline,
+                            as_of + pd.Timedelta(days=horizon_days))
+
+
+def main(argv=None):
+    from fd_core import get_sheet_id, load_google_credentials, load_portfolio
+    from fd_rates import RateCardStore
+    from fd_sheets import SheetsClientPool
+
+    parser = argparse.ArgumentParser(description="Simulate the portfolio's value at a horizon under random rate paths.")
+    parser.add_argument("--paths", type=int, default=DEFAULT_PATHS, help=f"rate paths (default {DEFAULT_PATHS})")
+    parser.add_argument("--years", type=float, default=DEFAULT_HORIZON_YEARS,
+                        help=f"horizon in years (default {DEFAULT_HORIZON_YEARS})")
+    parser.add_argument("--sigma-bp", type=float, default=DEFAULT_SIGMA_BP, help="annual rate volatility in bp")
+    parser.add_argument("--kappa", type=float, default=DEFAULT_KAPPA, help="mean-reversion speed per year")
+    parser.add_argument("--long-run-bp", type=float, default=DEFAULT_LONG_RUN_BP,
+                        help="long-run rate shift in bp the paths revert to")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed, for reproducible runs")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: run in-process)")
+    parser.add_argument("--output", help="write the percentile table to this CSV file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    pool = SheetsClientPool(load_google_credentials)
+    data, _ = load_portfolio(pool, get_sheet_id())
+    result = run_monte_carlo(data, args.paths, args.years, args.sigma_bp, args.kappa, args.long_run_bp,
+                             args.seed, RateCardStore(), workers=args.workers)
+    table = result.percentiles()
+    summary = result.summary()
+    logging.info(f"{summary['Paths']:,} paths to {summary['Horizon']:%Y-%m-%d}: "
+                 f"mean ₹{summary['Mean']:,.2f}, flat-rate ₹{summary['Baseline']:,.2f}, "
+                 f"P(shortfall) {summary['ShortfallProbability']:.1%}")
+    for row in table.itertuples(index=False):
+        logging.info(f"  P{row.Percentile:<3} ₹{row.TerminalValue:,.2f}")
+    if args.output:
+        table.to_csv(args.output, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
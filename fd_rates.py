@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from fd_calc import calc_maturity, calc_maturity_batch, calc_maturity_exact_batch, duration_parts, exact_mode_rows
+
+# Banks offered in the Bank Name selectbox
+BANKS = ["SBI", "HDFC", "ICICI", "Axis", "Kotak",
+         "Punjab National Bank", "Bank of Baroda", "Canara Bank",
+         "IDBI Bank", "Indian Bank", "Central Bank of India",
+         "Union Bank", "Others"]
+
+# Tenor buckets used on rate cards: label -> longest tenor in days it covers
+TENOR_BUCKETS = {
+    "Up to 45 days": 45,
+    "46 days - 6 months": 182,
+    "6 months - 1 year": 364,
+    "1 - 2 years": 729,
+    "2 - 3 years": 1094,
+    "3 - 5 years": 1824,
+    "5 - 10 years": 3650,
+}
+
+# Highest rate (%) accepted on a card, the Add FD form and imports
+MAX_RATE = 20.0
+
+# Locally stored rate cards, one versioned card per bank
+RATE_CARD_FILE = 'fd_rate_cards.json'
+# Distinct (principal, rate, tenor, compounding) quotes kept in memory
+QUOTE_CACHE_SIZE = 4096
+
+
+# Function to get tenors in days, as calc_maturity counts them (scalars or arrays)
+def tenor_days(years, months, days):
+    return np.trunc((np.asarray(years) + (np.asarray(months) / 12) + (np.asarray(days) / 365)) * 365).astype(np.int64)
+
+
+# Function to find the rate-card bucket for a tenor
+def tenor_bucket(days):
+    for label, max_days in TENOR_BUCKETS.items():
+        if days <= max_days:
+            return label
+    return None
+
+
+# Function to bucket whole arrays of tenors at once
+def tenor_buckets(days):
+    edges = np.array(list(TENOR_BUCKETS.values()))
+    labels = np.array(list(TENOR_BUCKETS) + [None], dtype=object)
+    return labels[np.searchsorted(edges, np.asarray(days), side="left")]
+
+
+# Function to quote maturity, memoized on everything but the start date
+@lru_cache(maxsize=QUOTE_CACHE_SIZE)
+def _quote(principal, rate, years, months, days, compounding):
+    result = calc_maturity(principal, rate, datetime(2000, 1, 1),
+                           {"years": years, "months": months, "days": days}, compounding)
+    return result['maturity_amount'], (result['maturity_date'] - datetime(2000, 1, 1)).days
+
+
+def quote_maturity(principal, rate, start_date, duration, compounding):
+    """calc_maturity with an LRU cache of the amount and day offset.
+
+    Repeated quotes for the same (principal, rate, tenor, compounding) are
+    answered from memory whatever the start date.
+    """
+    amount, offset = _quote(float(principal), float(rate), int(duration.get('years', 0)),
+                            int(duration.get('months', 0)), int(duration.get('days', 0)), compounding)
+    return {
+        'maturity_amount': amount,
+        'maturity_date': start_date + timedelta(days=offset)
+    }
+
+
+class RateCardStore:
+    """Versioned per-bank rate cards kept in a local JSON file.
+
+    A card maps tenor bucket -> compounding -> rate (%). Saving a card bumps
+    that bank's version and reports which (tenor, compounding) cells changed,
+    so only the deposits priced off those cells need repricing.
+    """
+
+    def __init__(self, path=RATE_CARD_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.cards = {}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self.cards = json.load(f)
+
+    def card(self, bank):
+        return self.cards.get(bank, {"version": 0, "updated": None, "rates": {}})
+
+    def versions(self):
+        """(bank, version) of every card, for keying results priced off the cards."""
+        return tuple(sorted((bank, card["version"]) for bank, card in self.cards.items()))
+
+    def get_rate(self, bank, days, compounding):
+        """Card rate for a deposit, or None when the card has no entry for it."""
+        bucket = tenor_bucket(days)
+        return self.card(bank)["rates"].get(bucket, {}).get(compounding)
+
+    def set_card(self, bank, rates):
+        """Replace `bank`'s card and return the set of changed (tenor, compounding) cells.
+
+        Raises ValueError, leaving the card unchanged, if a rate is outside 0 to MAX_RATE.
+        """
+        bad = [f"{t} / {c}" for t, row in rates.items() for c, rate in row.items() if not 0 <= rate <= MAX_RATE]
+        if bad:
+            raise ValueError(f"Rates must be between 0 and {MAX_RATE:g}%: {', '.join(bad)}")
+        with self.lock:
+            old = self.card(bank)["rates"]
+            cells = {(t, c) for t in set(old) | set(rates)
+                     for c in set(old.get(t, {})) | set(rates.get(t, {}))}
+            changed = {(t, c) for t, c in cells
+                       if old.get(t, {}).get(c) != rates.get(t, {}).get(c)}
+            if not changed:
+                return changed
+            self.cards[bank] = {
+                "version": self.card(bank)["version"] + 1,
+                "updated": datetime.now().isoformat(timespec="seconds"),
+                "rates": rates,
+            }
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.cards, f, indent=2)
+            os.replace(tmp_path, self.path)
+            return changed
+
+
+# Function to reprice the deposits affected by a rate-card change
+def reprice_deposits(data, store, bank, changed, labels=None):
+    """Return `(data, repriced_labels)` with new Rate/Maturity values for affected rows.
+
+    Only deposits with this bank (optionally the given `labels`, e.g. from
+    PortfolioIndex.lookup_bank) whose tenor bucket and compounding are in
+    `changed` are recomputed, in one calc_maturity_batch call. Deposits
+    booked in calendar-accurate mode (see exact_mode_rows) are recomputed
+    with calc_maturity_exact_batch instead.
+    """
+    if not changed or len(data) == 0:
+        return data, []
+    if labels is None:
+        labels = data.index[data["Bank"].astype(str) == bank]
+    rows = data.loc[labels]
+    years, months, days = duration_parts(rows)
+    buckets = tenor_buckets(tenor_days(years, months, days))
+    compounding = rows["Compounding"].astype(str).to_numpy()
+    affected = np.array([(b, c) in changed for b, c in zip(buckets, compounding)], dtype=bool)
+    if not affected.any():
+        return data, []
+
+    card = store.card(bank)["rates"]
+    new_rates = np.array([card.get(b, {}).get(c, np.nan) for b, c in zip(buckets[affected], compounding[affected])],
+                         dtype=np.float64)
+    priced = ~np.isnan(new_rates)
+    if not priced.any():
+        return data, []
+    target = rows.index[affected][priced]
+    args = (
+        rows.loc[target, "Principal"].to_numpy(), new_rates[priced], rows.loc[target, "StartDate"].to_numpy(),
+        years[affected][priced], months[affected][priced], days[affected][priced],
+        compounding[affected][priced]
+    )
+    result = calc_maturity_batch(*args)
+    exact = exact_mode_rows(rows.loc[target])
+    if exact.any():
+        exact_result = calc_maturity_exact_batch(*(arg[exact] for arg in args))
+        for column in result:
+            result.loc[exact, column] = exact_result[column].to_numpy()
+
+    data = data.copy()
+    data.loc[target, "Rate"] = new_rates[priced]
+    data.loc[target, "MaturityAmount"] = result["MaturityAmount"].to_numpy()
+    data.loc[target, "MaturityDate"] = pd.to_datetime(result["MaturityDate"]).to_numpy()
+    return data, list(target)
@@ -0,0 +1,124 @@
+"""Background persistence for the app.
+
+Saves run on one worker thread per process so the Streamlit script never
+blocks on the Sheets API. Jobs are keyed by session: a save submitted while
+that session's previous one is still queued replaces it (only the newest
+data matters). Errors the save reports as retryable (quota/rate limits) are
+retried with jittered exponential backoff. Nothing here imports Streamlit;
+the app polls SaveJob.state and applies the result on its own thread.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+
+# Job states, in the order a job normally moves through them
+QUEUED, SAVING, RETRYING, SAVED, FAILED = "queued", "saving", "retrying", "saved", "failed"
+
+
+# Function to tell quota/rate-limit errors (worth retrying) from real failures
+def is_quota_error(error):
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) in (429, 503):
+        return True
+    text = str(error)
+    return "RESOURCE_EXHAUSTED" in text or "Quota exceeded" in text or "[429]" in text
+
+
+class SaveJob:
+    """One session's pending save and what became of it.
+
+    `save(notify, final)` does the work; `final` is True on the last attempt,
+    when the save should fall back rather than raise. `context` is opaque
+    data the app needs when applying the result (e.g. the frame submitted).
+    """
+
+    def __init__(self, key, save, context=None):
+        self.key = key
+        self.save = save
+        self.context = context
+        self.state = QUEUED
+        self.attempts = 0
+        self.coalesced = 0
+        self.retry_at = None
+        self.messages = []
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+
+    def notify(self, level, message):
+        self.messages.append((level, message))
+
+    def done(self):
+        return self.state in (SAVED, FAILED)
+
+    def describe(self):
+        """Short status line for the UI."""
+        if self.state == QUEUED:
+            return "Save queued" + (f" ({self.coalesced + 1} saves combined)" if self.coalesced else "")
+        if self.state == SAVING:
+            return "Saving..." if self.attempts <= 1 else f"Saving (attempt {self.attempts})..."
+        if self.state == RETRYING:
+            wait = max(0, self.retry_at - time.time()) if self.retry_at else 0
+            return f"Rate limited; retrying in {wait:.0f}s (attempt {self.attempts})"
+        elapsed = (self.finished_at or time.time()) - self.submitted_at
+        return f"Saved in {elapsed:.1f}s" if self.state == SAVED else f"Save failed: {self.error}"
+
+
+class BackgroundSaver:
+    """Single worker thread draining a queue of SaveJobs, one per key at a time."""
+
+    def __init__(self, max_retries=5, backoff=1.0, max_backoff=60.0, is_retryable=is_quota_error):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.is_retryable = is_retryable
+        self.condition = threading.Condition()
+        self.pending = OrderedDict()
+        self._thread = None
+
+    def submit(self, key, save, context=None):
+        """Queue `save` for `key`, replacing that key's save if it has not started yet."""
+        with self.condition:
+            job = self.pending.get(key)
+            if job is not None:
+                job.save, job.context = save, context
+                job.coalesced += 1
+                return job
+            job = self.pending[key] = SaveJob(key, save, context)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="fd-saver", daemon=True)
+                self._thread.start()
+            self.condition.notify()
+            return job
+
+    def _next_job(self):
+        with self.condition:
+            while not self.pending:
+                self.condition.wait()
+            _, job = self.pending.popitem(last=False)
+            return job
+
+    def _run(self):
+        while True:
+            self._process(self._next_job())
+
+    def _process(self, job):
+        for attempt in range(self.max_retries + 1):
+            job.attempts = attempt + 1
+            job.state = SAVING
+            try:
+                job.result = job.save(job.notify, attempt == self.max_retries)
+                job.state = SAVED
+                break
+            except Exception as e:
+                if attempt == self.max_retries or not self.is_retryable(e):
+                    job.error = str(e)
+                    job.state = FAILED
+                    break
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                job.retry_at = time.time() + delay
+                job.state = RETRYING
+                time.sleep(delay)
+        job.finished_at = time.time()
@@ -0,0 +1,821 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from fd_storage import create_empty_dataframe, to_portfolio_frame, to_sheet_layout
+
+# Columns stored in Sheet1, in the order the app writes them
+SHEET_COLUMNS = ["Bank", "FD_Number", "Principal", "Rate", "StartDate",
+                 "Duration", "Compounding", "MaturityAmount", "MaturityDate"]
+NUMERIC_COLUMNS = ["Rate", "MaturityAmount", "Principal"]
+DATE_COLUMNS = ["StartDate", "MaturityDate"]
+
+# Number format applied to numeric cells to prevent date interpretation
+NUMBER_FORMAT = {"numberFormat": {"type": "NUMBER", "pattern": "0.00"}}
+
+# Rows fetched per range request when streaming Sheet1 in
+PAGE_ROWS = 50_000
+
+# Hidden marker sheets named fd_version_<n> stamp the version of Sheet1
+VERSION_PREFIX = "fd_version_"
+# Merge-and-retry rounds before a save gives up on a busy sheet
+MAX_COMMIT_ATTEMPTS = 12
+# Base and cap of the jittered exponential backoff between those rounds (seconds)
+COMMIT_BACKOFF = 0.05
+MAX_COMMIT_BACKOFF = 1.0
+
+
+class StaleSnapshotError(Exception):
+    """Sheet1 changed under us and the changes could not be merged."""
+
+
+# Function to turn get_all_records() output into the portfolio DataFrame
+def frame_from_records(records):
+    df = pd.DataFrame(records) if records else create_empty_dataframe()
+
+    # Ensure all expected columns exist
+    for col in SHEET_COLUMNS:
+        if col not in df.columns:
+            if col in ["Principal", "Rate", "MaturityAmount"]:
+                df[col] = 0.0
+            elif col in ["StartDate", "MaturityDate"]:
+                df[col] = pd.Timestamp.now().strftime("%Y-%m-%d")
+            else:
+                df[col] = ""
+
+    # Convert date strings to datetime objects
+    try:
+        df["StartDate"] = pd.to_datetime(df["StartDate"])
+        df["MaturityDate"] = pd.to_datetime(df["MaturityDate"])
+    except:
+        # If conversion fails, keep as strings
+        pass
+    return to_portfolio_frame(df)
+
+
+# Function to build a typed DataFrame straight from rows of sheet strings
+def frame_from_values(headers, rows):
+    """Typed equivalent of frame_from_records for raw cell strings.
+
+    Numeric columns become float64 and dates datetime64, one column array
+    at a time; to_portfolio_frame then gives the rest their compact dtypes.
+    """
+    width = len(headers)
+    # The API drops trailing empty cells, so pad short rows before stacking
+    rows = [row if len(row) == width else (list(row) + [""] * width)[:width] for row in rows]
+    cells = np.array(rows, dtype=object).reshape(len(rows), width)
+    df = pd.DataFrame({header: _typed_column(header, cells[:, j]) for j, header in enumerate(headers)})
+    for col in SHEET_COLUMNS:
+        if col not in df.columns:
+            df[col] = _typed_column(col, np.full(len(df), "", dtype=object))
+    return to_portfolio_frame(df)
+
+
+def _typed_column(header, values):
+    if header in NUMERIC_COLUMNS:
+        return pd.to_numeric(values, errors="coerce").astype(np.float64)
+    if header in DATE_COLUMNS:
+        try:
+            return pd.to_datetime(values, format="ISO8601")
+        except (ValueError, TypeError):
+            return pd.to_datetime(values, format="mixed", errors="coerce")
+    return values
+
+
+# Function to turn a column index into its A1 letters (0 -> A, 26 -> AA)
+def column_letter(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+# Function to stream Sheet1 as typed DataFrame pages, one range request each
+def iter_sheet_pages(sheet, page_rows=PAGE_ROWS):
+    """Yield typed pages of at most `page_rows` rows, top to bottom.
+
+    Each page is one `worksheet.get("A<r>:<col><r + page_rows - 1>")` call,
+    so only one page of raw strings is held at a time.
+    """
+    first = sheet.get(f"A1:{column_letter(max(sheet.col_count, 1) - 1)}{page_rows + 1}")
+    if not first:
+        return
+    headers = list(first[0])
+    last_col = column_letter(len(headers) - 1)
+    rows = first[1:]
+    start = page_rows + 2
+    while rows:
+        yield frame_from_values(headers, rows)
+        if len(rows) < page_rows:
+            return
+        rows = sheet.get(f"A{start}:{last_col}{start + page_rows - 1}")
+        start += page_rows
+
+
+# Function to stream Sheet1 into one typed DataFrame
+def read_sheet_frame(sheet, page_rows=PAGE_ROWS, on_page=None):
+    """Read Sheet1 page by page into preallocated typed column arrays.
+
+    `on_page(first_page, rows_loaded)` is called after every page so the UI
+    can show the first rows while the rest is still loading. Peak memory is
+    the finished columns plus one page, instead of every row as a dict.
+    """
+    columns = None
+    loaded = 0
+    first_page = None
+    for page in iter_sheet_pages(sheet, page_rows):
+        if columns is None:
+            first_page = page
+            capacity = max(getattr(sheet, "row_count", 0) - 1, len(page))
+            columns = {col: np.empty(capacity, dtype=page[col].dtype) for col in page.columns
+                       if isinstance(page[col].dtype, np.dtype)}
+            # Categorical and Arrow string columns are kept per page and joined at the end
+            parts = {col: [] for col in page.columns if col not in columns}
+        end = loaded + len(page)
+        if end > len(next(iter(columns.values()))):
+            # The cached grid size was stale; grow geometrically
+            grow = max(end, 2 * loaded)
+            columns = {col: np.concatenate([arr[:loaded], np.empty(grow - loaded, dtype=arr.dtype)])
+                       for col, arr in columns.items()}
+        for col, arr in columns.items():
+            arr[loaded:end] = page[col].to_numpy()
+        for col, part in parts.items():
+            part.append(page[col])
+        loaded = end
+        if on_page is not None:
+            on_page(first_page, loaded)
+    if columns is None:
+        return frame_from_records([])
+    frame = {col: arr[:loaded] for col, arr in columns.items()}
+    for col, part in parts.items():
+        if isinstance(part[0].dtype, pd.CategoricalDtype):
+            frame[col] = union_categoricals(part)
+        else:
+            frame[col] = pd.concat(part, ignore_index=True)
+    return pd.DataFrame({col: frame[col] for col in first_page.columns})
+
+
+# Function to convert the portfolio into the all-string form written to the sheet
+def format_for_sheet(data):
+    # Create a copy of the dataframe to avoid modifying the original
+    data_copy = to_sheet_layout(data).copy()
+
+    # Convert numeric columns to strings with quotes to prevent date interpretation
+    for col in NUMERIC_COLUMNS:
+        if col in data_copy.columns:
+            data_copy[col] = data_copy[col].astype(str)
+
+    # Convert datetime columns to strings safely
+    for col in DATE_COLUMNS:
+        if col in data_copy.columns:
+            # Check if the column contains datetime objects
+            if pd.api.types.is_datetime64_any_dtype(data_copy[col]):
+                data_copy[col] = data_copy[col].dt.strftime("%Y-%m-%d")
+            elif len(data_copy) > 0 and isinstance(data_copy[col].iloc[0], (datetime, pd.Timestamp)):
+                data_copy[col] = data_copy[col].apply(lambda x: x.strftime("%Y-%m-%d") if isinstance(x, (datetime, pd.Timestamp)) else str(x))
+            else:
+                # If it's already a string or another type, convert to string
+                data_copy[col] = data_copy[col].astype(str)
+
+    return data_copy
+
+
+class SheetSnapshot:
+    """What Sheet1 held after the last load or save, keyed by FD_Number.
+
+    `keys` is in sheet order (data row i lives on sheet row i + 2) and
+    `rows` maps each key to the tuple of cell strings written for it.
+    `version` / `version_id` are the number and sheetId of the fd_version_<n>
+    marker the sheet carried at the time (None when unknown).
+
+    A snapshot made with from_frame keeps the typed frame (row i is keys[i])
+    and only formats cell strings when `rows` is read, which a plain save
+    never does: updated() compares typed columns and formats just the rows
+    that changed. Loading or saving a large sheet therefore never holds an
+    all-string copy of it.
+    """
+
+    def __init__(self, headers, keys, rows, version=None, version_id=None):
+        self._headers = None if headers is None else list(headers)
+        self._keys = None if keys is None else list(keys)
+        self._keyed = None
+        self._rows = rows
+        self.frame = None
+        self._lock = threading.Lock()
+        self.version = version
+        self.version_id = version_id
+
+    @classmethod
+    def from_frame(cls, data, keys=None):
+        snapshot = cls(None, keys, None)
+        # A copy-on-write view, so later edits of `data` don't leak in
+        snapshot.frame = data.copy(deep=not pd.get_option("mode.copy_on_write"))
+        return snapshot
+
+    @property
+    def headers(self):
+        if self._headers is None:
+            self._headers = list(format_for_sheet(self.frame.iloc[:0]).columns)
+        return self._headers
+
+    @property
+    def keys(self):
+        if self._keys is None:
+            self._keys = self.frame["FD_Number"].astype(str).tolist() if "FD_Number" in self.frame.columns else []
+        return self._keys
+
+    @property
+    def rows(self):
+        with self._lock:
+            if self._rows is None:
+                values = format_for_sheet(self.frame).astype(str).values.tolist()
+                self._rows = dict(zip(self.keys, map(tuple, values)))
+        return self._rows
+
+    def is_keyed(self):
+        """A keyed diff is only safe when every FD_Number is unique."""
+        if self._keyed is None:
+            self._keyed = len(set(self.keys)) == len(self.keys)
+        return self._keyed
+
+    def updated(self, data):
+        """Return `(snapshot, diff)` for `data`, formatting only rows that differ from this one.
+
+        The diff is None when it can't be worked out from the typed frames
+        (no frame, other columns, or FD_Numbers that repeat); diff_snapshot
+        then compares every formatted row.
+        """
+        keys = data["FD_Number"].astype(str).tolist() if "FD_Number" in data.columns else []
+        current = SheetSnapshot.from_frame(data, keys)
+        old = self.frame
+        if old is None or list(old.columns) != list(data.columns) or not (self.is_keyed() and current.is_keyed()):
+            return current, None
+
+        # Row of each deposit in the old frame (-1 if new), then the rows whose values moved
+        position = pd.Index(self.keys).get_indexer(keys)
+        matched = np.flatnonzero(position >= 0)
+        differs = position < 0
+        for col in data.columns:
+            new, was = _comparable(data[col])[matched], _comparable(old[col])[position[matched]]
+            same = new == was
+            if new.dtype.kind in "fmM":
+                same |= pd.isna(new) & pd.isna(was)
+            differs[matched[~same]] = True
+
+        rows = np.flatnonzero(differs)
+        formatted = format_for_sheet(data.iloc[rows])
+        if list(formatted.columns) != self.headers:
+            return current, None
+        current._headers = self.headers
+        added, changed = [], []
+        for i, values in zip(rows, formatted.astype(str).values.tolist()):
+            (added if position[i] < 0 else changed).append((keys[i], tuple(values)))
+        kept = np.zeros(len(self.keys), dtype=bool)
+        kept[position[matched]] = True
+        deleted = [self.keys[i] for i in np.flatnonzero(~kept)]
+        return current, SheetDiff(added, deleted, changed)
+
+
+def _comparable(column):
+    # Values to compare with ==: NumPy dates and numbers as they are, the rest as objects with None for missing
+    if column.dtype.kind in "biufmM":
+        return column.to_numpy()
+    return column.to_numpy(dtype=object, na_value=None)
+
+
+class SheetDiff:
+    """Rows added, deleted and changed between a snapshot and the current data."""
+
+    def __init__(self, added, deleted, changed):
+        self.added = added        # list of (key, row) in data order
+        self.deleted = deleted    # list of keys
+        self.changed = changed    # list of (key, row)
+
+    def is_empty(self):
+        return not (self.added or self.deleted or self.changed)
+
+
+# Function to diff the current portfolio against the last synced snapshot
+def diff_snapshot(snapshot, current):
+    added = []
+    changed = []
+    seen = set()
+    for key in current.keys:
+        row = current.rows[key]
+        seen.add(key)
+        if key not in snapshot.rows:
+            added.append((key, row))
+        elif snapshot.rows[key] != row:
+            changed.append((key, row))
+    deleted = [key for key in snapshot.keys if key not in seen]
+    return SheetDiff(added, deleted, changed)
+
+
+def _cell(value, numeric):
+    cell = {"userEnteredValue": {"stringValue": value}}
+    if numeric:
+        cell["userEnteredFormat"] = NUMBER_FORMAT
+    return cell
+
+
+def _row_data(headers, row):
+    return {"values": [_cell(value, header in NUMERIC_COLUMNS) for header, value in zip(headers, row)]}
+
+
+# Function to turn a diff into one spreadsheets.batchUpdate request body
+def build_sync_requests(sheet_id, snapshot, diff):
+    headers = snapshot.headers
+    fields = "userEnteredValue,userEnteredFormat.numberFormat"
+    requests = []
+
+    # Delete from the bottom up so earlier row indices stay valid
+    position = {key: i for i, key in enumerate(snapshot.keys)}
+    deleted_positions = sorted((position[key] for key in diff.deleted), reverse=True)
+    for pos in deleted_positions:
+        requests.append({"deleteDimension": {"range": {
+            "sheetId": sheet_id, "dimension": "ROWS",
+            "startIndex": pos + 1, "endIndex": pos + 2,
+        }}})
+
+    # Changed rows keep their relative order, shifted up past deleted rows
+    if diff.changed:
+        deleted_sorted = sorted(deleted_positions)
+        for key, row in diff.changed:
+            pos = position[key]
+            start = pos + 1 - bisect_left(deleted_sorted, pos)
+            requests.append({"updateCells": {
+                "range": {"sheetId": sheet_id, "startRowIndex": start, "endRowIndex": start + 1,
+                          "startColumnIndex": 0, "endColumnIndex": len(headers)},
+                "rows": [_row_data(headers, row)],
+                "fields": fields,
+            }})
+
+    if diff.added:
+        requests.append({"appendCells": {
+            "sheetId": sheet_id,
+            "rows": [_row_data(headers, row) for _, row in diff.added],
+            "fields": fields,
+        }})
+
+    return requests
+
+
+# Function to check that Sheet1 still has the snapshot's rows, in the same order
+def rows_match_snapshot(sheet, snapshot):
+    """Read the FD_Number column once and compare it with `snapshot.keys`.
+
+    build_sync_requests targets rows by their position in the snapshot; a
+    sort, insert or delete made in the sheet itself would shift them.
+    """
+    if "FD_Number" not in snapshot.headers:
+        return False
+    col = column_letter(snapshot.headers.index("FD_Number"))
+    column = [row[0] if row else "" for row in sheet.get(f"{col}1:{col}")]
+    return column == ["FD_Number"] + snapshot.keys
+
+
+# Function to build requests that clear the sheet and write every row
+def build_rewrite_requests(sheet_id, current):
+    requests = [{"updateCells": {"range": {"sheetId": sheet_id}, "fields": "userEnteredValue"}}]
+    if current.keys:
+        requests.append({"appendCells": {
+            "sheetId": sheet_id,
+            "rows": [_row_data(current.headers, current.headers)]
+                    + [_row_data(current.headers, current.rows[key]) for key in current.keys],
+            "fields": "userEnteredValue,userEnteredFormat.numberFormat",
+        }})
+    return requests
+
+
+# Function to rewrite the whole sheet in one call, as commit_worksheet does without a usable base
+def rewrite_worksheet(sheet, current):
+    sheet.spreadsheet.batch_update({"requests": build_rewrite_requests(sheet.id, current)})
+
+
+# Function to read the current version marker, creating fd_version_0 if there is none
+def read_version(spreadsheet):
+    """Return `(version, sheet_id)` of the newest fd_version_<n> marker sheet."""
+    for _ in range(2):
+        markers = [(int(ws.title[len(VERSION_PREFIX):]), ws.id) for ws in spreadsheet.worksheets()
+                   if ws.title.startswith(VERSION_PREFIX) and ws.title[len(VERSION_PREFIX):].isdigit()]
+        if markers:
+            return max(markers)
+        try:
+            spreadsheet.batch_update({"requests": [_add_marker_request(0)]})
+        except Exception:
+            # Another writer created it first
+            pass
+    raise StaleSnapshotError("Could not create the sheet version marker")
+
+
+def _add_marker_request(version):
+    return {"addSheet": {"properties": {"title": f"{VERSION_PREFIX}{version}", "hidden": True}}}
+
+
+# Function to read Sheet1 as a DataFrame plus its snapshot
+def read_snapshot(sheet, on_page=None):
+    data = read_sheet_frame(sheet, on_page=on_page)
+    return data, SheetSnapshot.from_frame(data)
+
+
+# Function to read Sheet1 together with the version its rows belong to
+def read_versioned_snapshot(sheet, version=None):
+    """read_snapshot stamped with its version; re-reads if a save lands in between."""
+    version = version or read_version(sheet.spreadsheet)
+    for _ in range(MAX_COMMIT_ATTEMPTS):
+        # Stamp with the version read before the rows: if they are newer, the
+        # next commit against it fails safely rather than clobbering them
+        stamp = version
+        _, snapshot = read_snapshot(sheet)
+        # Format the cells now, before the merge that follows, not inside the commit window
+        snapshot.rows
+        version = read_version(sheet.spreadsheet)
+        if version == stamp:
+            break
+    snapshot.version, snapshot.version_id = stamp
+    return snapshot
+
+
+# Function to three-way merge two sets of changes made from the same base
+def merge_snapshots(base, mine, theirs):
+    """Return `(merged, conflicts)` combining our and their edits of `base`.
+
+    Rows are matched by FD_Number. A row only one side touched takes that
+    side's version (including deletions); a row both sides changed
+    differently is a conflict, resolved in favour of what is already saved
+    (`theirs`). Their row order is kept and our new rows go at the end.
+    """
+    if not (mine.is_keyed() and theirs.is_keyed() and base.is_keyed()) or mine.headers != theirs.headers:
+        raise StaleSnapshotError("Sheet1 was changed by another user and the changes cannot be merged "
+                                 "(duplicate FD numbers or different columns). Reload before saving.")
+    merged = {}
+    conflicts = []
+    for key in list(theirs.keys) + [key for key in mine.keys if key not in theirs.rows] \
+            + [key for key in base.keys if key not in theirs.rows and key not in mine.rows]:
+        if key in merged:
+            continue
+        b, m, t = base.rows.get(key), mine.rows.get(key), theirs.rows.get(key)
+        if m == b or m == t:
+            row = t
+        elif t == b:
+            row = m
+        else:
+            conflicts.append(key)
+            row = t
+        merged[key] = row
+    keys = [key for key in theirs.keys if merged[key] is not None] \
+        + [key for key in mine.keys if key not in theirs.rows and merged[key] is not None]
+    return SheetSnapshot(mine.headers, keys, {key: merged[key] for key in keys}), conflicts
+
+
+class SyncResult:
+    """Outcome of commit_worksheet.
+
+    `snapshot` is what Sheet1 now holds, `conflicts` lists FD_Numbers both we
+    and another user changed (their version was kept) and `data` is the merged
+    portfolio when other users' changes were folded in, else None.
+    """
+
+    def __init__(self, snapshot, conflicts=(), data=None):
+        self.snapshot = snapshot
+        self.conflicts = list(conflicts)
+        self.data = data
+
+
+def _commit_requests(sheet, base, current, base_is_fresh=False, diff=None):
+    if current.is_keyed() and base.is_keyed() and base.keys and base.headers == current.headers:
+        if diff is None:
+            diff = diff_snapshot(base, current)
+        if diff.is_empty():
+            return []
+        # Deletes and updates target rows by position: only safe while the sheet
+        # still lines up with the base (appends and a base just read need no check)
+        if base_is_fresh or not (diff.deleted or diff.changed) or rows_match_snapshot(sheet, base):
+            return build_sync_requests(sheet.id, base, diff)
+    return build_rewrite_requests(sheet.id, current)
+
+
+# Function to save with optimistic locking against the version marker
+def commit_worksheet(sheet, snapshot, data, latest=None):
+    """Sync `data` to `sheet` unless another writer got there first.
+
+    Each save is one atomic batchUpdate that also deletes the marker sheet of
+    the version `snapshot` was read at and adds the next one. If someone else
+    saved since, that delete fails and the whole batch is rejected; we then
+    re-read Sheet1, merge (merge_snapshots) and try again after a jittered
+    backoff. `latest`, the last snapshot committed from this process, lets a
+    stale session merge without re-reading the sheet first. Returns a
+    SyncResult; raises StaleSnapshotError when the changes cannot be merged.
+    """
+    spreadsheet = sheet.spreadsheet
+    # Only the rows that changed since `snapshot` are formatted, unless we have to merge
+    current, diff = snapshot.updated(data) if snapshot is not None else (SheetSnapshot.from_frame(data), None)
+    base = snapshot
+    conflicts = []
+    merged = False
+
+    def merge(theirs):
+        nonlocal current, merged
+        base_rows = base.rows if base is not None else {}
+        if theirs.rows == base_rows:
+            # Nothing new on their side: our rows stand as they are
+            return theirs
+        current, clashes = merge_snapshots(base or SheetSnapshot(current.headers, [], {}), current, theirs)
+        conflicts.extend(key for key in clashes if key not in conflicts)
+        merged = True
+        return theirs
+
+    def result():
+        # Rebuild the portfolio from the merged rows, typed as a fresh load would be
+        data = frame_from_values(current.headers, [current.rows[key] for key in current.keys]) if merged else None
+        if data is not None:
+            # Lets the next save diff against typed rows again
+            current.frame = data
+        return SyncResult(current, conflicts, data)
+
+    if latest is not None and (base is None or (base.version or 0) < latest.version):
+        base = merge(latest)
+
+    fresh = False
+    for attempt in range(MAX_COMMIT_ATTEMPTS):
+        version = None
+        if base is not None and base.version_id is not None:
+            requests = _commit_requests(sheet, base, current, fresh, diff if base is snapshot else None)
+            if not requests:
+                current.version, current.version_id = base.version, base.version_id
+                return result()
+            requests += [{"deleteSheet": {"sheetId": base.version_id}}, _add_marker_request(base.version + 1)]
+            try:
+                response = spreadsheet.batch_update({"requests": requests})
+            except Exception:
+                time.sleep(random.uniform(0, min(MAX_COMMIT_BACKOFF, COMMIT_BACKOFF * 2 ** attempt)))
+                version = read_version(spreadsheet)
+                if version == (base.version, base.version_id):
+                    # Not a version clash; let the caller handle the API error
+                    raise
+            else:
+                current.version = base.version + 1
+                current.version_id = response["replies"][-1]["addSheet"]["properties"]["sheetId"]
+                return result()
+
+        # Someone else saved since our base: fold their changes into ours and retry
+        base = merge(read_versioned_snapshot(sheet, version))
+        fresh = True
+    raise StaleSnapshotError("Sheet1 is being saved by other users too often; try again.")
+
+
+class SheetsClientPool:
+    """Process-wide gspread client and worksheet cache shared by all sessions.
+
+    `load_credentials` returns google-auth credentials (or None when there
+    are none, i.e. local storage mode). It is called with `notify=` when
+    the caller of `client`/`worksheet` passes one, so problems loading them
+    are reported to whoever is asking (e.g. a background save's job) rather
+    than to the session that built the pool. The client is authorized once and
+    reused; its token is refreshed ahead of expiry under a lock so that
+    concurrent sessions don't all refresh at once. Worksheets resolved with
+    open_by_key(...).worksheet(...) are cached until the client changes.
+    Saves from all sessions take `commit_lock` and record the snapshot they
+    committed in `committed` (by sheet id), so sessions in one process never
+    race each other for the sheet's version.
+    """
+
+    # Refresh the token this long before it actually expires
+    REFRESH_MARGIN = timedelta(minutes=5)
+    # How long to wait before looking for credentials again after finding none
+    RETRY_INTERVAL = 60
+
+    def __init__(self, load_credentials, authorize=None):
+        self.load_credentials = load_credentials
+        self.authorize = authorize
+        self.lock = threading.RLock()
+        self.credentials = None
+        self._client = None
+        self._worksheets = {}
+        self._missing_since = None
+        self.commit_lock = threading.Lock()
+        self.committed = {}
+
+    def _authorize(self, credentials):
+        if self.authorize is not None:
+            return self.authorize(credentials)
+        import gspread
+        return gspread.authorize(credentials)
+
+    def _needs_refresh(self):
+        expiry = getattr(self.credentials, "expiry", None)
+        if expiry is None:
+            # Not fetched yet; the authorized session gets one on first use
+            return False
+        return expiry - datetime.utcnow() < self.REFRESH_MARGIN
+
+    def _refresh(self):
+        from google.auth.transport.requests import Request
+        self.credentials.refresh(Request())
+
+    def client(self, notify=None):
+        """Return the shared client, or None when no credentials are available."""
+        with self.lock:
+            if self._client is None:
+                if self._missing_since is not None and time.time() - self._missing_since < self.RETRY_INTERVAL:
+                    return None
+                credentials = self.load_credentials() if notify is None else self.load_credentials(notify=notify)
+                if credentials is None:
+                    self._missing_since = time.time()
+                    return None
+                self._missing_since = None
+                self.credentials = credentials
+                self._client = self._authorize(credentials)
+                self._worksheets = {}
+            elif self._needs_refresh():
+                try:
+                    self._refresh()
+                except Exception:
+                    # Start over with freshly loaded credentials on the next call
+                    self.invalidate()
+                    return self.client(notify)
+            return self._client
+
+    def worksheet(self, sheet_id, title="Sheet1", notify=None):
+        """Return the cached worksheet, or None when no credentials are available."""
+        with self.lock:
+            client = self.client(notify)
+            if client is None:
+                return None
+            key = (sheet_id, title)
+            if key not in self._worksheets:
+                self._worksheets[key] = client.open_by_key(sheet_id).worksheet(title)
+            return self._worksheets[key]
+
+    def invalidate(self):
+        """Drop the client and worksheets, e.g. after an API error."""
+        with self.lock:
+            self.credentials = None
+            self._client = None
+            self._worksheets = {}
+            self._missing_since = None
+            self.committed = {}
+
+
+class FakeSpreadsheet:
+    """In-memory stand-in for a gspread Spreadsheet, for offline benchmarks.
+
+    Counts API calls and cells written so sync strategies can be compared
+    without touching Google's quota. batch_update is atomic like the real
+    API: if any request fails, none of them are applied. `latency` adds a
+    simulated round trip to every call, so parallel writers interleave.
+    """
+
+    def __init__(self, latency=0.0):
+        self.sheets = {}
+        self.api_calls = 0
+        self.cells_written = 0
+        self.latency = latency
+        self.lock = threading.RLock()
+        self._next_id = 0
+
+    def _round_trip(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def worksheet(self, title):
+        with self.lock:
+            if title not in self.sheets:
+                self.sheets[title] = FakeWorksheet(self, title, self._next_id)
+                self._next_id += 1
+            return self.sheets[title]
+
+    def worksheets(self):
+        self._round_trip()
+        with self.lock:
+            self.api_calls += 1
+            return list(self.sheets.values())
+
+    def batch_update(self, body):
+        self._round_trip()
+        with self.lock:
+            self.api_calls += 1
+            saved = ({title: (ws, list(ws.values)) for title, ws in self.sheets.items()},
+                     self.cells_written, self._next_id)
+            try:
+                return {"replies": [self._apply(request) for request in body["requests"]]}
+            except Exception:
+                sheets, self.cells_written, self._next_id = saved
+                self.sheets = {title: ws for title, (ws, _) in sheets.items()}
+                for ws, values in sheets.values():
+                    ws.values = values
+                raise
+
+    def _apply(self, request):
+        by_id = {ws.id: ws for ws in self.sheets.values()}
+        (kind, spec), = request.items()
+        if kind == "deleteDimension":
+            rng = spec["range"]
+            del by_id[rng["sheetId"]].values[rng["startIndex"]:rng["endIndex"]]
+        elif kind == "updateCells":
+            rng = spec["range"]
+            ws = by_id[rng["sheetId"]]
+            if "rows" not in spec:
+                # No rows with a range covering the whole sheet: clear it
+                ws.values = []
+            for offset, row in enumerate(spec.get("rows", [])):
+                ws._put_row(rng["startRowIndex"] + offset, _plain_row(row))
+        elif kind == "appendCells":
+            ws = by_id[spec["sheetId"]]
+            for row in spec["rows"]:
+                ws._put_row(len(ws.values), _plain_row(row))
+        elif kind == "addSheet":
+            title = spec["properties"]["title"]
+            if title in self.sheets:
+                raise ValueError(f"A sheet with the name \"{title}\" already exists")
+            return {"addSheet": {"properties": {"title": title, "sheetId": self.worksheet(title).id}}}
+        elif kind == "deleteSheet":
+            ws = by_id.get(spec["sheetId"])
+            if ws is None:
+                raise ValueError(f"No grid with id: {spec['sheetId']}")
+            del self.sheets[ws.title]
+        elif kind == "repeatCell":
+            pass
+        else:
+            raise ValueError(f"Unsupported request: {kind}")
+        return {}
+
+
+def _plain_row(row_data):
+    return [cell.get("userEnteredValue", {}).get("stringValue", "") for cell in row_data["values"]]
+
+
+class FakeWorksheet:
+    """In-memory stand-in for the subset of gspread.Worksheet the app uses."""
+
+    def __init__(self, spreadsheet, title, sheet_id):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.values = []
+
+    def _call(self):
+        self.spreadsheet._round_trip()
+        self.spreadsheet.api_calls += 1
+
+    def _put_row(self, index, row):
+        while len(self.values) <= index:
+            self.values.append([])
+        self.values[index] = list(row)
+        self.spreadsheet.cells_written += len(row)
+
+    @property
+    def row_count(self):
+        return max(len(self.values), 1000)
+
+    @property
+    def col_count(self):
+        return 26
+
+    def get(self, range_name):
+        """Rows of an "A<r1>:<col><r2>" range, trailing empty cells dropped like the API."""
+        self._call()
+        start, end = _parse_range(range_name)
+        with self.spreadsheet.lock:
+            rows = self.values[start[0]:None if end[0] is None else end[0] + 1]
+        rows = [row[start[1]:end[1] + 1] for row in rows]
+        rows = [row[:max((i + 1 for i, v in enumerate(row) if v != ""), default=0)] for row in rows]
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+
+def _parse_range(range_name):
+    """Zero-based (row, column) corners of an A1 range like "A2:I50001".
+
+    An open-ended corner such as the "B" of "B1:B" gets row None.
+    """
+    corners = []
+    for ref in range_name.split(":"):
+        letters = ref.rstrip("0123456789")
+        col = 0
+        for ch in letters:
+            col = col * 26 + ord(ch.upper()) - ord("A") + 1
+        row = ref[len(letters):]
+        corners.append((int(row) - 1 if row else None, col - 1))
+    return corners
+
+
+class FakeClient:
+    """Stand-in for a gspread Client: open_by_key(...) returns a FakeSpreadsheet."""
+
+    def __init__(self):
+        self.spreadsheets = {}
+
+    def open_by_key(self, key):
+        if key not in self.spreadsheets:
+            self.spreadsheets[key] = FakeSpreadsheet()
+        return self.spreadsheets[key]
@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+from fd_calc import COMPOUNDING_FREQUENCY, duration_parts, round_paisa
+from fd_rates import tenor_buckets, tenor_days
+
+# Penalty on premature withdrawal, in basis points below the applicable rate
+DEFAULT_PENALTY_BP = 100
+# Renewals simulated when none are given
+DEFAULT_ROLLOVERS = 3
+
+
+class RolloverSchedule:
+    """Every deposit's booked term and its auto-renewals, as deposit x term arrays.
+
+    Column 0 is the booked term; column k is the k-th renewal, which starts
+    on the previous maturity date with the previous maturity amount as its
+    principal, for the same tenor and compounding. `rates` holds the rate
+    (%) of each term, `amounts` and `dates` its maturity amount and date.
+    """
+
+    def __init__(self, labels, principal, starts, rates, n, term_years, amounts, dates):
+        self.labels = labels
+        self.principal = principal
+        self.starts = starts
+        self.rates = rates
+        self.n = n
+        self.term_years = term_years
+        self.amounts = amounts
+        self.dates = dates
+
+    @property
+    def rollovers(self):
+        return self.amounts.shape[1] - 1
+
+    def term_starts(self):
+        """Start date of every term: the booked start, then each maturity date."""
+        return np.column_stack([self.starts, self.dates[:, :-1]])
+
+    def term_principal(self):
+        """Principal of every term: the booked principal, then each maturity amount."""
+        return np.column_stack([self.principal, self.amounts[:, :-1]])
+
+    def summary(self):
+        """One row per term: Deposits, MaturityValue, Interest (since booking) and LastMaturity."""
+        principal = np.nansum(self.principal)
+        values = np.nansum(self.amounts, axis=0)
+        dated = self.dates != np.datetime64("NaT")
+        return pd.DataFrame({
+            "Term": np.arange(self.rollovers + 1),
+            "Deposits": dated.sum(axis=0),
+            "MaturityValue": values,
+            "Interest": values - principal,
+            "LastMaturity": pd.DataFrame(self.dates.astype("datetime64[ns]")).max().to_numpy(),
+        })
+
+    def deposits(self):
+        """One row per deposit: renewal rate of the last term, final amount and final date."""
+        return pd.DataFrame({
+            "RenewalRate": self.rates[:, -1],
+            "FinalAmount": self.amounts[:, -1],
+            "FinalDate": self.dates[:, -1].astype("datetime64[ns]"),
+        }, index=self.labels)
+
+
+def _card_rates(banks, days, compounding, rate_cards):
+    # Card rate for each (bank, tenor bucket, compounding), looked up once per distinct combination
+    keys = pd.MultiIndex.from_arrays([banks, tenor_buckets(days), compounding])
+    codes, uniques = keys.factorize()
+    looked_up = [rate_cards.card(bank)["rates"].get(bucket, {}).get(c) if bucket is not None else None
+                 for bank, bucket, c in uniques]
+    return np.array([np.nan if rate is None else rate for rate in looked_up], dtype=np.float64)[codes]
+
+
+def _compounding(data):
+    return pd.Series(data["Compounding"], dtype="object").astype(str).to_numpy()
+
+
+# Function to find the rate each deposit would renew at today
+def prevailing_rates(data, rate_cards=None):
+    """Rate (%) each deposit would renew at: its bank's card rate for the same
+    tenor bucket and compounding, or its booked rate where there is no card entry."""
+    booked = np.asarray(data["Rate"], dtype=np.float64)
+    if rate_cards is None or not len(data):
+        return booked
+    card = _card_rates(pd.Series(data["Bank"], dtype="object").astype(str).to_numpy(),
+                       tenor_days(*duration_parts(data)), _compounding(data), rate_cards)
+    return np.where(np.isnan(card), booked, card)
+
+
+# Function to run every deposit to maturity and renew it `rollovers` times
+def simulate_rollovers(data, rollovers=DEFAULT_ROLLOVERS, shift_bp=0, rate_cards=None):
+    """Return the RolloverSchedule of the portfolio.
+
+    The booked term ends on the deposit's stored MaturityDate with its stored
+    MaturityAmount (as booked, including exact-mode deposits), falling back
+    to the calc_maturity formula where either is missing. Each renewal is
+    priced with the calc_maturity formula (amount rounded to the paisa,
+    tenor of `int(years * 365)` days) at the prevailing rate (see
+    prevailing_rates) plus `shift_bp`, floored at 0%. `shift_bp` is a single
+    shift or one per renewal, for a rate path. Deposits are advanced one
+    term at a time in whole-column NumPy expressions, so the cost is
+    `rollovers + 1` vector passes over the portfolio.
+    """
+    shifts = np.broadcast_to(np.asarray(shift_bp, dtype=np.float64), (rollovers,)) / 100
+    principal = np.asarray(data["Principal"], dtype=np.float64)
+    booked = np.asarray(data["Rate"], dtype=np.float64)
+    n = pd.Series(_compounding(data)).map(COMPOUNDING_FREQUENCY).to_numpy(dtype=np.float64)
+    years, months, days = duration_parts(data)
+    term_years = years + (months / 12) + (days / 365)
+    term_days = np.trunc(term_years * 365).astype("timedelta64[D]")
+    starts = pd.to_datetime(pd.Series(data["StartDate"])).to_numpy().astype("datetime64[D]")
+    stored_amount = np.asarray(data["MaturityAmount"], dtype=np.float64)
+    stored_date = pd.to_datetime(pd.Series(data["MaturityDate"])).to_numpy().astype("datetime64[D]")
+    stored = ~np.isnan(stored_amount) & ~np.isnat(stored_date)
+
+    rates = np.empty((len(data), rollovers + 1))
+    rates[:, 0] = booked
+    rates[:, 1:] = np.maximum(prevailing_rates(data, rate_cards)[:, None] + shifts, 0)
+    amounts = np.empty_like(rates)
+    dates = np.empty(rates.shape, dtype="datetime64[D]")
+    amount, date = principal, starts
+    for term in range(rollovers + 1):
+        amount = round_paisa(amount * (1 + rates[:, term] / 100 / n) ** (n * term_years))
+        date = date + term_days
+        if term == 0:
+            amount = np.where(stored, stored_amount, amount)
+            date = np.where(stored, stored_date, date)
+        amounts[:, term], dates[:, term] = amount, date
+    return RolloverSchedule(data.index, principal, starts, rates, n, term_years, amounts, dates)
+
+
+# Function to value withdrawing every deposit early on a given date
+def simulate_breakage(data, break_date, penalty_bp=DEFAULT_PENALTY_BP, schedule=None, rate_cards=None):
+    """Payout per deposit if it is withdrawn on `break_date` (one date, or one per deposit).
+
+    The deposit is broken in whichever term of `schedule` (default: the
+    booked term only) is running on that date. Interest for the days held
+    is paid at the term's rate, or the bank's card rate for the tenor
+    actually held if that is lower, minus `penalty_bp`, floored at 0%.
+    Deposits whose last term has matured by then are paid their final
+    amount without penalty. Returns Term, DaysHeld, PayoutRate, BreakValue,
+    HoldValue (the term's maturity amount), Penalty and Forgone.
+    """
+    if schedule is None:
+        schedule = simulate_rollovers(data, 0)
+    rows = np.arange(len(data))
+    break_day = np.broadcast_to(pd.to_datetime(pd.Series(break_date)).to_numpy().astype("datetime64[D]"),
+                                (len(data),))
+    # Terms already matured on the break date; a term maturing that day is paid in full
+    matured = (schedule.dates <= break_day[:, None]).sum(axis=1)
+    completed = matured > schedule.rollovers
+    term = np.minimum(matured, schedule.rollovers)
+
+    principal = schedule.term_principal()[rows, term]
+    held = np.maximum((break_day - schedule.term_starts()[rows, term]).astype(np.int64), 0)
+    applicable = schedule.rates[rows, term]
+    if rate_cards is not None and len(data):
+        card = _card_rates(pd.Series(data["Bank"], dtype="object").astype(str).to_numpy(), held,
+                           _compounding(data), rate_cards)
+        applicable = np.where(np.isnan(card), applicable, np.minimum(applicable, card))
+    payout_rate = np.maximum(applicable - penalty_bp / 100, 0)
+    held_years = held / 365
+    value = round_paisa(principal * (1 + payout_rate / 100 / schedule.n) ** (schedule.n * held_years))
+    full_rate = round_paisa(principal * (1 + applicable / 100 / schedule.n) ** (schedule.n * held_years))
+    hold_value = schedule.amounts[rows, term]
+
+    final = schedule.amounts[:, -1]
+    value = np.where(completed, final, value)
+    return pd.DataFrame({
+        "Term": term,
+        "DaysHeld": np.where(completed, 0, held),
+        "PayoutRate": np.where(completed, np.nan, payout_rate),
+        "BreakValue": value,
+        "HoldValue": hold_value,
+        "Penalty": np.where(completed, 0.0, full_rate - value),
+        "Forgone": hold_value - value,
+    }, index=schedule.labels)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from fd_calc import COMPOUNDING_FREQUENCY, round_paisa
+
+# Largest whole-day tenor shortest_tenor will report (100 years)
+MAX_TENOR_DAYS = 36_500
+
+
+def _frequency(compounding):
+    n = pd.Series(compounding, dtype="object").map(COMPOUNDING_FREQUENCY)
+    if n.isna().any():
+        bad = pd.Series(compounding, dtype="object")[n.isna()].unique().tolist()
+        raise KeyError(f"Unknown compounding option(s): {bad}")
+    return n.to_numpy(dtype=np.float64)
+
+
+def _duration_years(years, months, days):
+    return np.asarray(years, dtype=np.float64) + (np.asarray(months, dtype=np.float64) / 12) \
+        + (np.asarray(days, dtype=np.float64) / 365)
+
+
+def _maturity(principal, rate, duration_years, n):
+    return round_paisa(principal * (1 + rate / 100 / n) ** (n * duration_years))
+
+
+# Function to find the principal needed to reach a maturity amount
+def required_principal(target, rate, years, months, days, compounding):
+    """Smallest principal (in paisa) whose calc_maturity amount reaches `target`.
+
+    Inverts A = P * (1 + r/n)^(n*t) in closed form, then nudges each answer by
+    a paisa where rounding of the maturity amount would miss or overshoot.
+    """
+    target = round_paisa(target)
+    rate = np.asarray(rate, dtype=np.float64)
+    n = _frequency(compounding)
+    duration_years = _duration_years(years, months, days)
+    growth = (1 + rate / 100 / n) ** (n * duration_years)
+
+    principal = np.ceil(np.round(target / growth * 100, 6)) / 100
+    short = _maturity(principal, rate, duration_years, n) < target
+    principal[short] += 0.01
+    lower = principal - 0.01
+    spare = (lower >= 0) & (_maturity(lower, rate, duration_years, n) >= target)
+    principal[spare] = lower[spare]
+    return round_paisa(principal)
+
+
+# Function to find the annual rate at which a deposit reaches a maturity amount
+def break_even_rate(principal, target, years, months, days, compounding):
+    """Annual rate (%) at which `principal` grows to `target` over the tenor.
+
+    Closed form r = n * ((A/P)^(1/(n*t)) - 1); NaN where the tenor is zero.
+    """
+    principal = np.asarray(principal, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    n = _frequency(compounding)
+    duration_years = _duration_years(years, months, days)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = n * ((target / principal) ** (1 / (n * duration_years)) - 1) * 100
+    return np.where(duration_years > 0, rate, np.nan)
+
+
+# Function to find the shortest whole-day tenor that reaches a maturity amount
+def shortest_tenor(principal, target, rate, compounding):
+    """Fewest days (entered as Duration days) for calc_maturity to reach `target`.
+
+    Closed form t = ln(A/P) / (n * ln(1 + r/n)), rounded up to whole days and
+    checked against the paisa-rounded amount. Returns float days, NaN where
+    the target cannot be reached within MAX_TENOR_DAYS.
+    """
+    principal = np.asarray(principal, dtype=np.float64)
+    target = round_paisa(target)
+    rate = np.asarray(rate, dtype=np.float64)
+    n = _frequency(compounding)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        years = np.log(target / principal) / (n * np.log1p(rate / 100 / n))
+    reached = principal >= target
+    years = np.where(reached, 0.0, years)
+    valid = np.isfinite(years) & (years >= 0) & (years * 365 <= MAX_TENOR_DAYS)
+
+    days = np.where(valid, np.ceil(np.round(years * 365, 9)), 0.0)
+    short = valid & (_maturity(principal, rate, days / 365, n) < target)
+    days[short] += 1
+    spare = valid & (days > 0) & (_maturity(principal, rate, (days - 1) / 365, n) >= target)
+    days[spare] -= 1
+    return np.where(valid, days, np.nan)
@@ -0,0 +1,182 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from fd_calc import COMPOUNDING_FREQUENCY, parse_duration
+
+# Typed columnar store used when Google Sheets is not available
+LOCAL_STORE = 'fd_data.feather'
+# Store used by older versions of the app; migrated on first load
+LEGACY_CSV = 'fd_data.csv'
+# Uncompressed so numeric and date columns are memory-mapped without copying
+STORE_COMPRESSION = "uncompressed"
+
+NUMERIC_COLUMNS = ["Principal", "Rate", "MaturityAmount"]
+DATE_COLUMNS = ["StartDate", "MaturityDate"]
+# Low-cardinality labels, held as integer codes into a few category strings
+CATEGORY_COLUMNS = ["Bank", "Compounding"]
+# The sheet's "1 years 0 months 0 days" text, held as three small integers
+DURATION_COLUMNS = ["Years", "Months", "Days"]
+DURATION_DTYPE = "int16"
+# FD numbers in one Arrow buffer instead of a Python str object per row
+KEY_DTYPE = "string[pyarrow]"
+# Column order of the in-memory portfolio; Sheets and exports use Duration text instead
+PORTFOLIO_COLUMNS = ["Bank", "FD_Number", "Principal", "Rate", "StartDate", *DURATION_COLUMNS,
+                     "Compounding", "MaturityAmount", "MaturityDate"]
+
+
+# Helper function to create empty dataframe with correct structure
+def create_empty_dataframe():
+    return pd.DataFrame({
+        "Bank": pd.Series(dtype='category'),
+        "FD_Number": pd.Series(dtype=KEY_DTYPE),
+        "Principal": pd.Series(dtype='float'),
+        "Rate": pd.Series(dtype='float'),
+        "StartDate": pd.Series(dtype='datetime64[ns]'),
+        "Years": pd.Series(dtype=DURATION_DTYPE),
+        "Months": pd.Series(dtype=DURATION_DTYPE),
+        "Days": pd.Series(dtype=DURATION_DTYPE),
+        "Compounding": pd.Series(pd.Categorical([], categories=list(COMPOUNDING_FREQUENCY))),
+        "MaturityAmount": pd.Series(dtype='float'),
+        "MaturityDate": pd.Series(dtype='datetime64[ns]')
+    })
+
+
+def _categorical(values, known=()):
+    # Known labels first so every frame shares their codes; anything else is appended
+    values = pd.Series(values, dtype="object").astype(str)
+    extra = sorted(set(pd.unique(values)) - set(known))
+    return pd.Categorical(values, categories=list(known) + extra)
+
+
+# Function to convert a portfolio in either layout to the compact in-memory one
+def to_portfolio_frame(data):
+    """Return `data` with compact dtypes, keeping its row labels.
+
+    Duration text becomes int16 Years/Months/Days, Bank and Compounding
+    become categoricals, FD_Number an Arrow string, amounts float64 and
+    dates datetime64. Form rows carry datetime.date objects and sheet loads
+    can numericise FD numbers, so loose input is coerced; columns already
+    in the compact dtype are passed through without a copy.
+    """
+    typed = data.copy(deep=False)
+    if "Duration" in typed.columns:
+        if not set(DURATION_COLUMNS).issubset(typed.columns):
+            position = typed.columns.get_loc("Duration")
+            for offset, (col, values) in enumerate(zip(DURATION_COLUMNS, parse_duration(typed["Duration"]))):
+                typed.insert(position + offset, col, values)
+        typed = typed.drop(columns="Duration")
+    for col in NUMERIC_COLUMNS:
+        if col in typed.columns and typed[col].dtype != np.float64:
+            typed[col] = pd.to_numeric(typed[col], errors="coerce").astype("float64")
+    for col in DATE_COLUMNS:
+        if col in typed.columns and typed[col].dtype != "datetime64[ns]":
+            # to_datetime keeps the unit of datetime64[s]/[ms] input; mixed units break concat
+            typed[col] = pd.to_datetime(typed[col], errors="coerce").astype("datetime64[ns]")
+    for col in DURATION_COLUMNS:
+        if col in typed.columns and typed[col].dtype != DURATION_DTYPE:
+            typed[col] = pd.to_numeric(typed[col], errors="coerce").fillna(0).astype(DURATION_DTYPE)
+    if "FD_Number" in typed.columns and not isinstance(typed["FD_Number"].dtype, pd.StringDtype):
+        typed["FD_Number"] = typed["FD_Number"].astype(str).astype(KEY_DTYPE)
+    for col in CATEGORY_COLUMNS:
+        if col in typed.columns and not isinstance(typed[col].dtype, pd.CategoricalDtype):
+            typed[col] = _categorical(typed[col], COMPOUNDING_FREQUENCY if col == "Compounding" else ())
+    order = [col for col in PORTFOLIO_COLUMNS if col in typed.columns]
+    return typed[order + [col for col in typed.columns if col not in order]]
+
+
+# Function to concatenate portfolio frames without losing the categorical columns
+def concat_portfolio(frames, **kwargs):
+    """pd.concat for portfolio frames (kwargs are passed on).
+
+    pandas falls back to object dtype when categoricals have different
+    categories, so every frame is made compact and given the union of them.
+    """
+    frames = [to_portfolio_frame(frame) for frame in frames]
+    for col in CATEGORY_COLUMNS:
+        if not all(col in frame.columns for frame in frames):
+            continue
+        categories = list(dict.fromkeys(c for frame in frames for c in frame[col].cat.categories))
+        frames = [frame if list(frame[col].cat.categories) == categories
+                  else frame.assign(**{col: frame[col].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames, **kwargs)
+
+
+# Function to append rows under fresh labels in a single concat
+def append_rows(data, rows):
+    """Return `data` with `rows` appended, labelled from max(label) + 1 upwards.
+
+    Existing labels are kept (rows are never renumbered), so indexes keyed
+    on them stay valid. The new rows are `result.index[-len(rows):]`.
+    """
+    start = int(data.index.max()) + 1 if len(data) else 0
+    rows = rows.set_axis(range(start, start + len(rows)))
+    return concat_portfolio([data, rows])
+
+
+# Function to format Years/Months/Days as the "1 years 0 months 0 days" text of the sheet
+def format_duration(years, months, days):
+    """Vectorized f"{y} years {m} months {d} days", formatting each distinct tenor once."""
+    years, months, days = (np.asarray(v, dtype=np.int64) for v in (years, months, days))
+    # Pack the three 16-bit values into one key so distinct tenors factorize in one pass
+    key = ((years + 2 ** 15) << 32) | ((months + 2 ** 15) << 16) | (days + 2 ** 15)
+    codes, uniques = pd.factorize(key)
+    text = np.array([f"{(k >> 32) - 2 ** 15} years {((k >> 16) & 0xFFFF) - 2 ** 15} months "
+                     f"{(k & 0xFFFF) - 2 ** 15} days" for k in uniques.tolist()], dtype=object)
+    return text[codes] if len(text) else np.array([], dtype=object)
+
+
+# Function to convert the in-memory portfolio back to the layout of the sheet and exports
+def to_sheet_layout(data):
+    """Return `data` with Years/Months/Days folded back into one Duration text column."""
+    if not set(DURATION_COLUMNS).issubset(data.columns):
+        return data
+    position = data.columns.get_loc("Years")
+    out = data.drop(columns=DURATION_COLUMNS)
+    out.insert(position, "Duration", format_duration(data["Years"], data["Months"], data["Days"]))
+    return out
+
+
+# Function to coerce the portfolio to the dtypes kept in the columnar store
+def to_storage_frame(data):
+    """Return `data` in the compact layout with a fresh 0..n-1 index."""
+    return to_portfolio_frame(data).reset_index(drop=True)
+
+
+# Function to read the pre-columnar CSV store
+def read_legacy_csv(path=LEGACY_CSV):
+    df = pd.read_csv(path, dtype={"FD_Number": str})
+    # Convert date strings to datetime objects
+    try:
+        df["StartDate"] = pd.to_datetime(df["StartDate"])
+        df["MaturityDate"] = pd.to_datetime(df["MaturityDate"])
+    except:
+        pass
+    return df
+
+
+# Function to load the portfolio from local storage
+def read_local_store(path=LOCAL_STORE, legacy_path=LEGACY_CSV):
+    """Load the local store, memory-mapped, migrating a legacy CSV if needed."""
+    if os.path.exists(path):
+        import pyarrow as pa
+        from pyarrow import feather
+        table = feather.read_table(path, memory_map=True)
+        data = table.to_pandas(split_blocks=True, types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+        # Stores written before the compact layout hold Duration text
+        return to_portfolio_frame(data)
+    if legacy_path and os.path.exists(legacy_path):
+        df = read_legacy_csv(legacy_path)
+        write_local_store(df, path)
+        return read_local_store(path, legacy_path=None)
+    return create_empty_dataframe()
+
+
+# Function to save the portfolio to local storage
+def write_local_store(data, path=LOCAL_STORE):
+    """Write `data` to the columnar store atomically, keeping its dtypes."""
+    typed = to_storage_frame(data)
+    tmp_path = f"{path}.tmp"
+    typed.to_feather(tmp_path, compression=STORE_COMPRESSION)
+    os.replace(tmp_path, path)
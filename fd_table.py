@@ -0,0 +1,134 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from fd_calc import round_paisa
+from fd_storage import DURATION_COLUMNS, format_duration
+
+# Column names shown in the manage tab, keyed by the stored column name
+DISPLAY_COLUMNS = {
+    'FD_Number': 'FD Number',
+    'Rate': 'Rate (%)',
+    'StartDate': 'Start Date',
+    'MaturityAmount': 'Maturity Amount',
+    'MaturityDate': 'Maturity Date'
+}
+# Column order in the table after Row ID
+TABLE_ORDER = ["Bank", "FD_Number", "Principal", "Rate", "StartDate",
+               "Duration", "Compounding", "MaturityAmount", "MaturityDate"]
+
+
+# Function to format amounts as ₹1,234.56 for a whole column at once
+def format_currency(values):
+    """Vectorized equivalent of f"₹{x:,.2f}" over an array of amounts."""
+    amounts = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(amounts)
+    amounts = np.where(missing, 0.0, amounts)
+    cents = np.rint(np.abs(round_paisa(amounts)) * 100).astype(np.int64)
+    rupees = cents // 100
+    paise = cents % 100
+
+    # Split rupees into thousands groups, lowest first
+    groups = [rupees % 1000]
+    rest = rupees // 1000
+    while (rest > 0).any():
+        groups.append(rest % 1000)
+        rest = rest // 1000
+    group_count = np.ones(len(rupees), dtype=np.int64)
+    for g in range(1, len(groups)):
+        group_count += (rupees >= 1000 ** g)
+
+    # Leading group unpadded, the rest zero-padded to three digits
+    text = np.full(len(rupees), "", dtype=object)
+    for g in range(len(groups) - 1, -1, -1):
+        digits = groups[g].astype(str)
+        is_top = group_count - 1 == g
+        below_top = group_count - 1 > g
+        text = np.where(is_top, digits, text)
+        text = np.where(below_top, text + "," + np.char.zfill(digits, 3).astype(object), text)
+
+    sign = np.where((np.asarray(values, dtype=np.float64) < 0) & (cents > 0), "-", "")
+    formatted = "₹" + sign.astype(object) + text + "." + np.char.zfill(paise.astype(str), 2).astype(object)
+    return np.where(missing, "", formatted)
+
+
+class TablePage:
+    """One page of the FD table, already formatted for display."""
+
+    def __init__(self, frame, page, page_count, total_rows, first_row):
+        self.frame = frame
+        self.page = page
+        self.page_count = page_count
+        self.total_rows = total_rows
+        self.first_row = first_row
+
+
+# Function to filter, sort and slice the portfolio, formatting only the visible rows
+def query_page(data, index=None, search="", sort_by=None, ascending=True, page=1, page_size=25):
+    """Return the requested TablePage of `data`.
+
+    Filtering goes through the PortfolioIndex (FD number / bank prefix) when
+    one is given, sorting is a stable sort of the raw typed column (missing
+    values last), and only the `page_size` rows on the page are copied and
+    formatted, so the cost of a rerun depends on the page size rather than
+    on the portfolio size.
+    """
+    if search and index is not None:
+        positions = data.index.get_indexer(index.search(search, limit=None))
+        positions.sort()
+    else:
+        positions = np.arange(len(data))
+
+    if sort_by is not None and len(positions):
+        if sort_by == "Duration" and set(DURATION_COLUMNS).issubset(data.columns):
+            # Longest tenor last: years, then months, then days
+            years, months, days = (data[col].to_numpy(dtype=np.int64)[positions] for col in DURATION_COLUMNS)
+            column = (years * 1000 + months) * 100_000 + days
+        else:
+            column = data[sort_by].to_numpy()[positions]
+        if sort_by in ("StartDate", "MaturityDate"):
+            column = pd.to_datetime(column)
+        # Unlike np.argsort, this copes with None/NaN in object columns; ties keep portfolio order
+        order = pd.Series(column).sort_values(ascending=ascending, kind="stable", na_position="last").index
+        positions = positions[order.to_numpy()]
+
+    total_rows = len(positions)
+    page_count = max(1, math.ceil(total_rows / page_size))
+    page = min(max(1, page), page_count)
+    first = (page - 1) * page_size
+    visible = positions[first:first + page_size]
+
+    return TablePage(format_rows(data, visible), page, page_count, total_rows, first)
+
+
+# Function to format the given row positions for display
+def format_rows(data, positions):
+    rows = data.iloc[positions]
+    frame = pd.DataFrame({"Row ID": np.asarray(positions) + 1})
+    for col in TABLE_ORDER:
+        if col == "Duration" and set(DURATION_COLUMNS).issubset(rows.columns):
+            frame[col] = format_duration(rows["Years"], rows["Months"], rows["Days"])
+            continue
+        if col not in rows.columns:
+            continue
+        values = rows[col].to_numpy()
+        if col in ("Principal", "MaturityAmount"):
+            values = format_currency(values)
+        elif col in ("StartDate", "MaturityDate"):
+            values = pd.to_datetime(values).strftime('%Y-%m-%d').to_numpy()
+        elif col == "FD_Number":
+            # Ensure FD Number is treated as string to avoid Arrow serialization warnings
+            values = values.astype(str)
+        frame[DISPLAY_COLUMNS.get(col, col)] = values
+    return frame
+
+
+# Function to format PortfolioAggregates.by() output for display
+def format_aggregates(frame):
+    table = pd.DataFrame({frame.columns[0]: frame.iloc[:, 0], "Deposits": frame["Deposits"]})
+    for col in ("Principal", "MaturityAmount", "Interest"):
+        table[DISPLAY_COLUMNS.get(col, col)] = format_currency(frame[col])
+    table["Avg Rate (%)"] = frame["WeightedRate"].map("{:.2f}".format)
+    table["Share (%)"] = frame["Share"].map("{:.1f}".format)
+    return table
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the fd_* modules from the repository root, like the app does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
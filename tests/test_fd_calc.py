@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fd_calc import COMPOUNDING_FREQUENCY, calc_maturity_exact, calc_maturity_exact_batch
+
+ROWS = 2_000
+
+
+def make_deposits(rows, seed):
+    # Random deposits with a share of month-end and leap-day starts
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2000-01-01") + pd.to_timedelta(rng.integers(0, 12_000, rows), unit="D")
+    month_end = rng.random(rows) < 0.2
+    start = start.where(~month_end, start + pd.offsets.MonthEnd(0))
+    leap_day = rng.random(rows) < 0.05
+    start = start.where(~leap_day, pd.Timestamp("2024-02-29"))
+    return pd.DataFrame({
+        "Principal": rng.integers(100, 1_000_000_000, rows) / 100,
+        "Rate": np.round(rng.uniform(0.1, 15, rows), 2),
+        "StartDate": start,
+        "Years": rng.integers(0, 10, rows),
+        "Months": rng.integers(0, 12, rows),
+        "Days": rng.integers(0, 31, rows),
+        "Compounding": rng.choice(list(COMPOUNDING_FREQUENCY), rows),
+    })
+
+
+def batch_and_rows(d):
+    batch = calc_maturity_exact_batch(d["Principal"], d["Rate"], d["StartDate"], d["Years"],
+                                      d["Months"], d["Days"], d["Compounding"])
+    rows = [calc_maturity_exact(r.Principal, r.Rate, r.StartDate.to_pydatetime(),
+                                {"years": r.Years, "months": r.Months, "days": r.Days}, r.Compounding)
+            for r in d.itertuples()]
+    return batch, rows
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_row_by_row(seed):
+    d = make_deposits(ROWS, seed)
+    batch, rows = batch_and_rows(d)
+    dates = np.array([r["maturity_date"] for r in rows], dtype="datetime64[ns]")
+    amounts = np.array([r["maturity_amount"] for r in rows])
+    np.testing.assert_array_equal(batch["MaturityDate"].to_numpy(), dates)
+    # Same amount to the paisa
+    np.testing.assert_array_equal(np.round(batch["MaturityAmount"].to_numpy() * 100), np.round(amounts * 100))
+
+
+@pytest.mark.parametrize("start, years, months, days, expected", [
+    ("2023-01-31", 0, 1, 0, "2023-02-28"),
+    ("2024-01-31", 0, 1, 0, "2024-02-29"),
+    ("2024-08-31", 0, 1, 0, "2024-09-30"),
+    ("2024-03-31", 0, 6, 0, "2024-09-30"),
+    ("2024-02-29", 1, 0, 0, "2025-02-28"),
+    ("2024-02-29", 4, 0, 0, "2028-02-29"),
+    ("2024-02-29", 0, 0, 365, "2025-02-28"),
+    ("2023-12-31", 0, 2, 1, "2024-03-01"),
+])
+def test_month_end_and_leap_day_starts(start, years, months, days, expected):
+    d = pd.DataFrame({"Principal": [10_000.0], "Rate": [7.1], "StartDate": [pd.Timestamp(start)],
+                      "Years": [years], "Months": [months], "Days": [days], "Compounding": ["Quarterly"]})
+    batch, (row,) = batch_and_rows(d)
+    assert row["maturity_date"] == datetime.fromisoformat(expected)
+    assert batch["MaturityDate"].iloc[0] == pd.Timestamp(expected)
+    assert round(batch["MaturityAmount"].iloc[0], 2) == row["maturity_amount"]
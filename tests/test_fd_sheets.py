@@ -0,0 +1,220 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import fd_sheets
+from fd_core import load_portfolio, save_portfolio
+from fd_saver import BackgroundSaver
+from fd_sheets import (MAX_COMMIT_ATTEMPTS, VERSION_PREFIX, FakeClient, FakeSpreadsheet, SheetSnapshot,
+                       SheetsClientPool, StaleSnapshotError, commit_worksheet, diff_snapshot, read_snapshot,
+                       read_versioned_snapshot)
+from fd_storage import to_portfolio_frame
+
+SHEET_ID = "test"
+
+
+def make_portfolio(numbers):
+    start = pd.Timestamp("2024-01-01")
+    return to_portfolio_frame(pd.DataFrame({
+        "Bank": "SBI",
+        "FD_Number": list(numbers),
+        "Principal": 10_000.0,
+        "Rate": 7.0,
+        "StartDate": start,
+        "Duration": "1 years 0 months 0 days",
+        "Compounding": "Yearly",
+        "MaturityAmount": 10_700.0,
+        "MaturityDate": start + pd.Timedelta(days=366),
+    }))
+
+
+def set_rate(data, number, rate):
+    data = data.copy()
+    data.loc[data["FD_Number"] == number, "Rate"] = rate
+    return data
+
+
+def rates(data):
+    return dict(zip(data["FD_Number"].astype(str), data["Rate"]))
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(fd_sheets, "COMMIT_BACKOFF", 0.0)
+
+
+@pytest.fixture
+def client():
+    client = FakeClient()
+    client.spreadsheets[SHEET_ID] = FakeSpreadsheet(latency=0.001)
+    return client
+
+
+def make_pool(client):
+    return SheetsClientPool(lambda notify=None: object(), authorize=lambda credentials: client)
+
+
+def sheet_of(client):
+    return client.spreadsheets[SHEET_ID].worksheet("Sheet1")
+
+
+def seed(client, numbers):
+    saved, _, _ = save_portfolio(make_portfolio(numbers), make_pool(client), SHEET_ID, None, lambda *a: None)
+    assert saved
+
+
+def test_parallel_writers_lose_no_rows(client):
+    writers, saves = 6, 8
+    seed(client, [f"BASE{i}" for i in range(20)])
+    barrier = threading.Barrier(writers)
+    failures = []
+
+    def notify(level, message):
+        if level == "error" or message.startswith("Error"):
+            failures.append(message)
+
+    def writer(w):
+        try:
+            write(w)
+        except Exception as e:
+            failures.append(repr(e))
+
+    def write(w):
+        # Each writer has its own pool, so they race on the version marker like separate processes
+        pool = make_pool(client)
+        data, snapshot = load_portfolio(pool, SHEET_ID, lambda *a: None)
+        barrier.wait()
+        for step in range(saves):
+            added = make_portfolio([f"W{w}-{step}"])
+            data = pd.concat([data, added], ignore_index=True)
+            data = set_rate(data, f"W{w}-0", 8 + step / 100)
+            if step == saves - 1:
+                data = data[data["FD_Number"] != f"W{w}-1"]
+            saved, snapshot, data = save_portfolio(data, pool, SHEET_ID, snapshot, notify)
+            if not saved:
+                failures.append(f"W{w}-{step} not saved")
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert failures == []
+    final, _ = read_snapshot(sheet_of(client))
+    expected = {f"BASE{i}" for i in range(20)} | {f"W{w}-{s}" for w in range(writers) for s in range(saves)
+                                                  if s != 1}
+    numbers = final["FD_Number"].astype(str).tolist()
+    assert sorted(numbers) == sorted(expected)
+    assert all(rates(final)[f"W{w}-0"] == 8 + (saves - 1) / 100 for w in range(writers))
+
+
+def test_stale_version_is_merged_not_overwritten(client):
+    seed(client, ["A", "B"])
+    sheet = sheet_of(client)
+    mine = read_versioned_snapshot(sheet)
+    theirs = read_versioned_snapshot(sheet)
+    commit_worksheet(sheet, theirs, make_portfolio(["A", "B", "THEIRS"]))
+
+    calls = client.spreadsheets[SHEET_ID].api_calls
+    result = commit_worksheet(sheet, mine, make_portfolio(["A", "MINE"]))
+
+    final, _ = read_snapshot(sheet)
+    assert final["FD_Number"].astype(str).tolist() == ["A", "THEIRS", "MINE"]
+    assert result.data["FD_Number"].astype(str).tolist() == ["A", "THEIRS", "MINE"]
+    assert result.conflicts == []
+    # The first commit was rejected and Sheet1 re-read before the retry
+    assert client.spreadsheets[SHEET_ID].api_calls - calls > 2
+
+
+def test_conflicting_edits_are_reported(client):
+    seed(client, ["A", "B"])
+    sheet = sheet_of(client)
+    base = read_versioned_snapshot(sheet)
+    data = make_portfolio(["A", "B"])
+    commit_worksheet(sheet, base, set_rate(data, "A", 8.5))
+
+    result = commit_worksheet(sheet, base, set_rate(set_rate(data, "A", 6.5), "B", 7.25))
+
+    assert result.conflicts == ["A"]
+    final, _ = read_snapshot(sheet)
+    # Their saved edit wins the clash; our edit of an untouched row still lands
+    assert rates(final) == {"A": 8.5, "B": 7.25}
+
+
+class RacingSpreadsheet(FakeSpreadsheet):
+    """Another writer commits just before every versioned batch of ours."""
+
+    def batch_update(self, body):
+        if any("deleteSheet" in request for request in body["requests"]):
+            version, version_id = max((int(ws.title[len(VERSION_PREFIX):]), ws.id) for ws in self.sheets.values()
+                                      if ws.title.startswith(VERSION_PREFIX))
+            super().batch_update({"requests": [{"deleteSheet": {"sheetId": version_id}},
+                                               fd_sheets._add_marker_request(version + 1)]})
+        return super().batch_update(body)
+
+
+def test_running_out_of_attempts_fails_cleanly(client, no_backoff):
+    seed(client, ["A"])
+    client.spreadsheets[SHEET_ID].__class__ = RacingSpreadsheet
+    sheet = sheet_of(client)
+    before = [list(row) for row in sheet.values]
+    snapshot = read_versioned_snapshot(sheet)
+    calls = client.spreadsheets[SHEET_ID].api_calls
+
+    with pytest.raises(StaleSnapshotError):
+        commit_worksheet(sheet, snapshot, make_portfolio(["A", "NEW"]))
+
+    # Every attempt was rejected as a whole: Sheet1 is untouched
+    assert sheet.values == before
+    assert client.spreadsheets[SHEET_ID].api_calls - calls >= 2 * MAX_COMMIT_ATTEMPTS
+
+    messages = []
+    saved, returned, _ = save_portfolio(make_portfolio(["A", "NEW"]), make_pool(client), SHEET_ID, snapshot,
+                                        lambda level, message: messages.append(level))
+    assert not saved and returned is snapshot and messages == ["error"]
+
+
+def test_updated_formats_only_the_diff_and_matches_a_full_diff():
+    base = make_portfolio([f"FD{i}" for i in range(50)])
+    base.loc[base.index[7], "Bank"] = None
+    base.loc[base.index[8], "MaturityDate"] = pd.NaT
+    snapshot = SheetSnapshot.from_frame(base)
+
+    data = base.drop(index=base.index[[3, 20]])
+    data = set_rate(data, "FD5", 7.5)
+    data["Bank"] = data["Bank"].cat.add_categories(["HDFC"])
+    data.loc[data["FD_Number"] == "FD9", "Bank"] = "HDFC"
+    data.loc[data["FD_Number"] == "FD11", "Years"] = 2
+    data = pd.concat([data, make_portfolio(["NEW1", "NEW2"])], ignore_index=True)
+
+    current, diff = snapshot.updated(data)
+    full = diff_snapshot(SheetSnapshot.from_frame(base), SheetSnapshot.from_frame(data))
+    assert diff.added == full.added
+    assert diff.deleted == full.deleted == ["FD3", "FD20"]
+    assert diff.changed == full.changed
+    assert [key for key, _ in diff.changed] == ["FD5", "FD9", "FD11"]
+    # Neither snapshot had to format every row
+    assert snapshot._rows is None and current._rows is None
+    assert current.rows == SheetSnapshot.from_frame(data).rows
+
+
+def test_credential_messages_reach_the_save_job(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def load_credentials(notify=None):
+        notify("error", "Error loading credentials.json: bad key")
+        return None
+
+    pool = SheetsClientPool(load_credentials)
+    job = BackgroundSaver().submit(
+        "session", lambda notify, final: save_portfolio(make_portfolio(["A"]), pool, SHEET_ID, None, notify))
+    deadline = time.time() + 10
+    while not job.done() and time.time() < deadline:
+        time.sleep(0.01)
+
+    # Reported on the saver thread, so collected on the job for the app to show
+    assert job.done() and job.result[0]
+    assert job.messages[0] == ("error", "Error loading credentials.json: bad key")